@@ -133,6 +133,110 @@ else:
         }
 
 
+# Cache
+# Set REDIS_URL (requires the `redis` package) to share the cache across gunicorn
+# workers; otherwise each process keeps its own in-memory cache.
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Per-user list response cache (core.response_cache)
+# Invalidation bumps a counter in the cache, so it is only safe across multiple
+# workers with a shared backend; enabled by default only when REDIS_URL is set.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1" if REDIS_URL else "0") == "1"
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))  # seconds
+
+
+# ES diff API: max number of diff results kept in each worker's LRU cache
+ES_DIFF_CACHE_SIZE = int(os.getenv("ES_DIFF_CACHE_SIZE", "256"))
+# SequenceMatcher is quadratic: longest input diffed per character (diff API, body
+# deltas). Longer bodies are compared per line, and refused (diff API) or stored as
+# keyframes (deltas) when they also have more lines than this.
+ES_DIFF_MAX_LENGTH = int(os.getenv("ES_DIFF_MAX_LENGTH", "5000"))
+
+
+# ES body storage: "full" stores every version's text, "delta" stores versions as
+# deltas against their predecessor with a full keyframe every N versions.
+# Existing rows can be converted with `manage.py compact_es_bodies`.
+ES_BODY_STORAGE = os.getenv("ES_BODY_STORAGE", "full")
+ES_BODY_KEYFRAME_INTERVAL = int(os.getenv("ES_BODY_KEYFRAME_INTERVAL", "10"))
+ES_BODY_CACHE_SIZE = int(os.getenv("ES_BODY_CACHE_SIZE", "512"))  # rebuilt bodies per worker
+
+
+# Bulk endpoints (/api/companies/bulk/, /api/es/bulk/): max operations per request
+BULK_MAX_OPERATIONS = int(os.getenv("BULK_MAX_OPERATIONS", "100"))
+
+
+# Company import (/api/companies/import/): rows per bulk_create batch, upload limit,
+# whether uploads are processed in a background thread (off = inline, for tests), and
+# seconds without progress after which a PENDING/RUNNING job is considered dead
+COMPANY_IMPORT_BATCH_SIZE = int(os.getenv("COMPANY_IMPORT_BATCH_SIZE", "500"))
+COMPANY_IMPORT_MAX_FILE_SIZE = int(os.getenv("COMPANY_IMPORT_MAX_FILE_SIZE", str(20 * 1024 * 1024)))
+COMPANY_IMPORT_ASYNC = os.getenv("COMPANY_IMPORT_ASYNC", "0" if IS_TESTING else "1") == "1"
+COMPANY_IMPORT_STALE_AFTER = int(os.getenv("COMPANY_IMPORT_STALE_AFTER", "600"))
+
+
+# Audit log writer (see core.audit_sink): "async" queues entries and bulk-inserts them
+# from a background thread by size/time; "sync" writes them inline (default for tests).
+# Batches that cannot be written are appended to the spool file; replay them with
+# `manage.py replay_audit_spool`.
+AUDIT_LOG_MODE = os.getenv("AUDIT_LOG_MODE", "sync" if IS_TESTING else "async")
+AUDIT_LOG_BATCH_SIZE = int(os.getenv("AUDIT_LOG_BATCH_SIZE", "100"))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "1.0"))  # seconds
+AUDIT_LOG_QUEUE_SIZE = int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000"))
+AUDIT_LOG_SPOOL_PATH = os.getenv("AUDIT_LOG_SPOOL_PATH", str(BASE_DIR / "logs" / "audit_spool.jsonl"))
+# Rows the database rejects even one at a time (with the error), kept out of the spool
+AUDIT_LOG_QUARANTINE_PATH = os.getenv(
+    "AUDIT_LOG_QUARANTINE_PATH", str(BASE_DIR / "logs" / "audit_quarantine.jsonl")
+)
+# Security events are written inline even in async mode, so a killed worker cannot lose them
+AUDIT_LOG_SYNC_ACTIONS = [
+    action.strip()
+    for action in os.getenv("AUDIT_LOG_SYNC_ACTIONS", "LOGIN_SUCCESS,LOGIN_FAIL,LOGOUT,ACCOUNT_EXPORT").split(",")
+    if action.strip()
+]
+# Interned User-Agent strings (see core.user_agents): hash -> id entries kept per worker
+USER_AGENT_CACHE_SIZE = int(os.getenv("USER_AGENT_CACHE_SIZE", "1024"))
+
+# Audit log retention (`manage.py archive_audit_logs`): whole months older than
+# AUDIT_RETENTION_DAYS are moved to gzip JSONL files in AUDIT_ARCHIVE_DIR and deleted
+# from the table AUDIT_RETENTION_BATCH_SIZE rows per transaction.
+AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "180"))
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", str(BASE_DIR / "archives" / "auditlog"))
+AUDIT_RETENTION_BATCH_SIZE = int(os.getenv("AUDIT_RETENTION_BATCH_SIZE", "1000"))
+
+# Deletion tombstones for /api/sync (`manage.py prune_tombstones`): markers older than
+# TOMBSTONE_RETENTION_DAYS are deleted, and clients whose watermark is older get a full snapshot.
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "90"))
+# Seconds the /api/sync watermark lags behind the request, covering writes whose
+# updated_at was stamped before the request but committed after it (re-sent, never skipped)
+SYNC_SAFETY_MARGIN = int(os.getenv("SYNC_SAFETY_MARGIN", "60"))
+
+# Audit rollups (`manage.py rollup_audit_logs`, run from cron): hours before the newest
+# hourly rollup that each run recomputes, to pick up entries the batched writer inserted late.
+# The rollup endpoint serves at most AUDIT_ROLLUP_MAX_PERIODS hours/days per request.
+AUDIT_ROLLUP_LOOKBACK_HOURS = int(os.getenv("AUDIT_ROLLUP_LOOKBACK_HOURS", "2"))
+AUDIT_ROLLUP_MAX_PERIODS = int(os.getenv("AUDIT_ROLLUP_MAX_PERIODS", "744"))
+
+# Admin changelists for large tables (see core.admin_utils): above this many rows the
+# PostgreSQL planner estimate is shown instead of running an exact COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv("ADMIN_ESTIMATED_COUNT_THRESHOLD", "10000"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -185,6 +289,23 @@ STORAGES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Protected media delivery (see core.views_media): "django" streams files from the
+# worker; "x-accel" (nginx) / "x-sendfile" (Apache) hand the transfer to the front
+# proxy after the ownership check. MEDIA_ACCEL_PREFIX is the nginx `internal`
+# location aliased to MEDIA_ROOT.
+MEDIA_DELIVERY = os.getenv("MEDIA_DELIVERY", "django")
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+# Seconds a per-user "may read this file" decision is cached (invalidated on ES save/delete).
+# Like the response cache, invalidation is only seen by every worker with a shared
+# backend, so it is enabled by default only when REDIS_URL is set.
+MEDIA_AUTH_CACHE_ENABLED = os.getenv("MEDIA_AUTH_CACHE_ENABLED", "1" if REDIS_URL else "0") == "1"
+MEDIA_AUTH_CACHE_TIMEOUT = int(os.getenv("MEDIA_AUTH_CACHE_TIMEOUT", "60"))
+# Signed attachment URLs (see core.media_signing): links stay valid for one to two
+# windows of this many seconds and are served without a session or DB lookup.
+# Revocation uses the media cache generation, so links are only issued when
+# MEDIA_AUTH_CACHE_ENABLED. Keep it above RESPONSE_CACHE_TIMEOUT; 0 disables signing.
+MEDIA_SIGNED_URL_TTL = int(os.getenv("MEDIA_SIGNED_URL_TTL", "3600"))
+
 # File upload settings
 MAX_UPLOAD_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_UPLOAD_EXTENSIONS = [
@@ -23,19 +23,25 @@ from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
 
-from core.views import HealthView, csrf
+from core.views import HealthView, MetricsView, csrf
 from core.views_auth import (
     RegisterView, LoginView, LogoutView, MeView, MeSettingsView
 )
+from core.views_calendar import DeadlineCalendarView
 from core.views_company import CompanyViewSet
+from core.views_dashboard import DashboardView
 from core.views_es import ESVersionViewSet
+from core.views_export import CompanyExportView, ESExportView, TakeoutView
 from core.views_audit import AuditLogViewSet
+from core.views_import import ImportJobViewSet
 from core.views_media import ProtectedMediaView
+from core.views_sync import SyncView
 
 router = DefaultRouter()
 router.register(r"companies", CompanyViewSet, basename="company")
 router.register(r"es", ESVersionViewSet, basename="es")
 router.register(r"auditlogs", AuditLogViewSet, basename="auditlog")
+router.register(r"imports", ImportJobViewSet, basename="importjob")
 
 # Custom admin URL for security (use environment variable or default to 'secure-admin/')
 ADMIN_URL = os.getenv('DJANGO_ADMIN_URL', 'secure-admin/')
@@ -52,6 +58,7 @@ urlpatterns = [
     # API routes
     path("api/", include(router.urls)),
     path("api/health", HealthView.as_view()),
+    path("api/metrics", MetricsView.as_view()),
     path("api/csrf/", csrf),
 
     # Auth
@@ -69,6 +76,20 @@ urlpatterns = [
         ESVersionViewSet.as_view({"get": "list", "post": "create"}),
     ),
 
+    # Dashboard summary (single query)
+    path("api/dashboard", DashboardView.as_view()),
+
+    # Deadline calendar (per-day grouping for a month / range)
+    path("api/calendar/deadlines", DeadlineCalendarView.as_view()),
+
+    # Delta sync (changed rows + tombstones since a watermark)
+    path("api/sync", SyncView.as_view()),
+
+    # Streaming exports (CSV / JSON Lines)
+    path("api/export/companies.<str:export_format>", CompanyExportView.as_view()),
+    path("api/export/es.<str:export_format>", ESExportView.as_view()),
+    path("api/export/takeout.zip", TakeoutView.as_view()),
+
     # Protected media files (authenticated access only)
     re_path(
         r"^media/(?P<file_path>.+)$",
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import UserSettings, Company, ESVersion, AuditLog
+from .admin_utils import LargeTableAdminMixin, date_drilldown_filter
+from .models import (
+    UserSettings, Company, ESVersion, AuditLog, AuditLogArchive, AuditRollup, Tombstone, UserAgent
+)
 
 
 @admin.register(UserSettings)
@@ -18,23 +21,35 @@ class CompanyAdmin(admin.ModelAdmin):
 
 
 @admin.register(ESVersion)
-class ESVersionAdmin(admin.ModelAdmin):
+class ESVersionAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ["id", "company", "owner", "result", "submitted_at", "created_at"]
-    list_filter = ["result", "submitted_at"]
+    list_filter = ["result", date_drilldown_filter("submitted_at")]
     search_fields = ["company__name", "owner__username"]
-    date_hierarchy = "submitted_at"
+    list_select_related = ["company", "owner"]
+    # Bodies are not shown in the list; loading them would also rebuild delta-stored ones
+    list_defer = ("body", "body_delta", "memo")
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ["target_type", "target_id", "owner", "deleted_at"]
+    list_filter = ["target_type"]
+    search_fields = ["owner__username"]
+    readonly_fields = ["owner", "target_type", "target_id", "deleted_at"]
 
 
 @admin.register(AuditLog)
-class AuditLogAdmin(admin.ModelAdmin):
+class AuditLogAdmin(LargeTableAdminMixin, admin.ModelAdmin):
     list_display = ["action", "user", "input_email", "ip_address", "created_at"]
-    list_filter = ["action", "created_at"]
-    search_fields = ["user__username", "input_email", "ip_address"]
-    date_hierarchy = "created_at"
+    list_filter = ["action", date_drilldown_filter("created_at")]
+    search_fields = ["user__username", "input_email", "ip_address", "agent__value"]
+    list_select_related = ["user"]
     readonly_fields = [
         "user", "input_email", "action", "target_type", "target_id",
         "ip_address", "user_agent", "created_at"
     ]
+    # `user_agent` is read through the interned agent row
+    exclude = ["agent"]
 
     def has_add_permission(self, request):
         """Prevent manual creation of audit logs."""
@@ -43,3 +58,48 @@ class AuditLogAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         """Prevent deletion of audit logs."""
         return False
+
+
+@admin.register(AuditRollup)
+class AuditRollupAdmin(admin.ModelAdmin):
+    list_display = ["period_start", "granularity", "action", "user", "count"]
+    list_filter = ["granularity", "action"]
+    search_fields = ["user__username"]
+    date_hierarchy = "period_start"
+    list_select_related = ["user"]
+    readonly_fields = ["granularity", "period_start", "user", "action", "count"]
+
+    def has_add_permission(self, request):
+        """Rollups are only written by `manage.py rollup_audit_logs`."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Prevent deletion of rollups (they outlive archived audit logs)."""
+        return False
+
+
+@admin.register(UserAgent)
+class UserAgentAdmin(admin.ModelAdmin):
+    list_display = ["value", "created_at"]
+    search_fields = ["value"]
+    readonly_fields = ["sha256", "value", "created_at"]
+
+    def has_add_permission(self, request):
+        """Agents are interned automatically when audit logs are written."""
+        return False
+
+
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(admin.ModelAdmin):
+    list_display = ["month", "part", "row_count", "path", "created_at"]
+    readonly_fields = [
+        "month", "part", "path", "row_count", "sha256", "first_id", "last_id", "created_at"
+    ]
+
+    def has_add_permission(self, request):
+        """Archives are only created by `manage.py archive_audit_logs`."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Keep the checksum record for as long as the file exists."""
+        return False
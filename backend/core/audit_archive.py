@@ -0,0 +1,232 @@
+"""
+Audit log retention: move old rows into compressed, checksummed monthly archives.
+
+Rows older than AUDIT_RETENTION_DAYS are exported month by month, in id
+order, to gzip-compressed JSON Lines files under AUDIT_ARCHIVE_DIR. Each file is
+written to a temporary name, fsynced, re-read to check that it decompresses
+to the expected row count, and only then renamed into place and recorded
+(with its SHA-256) as an AuditLogArchive row. The ids read back from the file
+are then deleted in primary-key batches of AUDIT_RETENTION_BATCH_SIZE, each in
+its own short transaction, so the hot table is never locked for long and no
+row is deleted that the archive does not hold.
+
+The cutoff is rounded down to a month boundary, so each month is normally
+archived once. Rows that arrive for an already archived month (for example a
+replayed audit spool) go into an additional part of that month. A run that was
+interrupted while deleting finishes the deletion on the next run instead of
+archiving those rows twice.
+"""
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import AuditLog, AuditLogArchive
+
+ARCHIVE_FIELDS = (
+    "id", "user_id", "input_email", "action", "target_type", "target_id",
+    "ip_address", "created_at",
+)
+# Archives store the agent string itself, not the id of an interned row
+AGENT_VALUE = Coalesce("agent__value", Value(""), output_field=TextField())
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveVerificationError(Exception):
+    """An archive file is missing, truncated or does not match its checksum."""
+
+
+@dataclass
+class ArchiveResult:
+    month: date
+    part: int
+    rows: int
+    path: str
+
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(value: datetime) -> datetime:
+    return month_start(month_start(value) + timedelta(days=32))
+
+
+def retention_cutoff(days: int, now: Optional[datetime] = None) -> datetime:
+    """First instant of the month containing now - days (local time)."""
+    now = timezone.localtime(now or timezone.now())
+    return month_start(now - timedelta(days=days))
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _record(entry: dict) -> str:
+    entry["created_at"] = entry["created_at"].isoformat()
+    return json.dumps(entry, ensure_ascii=False) + "\n"
+
+
+def _count_lines(path: str) -> int:
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        return sum(1 for _ in handle)
+
+
+def archive_month(
+    start: datetime, end: datetime, dry_run: bool = False, batch_size: Optional[int] = None
+) -> Optional[ArchiveResult]:
+    """Archive and delete the rows in [start, end); returns None if there are none."""
+    rows = AuditLog.objects.filter(created_at__gte=start, created_at__lt=end)
+    month = start.date()
+    previous = AuditLogArchive.objects.filter(month=month)
+    if not dry_run:
+        for archive in previous:
+            if rows.filter(id__range=(archive.first_id, archive.last_id)).exists():
+                # Leftovers of an interrupted run: delete exactly the rows that archive holds
+                if not verify_archive(archive):
+                    raise ArchiveVerificationError(f"{archive.path} is missing or does not match its checksum.")
+                delete_in_batches(archived_ids(archive.path), batch_size)
+    bounds = rows.aggregate(first_id=Min("id"), last_id=Max("id"))
+    if bounds["last_id"] is None:
+        return None
+
+    part = (previous.aggregate(last=Max("part"))["last"] or 0) + 1
+    filename = f"auditlog-{month:%Y-%m}" + (f"-part{part}" if part > 1 else "") + ".jsonl.gz"
+    path = os.path.join(settings.AUDIT_ARCHIVE_DIR, filename)
+    if dry_run:
+        return ArchiveResult(month=month, part=part, rows=rows.count(), path=path)
+
+    # Rows inserted after this point get higher ids and are left for the next run
+    rows = rows.filter(id__lte=bounds["last_id"])
+    os.makedirs(settings.AUDIT_ARCHIVE_DIR, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    count = 0
+    with open(temp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed:
+            for entry in rows.order_by("id").values(*ARCHIVE_FIELDS, user_agent=AGENT_VALUE).iterator(chunk_size=2000):
+                compressed.write(_record(entry).encode("utf-8"))
+                count += 1
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    checksum = file_sha256(temp_path)
+    if _count_lines(temp_path) != count:
+        os.remove(temp_path)
+        raise ArchiveVerificationError(f"{filename} failed verification; nothing was deleted.")
+    os.replace(temp_path, path)
+
+    AuditLogArchive.objects.create(
+        month=month,
+        part=part,
+        path=filename,
+        row_count=count,
+        sha256=checksum,
+        first_id=bounds["first_id"],
+        last_id=bounds["last_id"],
+    )
+    # Only ids read back from the file: a row with a lower id that committed after
+    # the export (e.g. a replayed spool) stays for the next part
+    deleted = delete_in_batches(archived_ids(filename), batch_size)
+    if deleted != count:
+        raise ArchiveVerificationError(
+            f"{filename}: deleted {deleted} of {count} archived rows; the rest were already gone."
+        )
+    return ArchiveResult(month=month, part=part, rows=count, path=path)
+
+
+def archived_ids(filename: str) -> Iterator[int]:
+    """Ids of the rows stored in an archive file, in file order."""
+    with gzip.open(os.path.join(settings.AUDIT_ARCHIVE_DIR, filename), "rt", encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)["id"]
+
+
+def delete_in_batches(ids: Iterable[int], batch_size: Optional[int] = None) -> int:
+    """Delete the given audit rows by primary-key batches, one short transaction each."""
+    batch_size = batch_size or settings.AUDIT_RETENTION_BATCH_SIZE
+    ids = iter(ids)
+    deleted = 0
+    while True:
+        batch = list(islice(ids, batch_size))
+        if not batch:
+            return deleted
+        with transaction.atomic():
+            deleted += AuditLog.objects.filter(id__in=batch).delete()[0]
+
+
+def archive_old_logs(
+    days: int, dry_run: bool = False, batch_size: Optional[int] = None
+) -> List[ArchiveResult]:
+    """Archive every month older than the retention cutoff, oldest first."""
+    cutoff = retention_cutoff(days)
+    oldest = AuditLog.objects.filter(created_at__lt=cutoff).aggregate(first=Min("created_at"))["first"]
+    results = []
+    if oldest is None:
+        return results
+    start = month_start(timezone.localtime(oldest))
+    while start < cutoff:
+        result = archive_month(start, next_month(start), dry_run=dry_run, batch_size=batch_size)
+        if result is not None:
+            results.append(result)
+        start = next_month(start)
+    return results
+
+
+def verify_archive(archive: AuditLogArchive) -> bool:
+    path = os.path.join(settings.AUDIT_ARCHIVE_DIR, archive.path)
+    return os.path.exists(path) and file_sha256(path) == archive.sha256
+
+
+def search_archives(
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    contains: Optional[str] = None,
+    verify: bool = True,
+) -> Iterator[dict]:
+    """
+    Yield archived entries matching every given filter, oldest month first.
+
+    `since`/`until` select archive months (inclusive); `contains` is a
+    case-insensitive substring match against the raw JSON line. Each file is
+    checked against its recorded SHA-256 before it is read.
+    """
+    archives = AuditLogArchive.objects.all()
+    if since is not None:
+        archives = archives.filter(month__gte=since)
+    if until is not None:
+        archives = archives.filter(month__lte=until)
+    needle = contains.lower() if contains else None
+
+    for archive in archives.order_by("month", "part"):
+        if verify and not verify_archive(archive):
+            raise ArchiveVerificationError(f"{archive.path} is missing or does not match its checksum.")
+        path = os.path.join(settings.AUDIT_ARCHIVE_DIR, archive.path)
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                if needle is not None and needle not in line.lower():
+                    continue
+                entry = json.loads(line)
+                if user_id is not None and entry["user_id"] != user_id:
+                    continue
+                if action is not None and entry["action"] != action:
+                    continue
+                if ip_address is not None and entry["ip_address"] != ip_address:
+                    continue
+                yield entry
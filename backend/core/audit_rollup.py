@@ -0,0 +1,181 @@
+"""
+Hourly and daily audit log counters per (user, action).
+
+`manage.py rollup_audit_logs` (run from cron every few minutes) recomputes the
+AuditRollup rows for closed hours from the raw table, starting a few hours
+before the newest hourly rollup (AUDIT_ROLLUP_LOOKBACK_HOURS) so entries the
+batched writer inserted late are picked up. Daily rows are summed from the
+hourly ones. Recomputing a window replaces its rows, so runs are idempotent
+and never race with audit inserts.
+
+Readers combine the rollups with a small scan of raw rows newer than the last
+rolled-up hour (see `counts`), so results are exact without waiting for the
+next run. Rollups are never recomputed for periods whose raw rows were already
+archived (see core.audit_archive), so they keep the long-term history.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Aggregate, Count, Max, Min, QuerySet, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import AuditLog, AuditRollup
+
+Granularity = AuditRollup.Granularity
+TRUNC = {Granularity.HOUR: TruncHour, Granularity.DAY: TruncDay}
+
+
+def floor_hour(value: datetime) -> datetime:
+    return timezone.localtime(value).replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value: datetime) -> datetime:
+    return floor_hour(value).replace(hour=0)
+
+
+def rolled_up_until() -> Optional[datetime]:
+    """End of the newest hourly rollup; raw rows from here on are not yet counted."""
+    last = AuditRollup.objects.filter(granularity=Granularity.HOUR).aggregate(
+        last=Max("period_start")
+    )["last"]
+    return last + timedelta(hours=1) if last is not None else None
+
+
+def _rebuild_hours(start: datetime, end: datetime) -> None:
+    rows = (
+        AuditLog.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(period=TruncHour("created_at"))
+        .values("period", "user_id", "action")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    AuditRollup.objects.filter(
+        granularity=Granularity.HOUR, period_start__gte=start, period_start__lt=end
+    ).delete()
+    AuditRollup.objects.bulk_create(
+        AuditRollup(
+            granularity=Granularity.HOUR,
+            period_start=row["period"],
+            user_id=row["user_id"],
+            action=row["action"],
+            count=row["count"],
+        )
+        for row in rows
+    )
+
+
+def _rebuild_day(day: datetime) -> None:
+    end = floor_day(day + timedelta(hours=36))
+    rows = (
+        AuditRollup.objects.filter(
+            granularity=Granularity.HOUR, period_start__gte=day, period_start__lt=end
+        )
+        .values("user_id", "action")
+        .annotate(total=Sum("count"))
+        .order_by()
+    )
+    AuditRollup.objects.filter(granularity=Granularity.DAY, period_start=day).delete()
+    AuditRollup.objects.bulk_create(
+        AuditRollup(
+            granularity=Granularity.DAY,
+            period_start=day,
+            user_id=row["user_id"],
+            action=row["action"],
+            count=row["total"],
+        )
+        for row in rows
+    )
+
+
+def compact(since: Optional[datetime] = None, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """
+    Recompute rollups for closed hours in [since, current hour); returns the window.
+
+    Without `since`, the window starts AUDIT_ROLLUP_LOOKBACK_HOURS before the
+    newest hourly rollup (or at the oldest audit row). It is clamped to the
+    oldest raw row so archived periods keep their counts. Each day is
+    rebuilt in its own transaction.
+    """
+    end = floor_hour(now or timezone.now())
+    oldest = AuditLog.objects.aggregate(first=Min("created_at"))["first"]
+    if oldest is None:
+        return end, end
+    if since is None:
+        until = rolled_up_until()
+        since = until - timedelta(hours=settings.AUDIT_ROLLUP_LOOKBACK_HOURS) if until else oldest
+    start = max(floor_hour(since), floor_hour(oldest))
+
+    day = floor_day(start)
+    while day < end:
+        next_day = floor_day(day + timedelta(hours=36))
+        with transaction.atomic():
+            _rebuild_hours(max(day, start), min(next_day, end))
+            _rebuild_day(day)
+        day = next_day
+    return start, end
+
+
+def counts(
+    granularity: str,
+    since: datetime,
+    until: datetime,
+    user=None,
+    action: Optional[str] = None,
+    anonymous: bool = False,
+) -> List[dict]:
+    """
+    Counts per (period, action) in [since, until), optionally for one user
+    (`user`, an instance or id) or only for entries without one (`anonymous`,
+    e.g. failed logins for unknown addresses).
+
+    Periods are aligned to the granularity, so `since` is rounded down.
+    Rolled-up periods come from AuditRollup; anything newer than the last
+    rolled-up hour, and the partial period before a non-aligned `until`, is
+    counted from raw rows and merged in.
+    """
+    trunc = TRUNC[granularity]
+    floor = floor_hour if granularity == Granularity.HOUR else floor_day
+    since = floor(since)
+    # A rollup row covers its whole period: only use those ending by `until`
+    rollup_until = floor(until)
+    totals: Dict[Tuple[datetime, str], int] = {}
+
+    def add(rows: QuerySet, period_field: str, total: Aggregate) -> None:
+        if anonymous:
+            rows = rows.filter(user__isnull=True)
+        elif user is not None:
+            rows = rows.filter(user=user)
+        if action:
+            rows = rows.filter(action=action)
+        for row in rows.values(period_field, "action").annotate(n=total).order_by():
+            key = (row[period_field], row["action"])
+            totals[key] = totals.get(key, 0) + row["n"]
+
+    tail_start = rolled_up_until()
+    if tail_start is not None:
+        add(
+            AuditRollup.objects.filter(
+                granularity=granularity, period_start__gte=since, period_start__lt=rollup_until
+            ),
+            "period_start",
+            Sum("count"),
+        )
+        tail_start = min(max(tail_start, since), rollup_until)
+    else:
+        tail_start = since
+
+    if tail_start < until:
+        add(
+            AuditLog.objects.filter(created_at__gte=tail_start, created_at__lt=until)
+            .annotate(period=trunc("created_at")),
+            "period",
+            Count("id"),
+        )
+
+    return [
+        {"period": period, "action": action_value, "count": count}
+        for (period, action_value), count in sorted(totals.items())
+    ]
@@ -0,0 +1,283 @@
+"""
+Batched audit-log writer.
+
+In "async" mode (AUDIT_LOG_MODE) entries are queued in-process once the
+surrounding transaction commits, and a daemon thread inserts them with one
+bulk_create per batch: when AUDIT_LOG_BATCH_SIZE entries are waiting or
+AUDIT_LOG_FLUSH_INTERVAL seconds after the first one, whichever comes first.
+Request threads never wait on an audit INSERT.
+
+Durability:
+    - security events (AUDIT_LOG_SYNC_ACTIONS: logins, logouts, account
+      exports) are always written inline, so a killed worker cannot lose them
+    - a batch the database cannot take is appended to AUDIT_LOG_SPOOL_PATH
+      (JSONL, fsynced) and can be re-inserted with `manage.py replay_audit_spool`
+    - a batch with an invalid row (e.g. a user deleted before the flush) is
+      retried row by row; only the rows that still fail are moved to
+      AUDIT_LOG_QUARANTINE_PATH, with the error, so they cannot block the rest
+    - the queue is flushed at interpreter exit (gunicorn worker shutdown)
+    - when the queue is full, the caller writes inline instead of dropping
+Other entries still queued when a process is killed outright are lost, at most
+one flush interval's worth.
+
+"sync" mode writes inline inside the caller's transaction, exactly like a
+plain create(); it is the default under tests.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+SPOOL_FIELDS = (
+    "user_id", "input_email", "action", "target_type", "target_id",
+    "ip_address", "user_agent", "created_at",
+)
+
+_file_lock = threading.Lock()
+
+
+class AuditSink:
+    """Process-wide audit log writer (use the module-level `audit_sink`)."""
+
+    def __init__(self):
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        self._stats = {
+            "written": 0,
+            "flushes": 0,
+            "spooled": 0,
+            "quarantined": 0,
+            "failed_flushes": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    @staticmethod
+    def is_async() -> bool:
+        return settings.AUDIT_LOG_MODE == "async"
+
+    def record(self, entry: Optional[AuditLog]) -> None:
+        self.record_many([entry])
+
+    def record_many(self, entries: Iterable[Optional[AuditLog]]) -> None:
+        """Write entries (None is skipped); async mode defers them until commit."""
+        entries = [entry for entry in entries if entry is not None]
+        if not self.is_async():
+            inline, entries = entries, []
+        else:
+            inline = [entry for entry in entries if entry.action in settings.AUDIT_LOG_SYNC_ACTIONS]
+            entries = [entry for entry in entries if entry.action not in settings.AUDIT_LOG_SYNC_ACTIONS]
+        if inline:
+            AuditLog.objects.bulk_create(inline)
+        if entries:
+            # Rolled-back work must not leave audit rows behind
+            transaction.on_commit(lambda: self._enqueue(entries))
+
+    def _enqueue(self, entries: List[AuditLog]) -> None:
+        self._ensure_worker()
+        overflow = []
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                overflow.append(entry)
+        if overflow:
+            # Backpressure instead of loss: this request pays for one insert
+            self._write(overflow)
+
+    def _ensure_worker(self) -> None:
+        """Start the flusher lazily (after gunicorn forks) and again if it died."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=settings.AUDIT_LOG_QUEUE_SIZE)
+            self._worker = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._worker.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + settings.AUDIT_LOG_FLUSH_INTERVAL
+            while len(batch) < settings.AUDIT_LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            close_old_connections()
+            self._write(batch)
+
+    def flush(self) -> int:
+        """Write everything currently queued from the calling thread; returns the count."""
+        if self._queue is None:
+            return 0
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for start in range(0, len(batch), settings.AUDIT_LOG_BATCH_SIZE):
+            self._write(batch[start:start + settings.AUDIT_LOG_BATCH_SIZE])
+        return len(batch)
+
+    def _write(self, entries: List[AuditLog]) -> None:
+        started = time.perf_counter()
+        try:
+            AuditLog.objects.bulk_create(entries)
+            written = len(entries)
+        except IntegrityError:
+            written = self._write_rows(entries)
+        except DatabaseError:
+            logger.exception("Audit log flush failed; spooling %d entries", len(entries))
+            self._spool(entries)
+            self._stats["failed_flushes"] += 1
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._stats["written"] += written
+        self._stats["flushes"] += 1
+        self._stats["last_flush_ms"] = elapsed_ms
+        self._stats["total_flush_ms"] += elapsed_ms
+        self._stats["max_flush_ms"] = max(self._stats["max_flush_ms"], elapsed_ms)
+
+    def _write_rows(self, entries: List[AuditLog]) -> int:
+        """Insert one row at a time after a rejected batch; returns the number written."""
+        written = 0
+        rejected = []
+        for index, entry in enumerate(entries):
+            try:
+                with transaction.atomic():
+                    AuditLog.objects.bulk_create([entry])
+                written += 1
+            except IntegrityError as exc:
+                rejected.append(_quarantine_record(_spool_record(entry), exc))
+            except DatabaseError:
+                logger.exception("Audit log flush failed; spooling %d entries", len(entries) - index)
+                self._spool(entries[index:])
+                self._stats["failed_flushes"] += 1
+                break
+        if rejected:
+            logger.error("Quarantined %d invalid audit log entries", len(rejected))
+            append_jsonl(settings.AUDIT_LOG_QUARANTINE_PATH, rejected)
+            self._stats["quarantined"] += len(rejected)
+        return written
+
+    def _spool(self, entries: List[AuditLog]) -> None:
+        append_jsonl(settings.AUDIT_LOG_SPOOL_PATH, [_spool_record(entry) for entry in entries])
+        self._stats["spooled"] += len(entries)
+
+    def get_stats(self) -> dict:
+        """Queue depth and flush latency for this process."""
+        stats = dict(self._stats)
+        flushes = stats["flushes"]
+        stats["avg_flush_ms"] = stats["total_flush_ms"] / flushes if flushes else 0.0
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None else 0
+        stats["mode"] = settings.AUDIT_LOG_MODE
+        return stats
+
+
+def _spool_record(entry: AuditLog) -> dict:
+    record = {field: getattr(entry, field) for field in SPOOL_FIELDS}
+    # isoformat() keeps microseconds (DjangoJSONEncoder would truncate them)
+    record["created_at"] = entry.created_at.isoformat()
+    return record
+
+
+def _quarantine_record(record: dict, exc: Exception) -> dict:
+    return {**record, "error": str(exc)}
+
+
+def _entry_from_record(record: dict) -> AuditLog:
+    # Quarantined lines carry their error; they can be replayed once fixed
+    data = {field: record[field] for field in SPOOL_FIELDS if field in record}
+    data["created_at"] = parse_datetime(data["created_at"])
+    return AuditLog(**data)
+
+
+def append_jsonl(path: str, records: List[dict]) -> None:
+    """Append records to a JSONL file and fsync it."""
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+    with _file_lock:
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write(lines)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+def _replay_batch(records: List[dict], rejected: List[dict]) -> int:
+    try:
+        with transaction.atomic():
+            AuditLog.objects.bulk_create([_entry_from_record(record) for record in records])
+        return len(records)
+    except IntegrityError:
+        pass
+    # One invalid row must not block the file forever: retry row by row
+    inserted = 0
+    for record in records:
+        try:
+            with transaction.atomic():
+                AuditLog.objects.bulk_create([_entry_from_record(record)])
+            inserted += 1
+        except IntegrityError as exc:
+            rejected.append(_quarantine_record(record, exc))
+    return inserted
+
+
+def replay_spool(path: str, batch_size: int = 500) -> Tuple[int, int]:
+    """
+    Insert spooled entries and remove the spool file; returns (inserted, quarantined).
+
+    The file is renamed first, so entries spooled meanwhile go to a fresh file,
+    and inserted in one transaction, so an interrupted replay can simply be rerun.
+    Rows the database rejects (IntegrityError) are moved to
+    AUDIT_LOG_QUARANTINE_PATH once that transaction has committed.
+    """
+    replaying = f"{path}.replaying"
+    if not os.path.exists(replaying):
+        if not os.path.exists(path):
+            return 0, 0
+        os.replace(path, replaying)
+
+    inserted = 0
+    rejected: List[dict] = []
+    batch: List[dict] = []
+    with transaction.atomic(), open(replaying, encoding="utf-8") as spool:
+        for line in spool:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                inserted += _replay_batch(batch, rejected)
+                batch = []
+        if batch:
+            inserted += _replay_batch(batch, rejected)
+    if rejected:
+        append_jsonl(settings.AUDIT_LOG_QUARANTINE_PATH, rejected)
+    os.remove(replaying)
+    return inserted, len(rejected)
+
+
+audit_sink = AuditSink()
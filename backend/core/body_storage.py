@@ -0,0 +1,189 @@
+"""
+Delta-compressed storage for ESVersion.body.
+
+With ES_BODY_STORAGE = "delta", a new version is stored as a delta against the
+previous version of the same company, with a full keyframe every
+ES_BODY_KEYFRAME_INTERVAL versions (or whenever a delta would not be smaller).
+Delta rows keep an empty `body` column; ESVersion.from_db() rebuilds the text by
+walking `body_base` back to the nearest keyframe, so serializers keep seeing a
+plain `body` string. Rebuilt bodies are memoized per worker in an LRU keyed by
+(pk, updated_at).
+
+Delta format (JSON list):
+    int >= 0 -> copy that many characters from the base
+    int < 0  -> skip that many characters of the base
+    str      -> insert the string
+"""
+import json
+from difflib import SequenceMatcher
+from typing import List, Optional, Sequence, Union
+
+from django.conf import settings
+from django.db.models import Sum
+from django.db.models.functions import Length
+
+from .lru import LRUCache
+
+DeltaOp = Union[int, str]
+
+# Keyed by (pk, updated_at)
+body_cache = LRUCache(max_entries=settings.ES_BODY_CACHE_SIZE)
+
+
+def is_delta_mode() -> bool:
+    return settings.ES_BODY_STORAGE == "delta"
+
+
+def make_delta(base: str, new: str) -> Optional[List[DeltaOp]]:
+    """
+    Encode `new` as copy/skip/insert operations against `base`.
+
+    Matching is per character up to ES_DIFF_MAX_LENGTH and per line beyond it
+    (SequenceMatcher is quadratic); None when even the line count exceeds it,
+    in which case the caller stores a keyframe.
+    """
+    limit = settings.ES_DIFF_MAX_LENGTH
+    a: Sequence[str] = base
+    b: Sequence[str] = new
+    if max(len(base), len(new)) > limit:
+        a, b = base.splitlines(keepends=True), new.splitlines(keepends=True)
+        if max(len(a), len(b)) > limit:
+            return None
+
+    ops: List[DeltaOp] = []
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(sum(map(len, a[i1:i2])))
+            continue
+        if tag in ("delete", "replace"):
+            ops.append(-sum(map(len, a[i1:i2])))
+        if tag in ("insert", "replace"):
+            ops.append("".join(b[j1:j2]))
+    return ops
+
+
+def apply_delta(base: str, ops: List[DeltaOp]) -> str:
+    parts = []
+    position = 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op >= 0:
+            parts.append(base[position:position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(parts)
+
+
+def encode_delta(ops: List[DeltaOp]) -> str:
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def stored_size() -> int:
+    """Characters currently stored in the body and body_delta columns."""
+    from .models import ESVersion
+
+    totals = ESVersion.objects.aggregate(body=Sum(Length("body")), delta=Sum(Length("body_delta")))
+    return (totals["body"] or 0) + (totals["delta"] or 0)
+
+
+def rebuild_body(pk: int, body_delta: str, base_id: Optional[int]) -> str:
+    """
+    Rebuild a delta row's text by walking back to the nearest keyframe (or cached body).
+
+    Each hop is one lightweight query: delta rows store an empty `body` column.
+    """
+    from .models import ESVersion
+
+    pending = [body_delta]
+    next_id = base_id
+    text = ""
+    while next_id is not None:
+        row = (
+            ESVersion.objects.filter(pk=next_id)
+            .values("pk", "updated_at", "body", "body_storage", "body_delta", "body_base_id")
+            .first()
+        )
+        if row is None:
+            raise ESVersion.DoesNotExist(f"Delta base {next_id} of ESVersion {pk} is missing.")
+
+        cached = body_cache.get((row["pk"], row["updated_at"]))
+        if cached is not None:
+            text = cached
+            break
+        if row["body_storage"] == ESVersion.BodyStorage.FULL:
+            text = row["body"]
+            body_cache.set((row["pk"], row["updated_at"]), text)
+            break
+        pending.append(row["body_delta"])
+        next_id = row["body_base_id"]
+
+    for body_delta in reversed(pending):
+        text = apply_delta(text, json.loads(body_delta))
+    return text
+
+
+def materialize_children(instance) -> None:
+    """
+    Convert rows stored as deltas against `instance` into full keyframes.
+
+    Must run before `instance`'s body changes or the row is deleted. Uses
+    queryset.update() so updated_at (and the sync watermark) is untouched.
+    """
+    from .models import ESVersion
+
+    children = ESVersion.objects.filter(
+        body_base_id=instance.pk, body_storage=ESVersion.BodyStorage.DELTA
+    )
+    for child in children:
+        ESVersion.objects.filter(pk=child.pk).update(
+            body=child.body,
+            body_storage=ESVersion.BodyStorage.FULL,
+            body_delta="",
+            body_base=None,
+            body_chain_depth=0,
+        )
+
+
+def prepare_for_save(instance) -> None:
+    """Decide how `instance.body` is stored and fill the storage fields accordingly."""
+    from .models import ESVersion
+
+    is_new = instance._state.adding or instance.pk is None
+    body_changed = is_new or instance.body != getattr(instance, "_loaded_body", None)
+    if not body_changed:
+        return
+
+    if not is_new:
+        materialize_children(instance)
+
+    instance.body_storage = ESVersion.BodyStorage.FULL
+    instance.body_delta = ""
+    instance.body_chain_depth = 0
+    base = None
+
+    if is_delta_mode():
+        if is_new:
+            base = (
+                ESVersion.objects.filter(company_id=instance.company_id)
+                .order_by("-created_at", "-id")
+                .first()
+            )
+        elif instance.body_base_id is not None:
+            base = ESVersion.objects.filter(pk=instance.body_base_id).first()
+
+    ops = None
+    if base is not None and base.body_chain_depth + 1 < settings.ES_BODY_KEYFRAME_INTERVAL:
+        ops = make_delta(base.body, instance.body)
+    if ops is not None:
+        body_delta = encode_delta(ops)
+        if len(body_delta) < len(instance.body):
+            instance.body_storage = ESVersion.BodyStorage.DELTA
+            instance.body_delta = body_delta
+            instance.body_chain_depth = base.body_chain_depth + 1
+            instance.body_base = base
+            return
+
+    instance.body_base = None
@@ -0,0 +1,77 @@
+"""
+Server-side ES body diffing with an in-process LRU cache.
+"""
+from difflib import SequenceMatcher
+from typing import List, Sequence
+
+from django.conf import settings
+
+from .lru import LRUCache
+
+GRANULARITIES = ("char", "line")
+
+# Compact opcode format: [op, text] with op "=" (equal), "-" (deleted), "+" (inserted).
+# Collapsed equal runs are sent as ["~", <skipped char count>].
+DiffOps = List[list]
+
+
+def _tokenize(text: str, granularity: str) -> Sequence[str]:
+    if granularity == "line":
+        return text.splitlines(keepends=True)
+    # Character granularity: Japanese has no word boundaries, so compare per code point
+    return text
+
+
+def compute_diff(old: str, new: str, granularity: str = "char") -> DiffOps:
+    """
+    Diff two texts and return compact opcodes.
+
+    autojunk is disabled: its "popular element" heuristic treats common kana and
+    punctuation as junk in texts over 200 characters, which wrecks Japanese diffs.
+    """
+    a = _tokenize(old, granularity)
+    b = _tokenize(new, granularity)
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+
+    ops: DiffOps = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["=", "".join(a[i1:i2])])
+            continue
+        if tag in ("delete", "replace"):
+            ops.append(["-", "".join(a[i1:i2])])
+        if tag in ("insert", "replace"):
+            ops.append(["+", "".join(b[j1:j2])])
+    return ops
+
+
+def collapse_context(ops: DiffOps, context: int) -> DiffOps:
+    """Keep `context` chars around each change and replace the rest of equal runs with skips."""
+    collapsed: DiffOps = []
+    last = len(ops) - 1
+    for index, (op, text) in enumerate(ops):
+        if op != "=":
+            collapsed.append([op, text])
+            continue
+        keep_head = context if index > 0 else 0
+        keep_tail = context if index < last else 0
+        if len(text) <= keep_head + keep_tail:
+            collapsed.append([op, text])
+            continue
+        if keep_head:
+            collapsed.append(["=", text[:keep_head]])
+        collapsed.append(["~", len(text) - keep_head - keep_tail])
+        if keep_tail:
+            collapsed.append(["=", text[len(text) - keep_tail:]])
+    return collapsed
+
+
+def diff_stats(ops: DiffOps) -> dict:
+    return {
+        "inserted": sum(len(text) for op, text in ops if op == "+"),
+        "deleted": sum(len(text) for op, text in ops if op == "-"),
+    }
+
+
+# Keyed by (base id, base updated_at, target id, target updated_at, granularity)
+diff_cache = LRUCache(max_entries=settings.ES_DIFF_CACHE_SIZE)
@@ -0,0 +1,122 @@
+"""
+Streaming CSV / JSON Lines serialization of a user's companies and ES history.
+
+Rows are read with QuerySet.iterator(chunk_size=EXPORT_CHUNK_SIZE) and encoded
+one at a time, so memory stays flat regardless of how many rows a user has.
+Delta-stored ES bodies (core.body_storage) are rebuilt from the previous row of
+the same company as the export walks forward, so they cost no extra queries.
+Output is coalesced into ~64 KB pieces to keep per-yield overhead low, except
+for the CSV header and the first row, which are sent immediately.
+"""
+import csv
+import json
+from typing import Iterable, Iterator, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+
+from .body_storage import apply_delta, rebuild_body
+from .models import Company, ESVersion
+
+EXPORT_CHUNK_SIZE = 500
+FLUSH_SIZE = 64 * 1024
+
+COMPANY_FIELDS = (
+    "id", "name", "job_role", "apply_route", "deadline",
+    "status_text", "memo", "created_at", "updated_at",
+)
+ES_FIELDS = (
+    "id", "company_id", "company_name", "body", "submitted_at", "submitted_via",
+    "result", "memo", "file", *ESVersion.TEXT_METRIC_FIELDS, "created_at", "updated_at",
+)
+
+
+def company_rows(user) -> Iterator[dict]:
+    companies = Company.objects.filter(owner=user).order_by("id")
+    for company in companies.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {field: getattr(company, field) for field in COMPANY_FIELDS}
+
+
+def es_rows(user) -> Iterator[dict]:
+    """
+    ES versions oldest first, with the company name from the same query.
+
+    Rows are read as values() so ESVersion.from_db() does not rebuild delta
+    bodies one query per hop. A delta's base is normally the previous version
+    of the same company, which this walk has just emitted, so only the latest
+    body per company is kept; any other base (e.g. after a version in the
+    middle was deleted) falls back to rebuild_body().
+    """
+    versions = (
+        ESVersion.objects.filter(owner=user)
+        .annotate(company_name=F("company__name"))
+        .order_by("created_at", "id")
+        .values(*ES_FIELDS, "body_storage", "body_delta", "body_base_id")
+    )
+    latest = {}  # company_id -> (pk, body)
+    for version in versions.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        body = version["body"]
+        if version["body_storage"] == ESVersion.BodyStorage.DELTA:
+            base_id, base_body = latest.get(version["company_id"], (None, None))
+            if base_id is not None and base_id == version["body_base_id"]:
+                body = apply_delta(base_body, json.loads(version["body_delta"]))
+            else:
+                body = rebuild_body(version["id"], version["body_delta"], version["body_base_id"])
+        latest[version["company_id"]] = (version["id"], body)
+        version["body"] = body
+        version["file"] = version["file"] or ""
+        yield {field: version[field] for field in ES_FIELDS}
+
+
+def _plain(value):
+    if isinstance(value, FieldFile):
+        return value.name or ""
+    return value
+
+
+class _Echo:
+    """File-like object whose write() returns the text, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _coalesce(pieces: Iterable[str]) -> Iterator[bytes]:
+    """Join pieces into ~FLUSH_SIZE chunks; the first piece is sent on its own."""
+    buffer, size, flush_at = [], 0, 1
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= flush_at:
+            flush_at = FLUSH_SIZE
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def stream_csv(rows: Iterable[dict], fields: Sequence[str]) -> Iterator[bytes]:
+    """CSV with a UTF-8 BOM so Excel opens Japanese text correctly."""
+    writer = csv.writer(_Echo())
+    yield ("\ufeff" + writer.writerow(fields)).encode("utf-8")
+
+    def lines():
+        for row in rows:
+            values = [_plain(row[field]) for field in fields]
+            yield writer.writerow(["" if value is None else _isoformat(value) for value in values])
+
+    yield from _coalesce(lines())
+
+
+def stream_jsonl(rows: Iterable[dict]) -> Iterator[bytes]:
+    def lines():
+        for row in rows:
+            plain = {key: _plain(value) for key, value in row.items()}
+            yield json.dumps(plain, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+    yield from _coalesce(lines())
+
+
+def _isoformat(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
@@ -0,0 +1,208 @@
+"""
+Streaming company import from CSV or JSON Lines.
+
+Rows are parsed one at a time from the file object, validated with
+CompanySerializer and inserted with bulk_create every
+COMPANY_IMPORT_BATCH_SIZE rows. Each batch commits its companies, its rejected
+rows (ImportRowError) and the job's progress counters together, so memory stays
+bounded by one batch, progress is visible through /api/imports/{id}/ while the
+import runs, and a rerun of an interrupted job resumes after processed_rows.
+
+Every batch also refreshes the job's updated_at, so a PENDING/RUNNING job that
+has not moved for COMPANY_IMPORT_STALE_AFTER seconds lost its worker thread
+(e.g. the process was restarted): fail_stale_jobs() marks it FAILED, and its
+upload is kept for `manage.py import_companies --job <id>`.
+"""
+import codecs
+import csv
+import io
+import json
+import logging
+import threading
+from datetime import timedelta
+from typing import Callable, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from . import response_cache
+from .audit_sink import audit_sink
+from .models import AuditLog, Company, ImportJob, ImportRowError
+from .serializers import CompanySerializer
+
+logger = logging.getLogger(__name__)
+
+# (row number, parsed row or None, parse error or None)
+ParsedRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+class ImportFileError(Exception):
+    """The file as a whole cannot be read (bad header, encoding...)."""
+
+
+def parse_csv(stream, encoding: str) -> Iterator[ParsedRow]:
+    """Yield rows of a CSV file with a header line; empty cells fall back to defaults."""
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    reader = csv.DictReader(text)
+    if not reader.fieldnames or "name" not in reader.fieldnames:
+        raise ImportFileError("CSV header must include a 'name' column.")
+    # Row numbers count data rows from 1 (the header is not a row)
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+
+
+def parse_jsonl(stream, encoding: str) -> Iterator[ParsedRow]:
+    """Yield one JSON object per non-blank line."""
+    reader = codecs.getreader(encoding)(stream)
+    for row_number, line in enumerate(reader, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield row_number, None, "Invalid JSON."
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object."
+            continue
+        yield row_number, row, None
+
+
+PARSERS = {
+    ImportJob.Format.CSV: parse_csv,
+    ImportJob.Format.JSONL: parse_jsonl,
+}
+
+
+def run_import(job: ImportJob, stream, on_progress: Optional[Callable[[ImportJob], None]] = None) -> ImportJob:
+    """Import every row of `stream` into the job owner's companies."""
+    batch_size = settings.COMPANY_IMPORT_BATCH_SIZE
+    skip = job.processed_rows
+    job.status = ImportJob.Status.RUNNING
+    job.detail = ""
+    job.save(update_fields=["status", "detail", "updated_at"])
+
+    companies, row_errors, batch_rows = [], [], 0
+    try:
+        for index, (row_number, row, parse_error) in enumerate(PARSERS[job.format](stream, job.encoding)):
+            if index < skip:
+                continue
+            batch_rows += 1
+            if parse_error:
+                row_errors.append(ImportRowError(job=job, row=row_number, errors={"non_field_errors": [parse_error]}))
+            else:
+                serializer = CompanySerializer(data=row)
+                if serializer.is_valid():
+                    companies.append(Company(owner_id=job.owner_id, **serializer.validated_data))
+                else:
+                    row_errors.append(ImportRowError(job=job, row=row_number, errors=serializer.errors))
+
+            if batch_rows >= batch_size:
+                _flush_batch(job, companies, row_errors, batch_rows)
+                companies, row_errors, batch_rows = [], [], 0
+                if on_progress:
+                    on_progress(job)
+
+        _flush_batch(job, companies, row_errors, batch_rows)
+        job.status = ImportJob.Status.SUCCEEDED
+    except (ImportFileError, UnicodeDecodeError, csv.Error) as exc:
+        job.status = ImportJob.Status.FAILED
+        job.detail = str(exc)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "detail", "finished_at", "updated_at"])
+    response_cache.bump_generation(job.owner_id)
+    if on_progress:
+        on_progress(job)
+    return job
+
+
+def _flush_batch(job: ImportJob, companies: list, row_errors: list, batch_rows: int) -> None:
+    """Commit one batch together with the job counters."""
+    if not batch_rows:
+        return
+    with transaction.atomic():
+        Company.objects.bulk_create(companies)
+        ImportRowError.objects.bulk_create(row_errors)
+        audit_sink.record_many([
+            AuditLog(
+                user_id=job.owner_id,
+                action=AuditLog.Action.COMPANY_CREATE,
+                target_type="Company",
+                target_id=company.id,
+                ip_address=job.ip_address,
+                user_agent=job.user_agent,
+            )
+            for company in companies
+        ])
+        ImportJob.objects.filter(pk=job.pk).update(
+            processed_rows=F("processed_rows") + batch_rows,
+            created_rows=F("created_rows") + len(companies),
+            error_rows=F("error_rows") + len(row_errors),
+            updated_at=timezone.now(),
+        )
+    job.refresh_from_db(fields=["processed_rows", "created_rows", "error_rows", "updated_at"])
+    response_cache.bump_generation(job.owner_id)
+
+
+def run_import_job(job_id: int) -> None:
+    """
+    Process an uploaded job's stored file, then delete the file.
+
+    The file is deleted once run_import() finishes (succeeded, or failed on
+    the file's own content, which a rerun would hit again). After an
+    unexpected error the job is FAILED but keeps its file so it can be resumed.
+    """
+    job = ImportJob.objects.get(pk=job_id)
+    try:
+        with job.file.open("rb") as stream:
+            run_import(job, stream)
+    except Exception:
+        logger.exception("Company import %s failed", job_id)
+        mark_job_failed(job_id)
+        return
+    job.file.delete(save=False)
+    ImportJob.objects.filter(pk=job_id).update(file="")
+
+
+def mark_job_failed(job_id: int) -> None:
+    """Record an unexpected error so the job is not left RUNNING until it looks stale."""
+    now = timezone.now()
+    ImportJob.objects.filter(pk=job_id).update(
+        status=ImportJob.Status.FAILED,
+        detail="Internal error.",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def fail_stale_jobs(jobs: QuerySet[ImportJob]) -> int:
+    """Mark PENDING/RUNNING jobs whose worker stopped reporting progress as FAILED."""
+    now = timezone.now()
+    return jobs.filter(
+        status__in=[ImportJob.Status.PENDING, ImportJob.Status.RUNNING],
+        updated_at__lt=now - timedelta(seconds=settings.COMPANY_IMPORT_STALE_AFTER),
+    ).update(
+        status=ImportJob.Status.FAILED,
+        detail="Import worker stopped.",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def start_import_job(job: ImportJob) -> None:
+    """Run the job inline, or in a background thread once the upload is committed."""
+    if not settings.COMPANY_IMPORT_ASYNC:
+        run_import_job(job.pk)
+        return
+
+    def worker():
+        close_old_connections()
+        try:
+            run_import_job(job.pk)
+        finally:
+            connection.close()
+
+    transaction.on_commit(lambda: threading.Thread(target=worker, daemon=True).start())
@@ -0,0 +1,47 @@
+"""
+Move audit log months older than the retention window into compressed archives.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.audit_archive import ArchiveVerificationError, archive_old_logs
+
+
+class Command(BaseCommand):
+    help = (
+        "Archive whole months of AuditLog rows older than AUDIT_RETENTION_DAYS to "
+        "gzip JSONL files in AUDIT_ARCHIVE_DIR, then delete them in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.AUDIT_RETENTION_DAYS,
+            help="Retention window in days (default: AUDIT_RETENTION_DAYS).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.AUDIT_RETENTION_BATCH_SIZE,
+            help="Rows deleted per transaction (default: AUDIT_RETENTION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be archived without writing or deleting anything.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            results = archive_old_logs(
+                options["days"], dry_run=options["dry_run"], batch_size=options["batch_size"]
+            )
+        except ArchiveVerificationError as exc:
+            raise CommandError(str(exc))
+
+        verb = "Would archive" if options["dry_run"] else "Archived"
+        for result in results:
+            self.stdout.write(f"{verb} {result.rows} rows from {result.month:%Y-%m} to {result.path}")
+        total = sum(result.rows for result in results)
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total} audit log entries in {len(results)} file(s)."))
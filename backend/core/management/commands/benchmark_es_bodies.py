@@ -0,0 +1,60 @@
+"""
+Report the space saved by delta body storage and the read-latency cost of rebuilding bodies.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from core.body_storage import body_cache, stored_size
+from core.models import ESVersion
+
+
+class Command(BaseCommand):
+    help = "Benchmark ES body storage: stored vs logical size, and per-read latency."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=200,
+            help="Number of most recent versions to time reads for (default: 200).",
+        )
+
+    def handle(self, *args, **options):
+        counts = ESVersion.objects.aggregate(
+            total=Count("id"),
+            delta=Count("id", filter=Q(body_storage=ESVersion.BodyStorage.DELTA)),
+        )
+        stored = stored_size()
+        logical = sum(len(version.body) for version in ESVersion.objects.iterator(chunk_size=200))
+        saved = logical - stored
+        ratio = saved / logical if logical else 0.0
+
+        self.stdout.write(f"versions: {counts['total']} ({counts['delta']} stored as deltas)")
+        self.stdout.write(f"logical body chars: {logical}")
+        self.stdout.write(f"stored chars:       {stored} ({saved} saved, {ratio:.1%})")
+
+        ids = list(ESVersion.objects.order_by("-id").values_list("id", flat=True)[:options["sample"]])
+        if not ids:
+            return
+
+        # Stored columns only: a delta row's text is not rebuilt here (baseline cost)
+        raw_ms = self._time(
+            lambda pk: ESVersion.objects.filter(pk=pk).values_list("body", "body_storage", "body_delta").get(), ids
+        )
+        body_cache.clear()
+        cold_ms = self._time(lambda pk: ESVersion.objects.get(pk=pk).body, ids)
+        warm_ms = self._time(lambda pk: ESVersion.objects.get(pk=pk).body, ids)
+
+        self.stdout.write(f"read latency over {len(ids)} versions (ms/read):")
+        self.stdout.write(f"  stored columns:    {raw_ms:.3f}")
+        self.stdout.write(f"  rebuilt, cold LRU: {cold_ms:.3f} (+{cold_ms - raw_ms:.3f})")
+        self.stdout.write(f"  rebuilt, warm LRU: {warm_ms:.3f} (+{warm_ms - raw_ms:.3f})")
+
+    @staticmethod
+    def _time(read, ids) -> float:
+        start = time.perf_counter()
+        for pk in ids:
+            read(pk)
+        return (time.perf_counter() - start) * 1000 / len(ids)
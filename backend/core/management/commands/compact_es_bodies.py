@@ -0,0 +1,95 @@
+"""
+Backfill ESVersion body storage: convert existing rows to delta chains (or back to full text).
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.body_storage import encode_delta, make_delta, stored_size
+from core.models import ESVersion
+
+
+class Command(BaseCommand):
+    help = "Rewrite ES bodies as keyframes + deltas per company (or expand them back to full text)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mode",
+            choices=["delta", "full"],
+            default="delta",
+            help="Target storage mode (default: delta).",
+        )
+        parser.add_argument(
+            "--keyframe-interval",
+            type=int,
+            default=settings.ES_BODY_KEYFRAME_INTERVAL,
+            help="Store a full keyframe every N versions (default: ES_BODY_KEYFRAME_INTERVAL).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Compute the result without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        mode = options["mode"]
+        interval = max(1, options["keyframe_interval"])
+        dry_run = options["dry_run"]
+
+        before = stored_size()
+        after = 0
+        version_count = 0
+        company_ids = (
+            ESVersion.objects.order_by("company_id").values_list("company_id", flat=True).distinct()
+        )
+
+        for company_id in company_ids.iterator():
+            with transaction.atomic():
+                # Rows are loaded through the model, so existing deltas are rebuilt first
+                versions = list(
+                    ESVersion.objects.select_for_update()
+                    .filter(company_id=company_id)
+                    .order_by("created_at", "id")
+                )
+                previous, previous_body = None, ""
+                for version in versions:
+                    full_body = version.body
+                    self._assign_storage(version, previous, previous_body, mode, interval)
+                    previous, previous_body = version, full_body
+                    after += len(version.body) + len(version.body_delta)
+                version_count += len(versions)
+
+                if not dry_run:
+                    # bulk_update skips auto_now, so updated_at and sync watermarks are untouched
+                    ESVersion.objects.bulk_update(versions, list(ESVersion.BODY_STORAGE_FIELDS))
+
+        saved = before - after
+        ratio = saved / before if before else 0.0
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{version_count} versions -> {mode}: stored chars {before} -> {after} "
+            f"({saved} saved, {ratio:.1%})"
+        ))
+
+    @staticmethod
+    def _assign_storage(version: ESVersion, previous, previous_body: str, mode: str, interval: int) -> None:
+        """Set the storage columns of `version` (in memory) given its predecessor."""
+        full_body = version.body
+        version.body_storage = ESVersion.BodyStorage.FULL
+        version.body_delta = ""
+        version.body_base = None
+        version.body_chain_depth = 0
+
+        if mode != "delta" or previous is None or previous.body_chain_depth + 1 >= interval:
+            return
+
+        ops = make_delta(previous_body, full_body)
+        if ops is None:
+            return
+        body_delta = encode_delta(ops)
+        if len(body_delta) < len(full_body):
+            version.body_storage = ESVersion.BodyStorage.DELTA
+            version.body_delta = body_delta
+            version.body_base = previous
+            version.body_chain_depth = previous.body_chain_depth + 1
+            version.body = ""
@@ -0,0 +1,72 @@
+"""
+Import companies for a user from a local CSV/JSONL file, or resume an interrupted upload job.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import mark_job_failed, run_import, run_import_job
+from core.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = "Stream-import companies from CSV (with header) or JSON Lines in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="CSV or JSONL file to import.")
+        parser.add_argument("--user-id", type=int, help="Owner of the imported companies.")
+        parser.add_argument(
+            "--format",
+            choices=ImportJob.Format.values,
+            help="File format (default: inferred from the extension).",
+        )
+        parser.add_argument("--encoding", choices=ImportJob.ENCODINGS, default="utf-8-sig")
+        parser.add_argument(
+            "--job",
+            type=int,
+            help="Resume an uploaded ImportJob whose worker was interrupted.",
+        )
+
+    def handle(self, *args, **options):
+        if options["job"] is not None:
+            job = self._resume(options["job"])
+        else:
+            job = self._import_file(options)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Import {job.id} {job.status}: {job.processed_rows} rows, "
+            f"{job.created_rows} created, {job.error_rows} rejected."
+        ))
+        if job.detail:
+            self.stdout.write(job.detail)
+
+    def _resume(self, job_id: int) -> ImportJob:
+        job = ImportJob.objects.filter(pk=job_id).first()
+        if job is None:
+            raise CommandError(f"ImportJob {job_id} does not exist.")
+        if job.status == ImportJob.Status.SUCCEEDED or not job.file:
+            raise CommandError(f"ImportJob {job_id} has nothing left to import.")
+        run_import_job(job.pk)
+        job.refresh_from_db()
+        return job
+
+    def _import_file(self, options) -> ImportJob:
+        path, user_id = options["path"], options["user_id"]
+        if not path or user_id is None:
+            raise CommandError("Pass a file path and --user-id (or --job).")
+        if not get_user_model().objects.filter(pk=user_id).exists():
+            raise CommandError(f"User {user_id} does not exist.")
+
+        file_format = options["format"] or path.lower().rsplit(".", 1)[-1]
+        if file_format not in ImportJob.Format.values:
+            raise CommandError("Cannot infer format; pass --format csv|jsonl.")
+
+        job = ImportJob.objects.create(owner_id=user_id, format=file_format, encoding=options["encoding"])
+        with open(path, "rb") as stream:
+            try:
+                return run_import(job, stream, on_progress=self._report)
+            except Exception as exc:
+                mark_job_failed(job.pk)
+                raise CommandError(f"Import {job.id} failed: {exc}") from exc
+
+    def _report(self, job: ImportJob) -> None:
+        self.stdout.write(f"  {job.processed_rows} rows processed ({job.error_rows} rejected)")
@@ -0,0 +1,50 @@
+"""
+Delete sync tombstones older than the retention window.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete Tombstone rows older than TOMBSTONE_RETENTION_DAYS in batches. "
+        "/api/sync answers older watermarks with a full snapshot (full_resync=true)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.AUDIT_RETENTION_BATCH_SIZE,
+            help="Rows deleted per transaction (default: AUDIT_RETENTION_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report how many tombstones would be deleted without deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        # The window is not a command option: /api/sync decides from the same setting
+        # whether a watermark is still covered by the remaining tombstones.
+        cutoff = timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Would delete {expired.count()} tombstones."))
+            return
+
+        deleted = 0
+        while True:
+            ids = list(expired.order_by("id").values_list("id", flat=True)[:options["batch_size"]])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted += Tombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d}."))
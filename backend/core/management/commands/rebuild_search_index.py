@@ -0,0 +1,46 @@
+"""
+Rebuild the ES search indexes (e.g. after the initial migration).
+"""
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from core import search, similarity
+from core.models import ESVersion
+
+INDEXERS = {
+    "search": search.index_es_version,
+    # Signatures are compared before writing; force also restores lost bucket rows
+    "similarity": partial(similarity.index_es_version, force=True),
+}
+
+
+class Command(BaseCommand):
+    help = "Reindex ES versions into the bigram search index and the MinHash/LSH similarity index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="Only reindex ES versions owned by this user.",
+        )
+        parser.add_argument(
+            "--only",
+            choices=sorted(INDEXERS),
+            help="Rebuild a single index (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        versions = ESVersion.objects.order_by("pk")
+        if options["user_id"] is not None:
+            versions = versions.filter(owner_id=options["user_id"])
+
+        indexers = [INDEXERS[options["only"]]] if options["only"] else list(INDEXERS.values())
+        count = 0
+        # Rows are loaded through the model, so delta-stored bodies are rebuilt
+        for version in versions.iterator(chunk_size=200):
+            for indexer in indexers:
+                indexer(version)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {count} ES versions."))
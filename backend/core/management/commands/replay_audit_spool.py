@@ -0,0 +1,26 @@
+"""
+Insert audit log entries that the batched writer spooled to disk after a failed flush.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.audit_sink import replay_spool
+
+
+class Command(BaseCommand):
+    help = "Replay AUDIT_LOG_SPOOL_PATH into the AuditLog table and remove the spool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=settings.AUDIT_LOG_SPOOL_PATH,
+            help="Spool file (default: AUDIT_LOG_SPOOL_PATH).",
+        )
+
+    def handle(self, *args, **options):
+        inserted, quarantined = replay_spool(options["path"])
+        self.stdout.write(self.style.SUCCESS(f"Replayed {inserted} audit log entries."))
+        if quarantined:
+            self.stdout.write(self.style.WARNING(
+                f"{quarantined} invalid entries moved to {settings.AUDIT_LOG_QUARANTINE_PATH}."
+            ))
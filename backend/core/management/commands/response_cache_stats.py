@@ -0,0 +1,30 @@
+"""
+Report (and optionally reset) the per-user response cache hit/miss counters.
+"""
+from django.core.management.base import BaseCommand
+
+from core import response_cache
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the per-user list response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        if not response_cache.is_enabled():
+            self.stdout.write(self.style.WARNING("Response cache is disabled (RESPONSE_CACHE_ENABLED=0)."))
+
+        stats = response_cache.get_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} hit_ratio={stats['hit_ratio']:.1%}"
+        )
+
+        if options["reset"]:
+            response_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,31 @@
+"""
+Recompute the hourly and daily audit log rollups for recently closed hours.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core.audit_rollup import compact
+from core.utils import parse_timestamp
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild AuditRollup rows from AUDIT_ROLLUP_LOOKBACK_HOURS before the newest "
+        "hourly rollup up to the current hour. Run it from cron every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Recompute from this ISO date/datetime instead (e.g. after replaying an audit spool).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_timestamp(options["since"], "since") if options["since"] else None
+        except ValidationError:
+            raise CommandError(f"Invalid --since '{options['since']}' (expected an ISO date or datetime).")
+        start, end = compact(since=since)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled up audit logs from {start:%Y-%m-%d %H:00} to {end:%Y-%m-%d %H:00}."
+        ))
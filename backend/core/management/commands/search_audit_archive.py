@@ -0,0 +1,52 @@
+"""
+Search archived audit log months and print matching entries as JSON Lines.
+"""
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.audit_archive import ArchiveVerificationError, search_archives
+
+
+def _month(value):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}' (expected YYYY-MM).")
+
+
+class Command(BaseCommand):
+    help = "Search audit log archives (verifying checksums) and print matches as JSONL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First month to search (YYYY-MM).")
+        parser.add_argument("--until", help="Last month to search (YYYY-MM).")
+        parser.add_argument("--user-id", type=int)
+        parser.add_argument("--action")
+        parser.add_argument("--ip")
+        parser.add_argument("--contains", help="Case-insensitive substring of the raw entry.")
+        parser.add_argument(
+            "--no-verify",
+            action="store_true",
+            help="Skip the SHA-256 check (e.g. to read what is left of a damaged archive).",
+        )
+
+    def handle(self, *args, **options):
+        entries = search_archives(
+            since=_month(options["since"]) if options["since"] else None,
+            until=_month(options["until"]) if options["until"] else None,
+            user_id=options["user_id"],
+            action=options["action"],
+            ip_address=options["ip"],
+            contains=options["contains"],
+            verify=not options["no_verify"],
+        )
+        matched = 0
+        try:
+            for entry in entries:
+                self.stdout.write(json.dumps(entry, ensure_ascii=False))
+                matched += 1
+        except ArchiveVerificationError as exc:
+            raise CommandError(str(exc))
+        self.stderr.write(self.style.SUCCESS(f"{matched} matching entries."))
@@ -0,0 +1,26 @@
+"""
+Report how much space interning AuditLog user agents saves.
+"""
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from core.user_agents import space_report
+
+
+class Command(BaseCommand):
+    help = "Show distinct user agents, referencing audit rows and the estimated space reclaimed."
+
+    def handle(self, *args, **options):
+        report = space_report()
+        self.stdout.write(f"distinct agents: {report['agents']}")
+        self.stdout.write(f"audit rows with an agent: {report['audit_rows']}")
+        self.stdout.write(f"inline strings: {filesizeformat(report['inline_bytes'])}")
+        self.stdout.write(f"interned (agent table + foreign keys): {filesizeformat(report['interned_bytes'])}")
+        if "auditlog_table_bytes" in report:
+            self.stdout.write(
+                f"on disk: core_auditlog {filesizeformat(report['auditlog_table_bytes'])}, "
+                f"core_useragent {filesizeformat(report['useragent_table_bytes'])}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Reclaimed (estimate): {filesizeformat(max(report['reclaimed_bytes'], 0))}"
+        ))
@@ -0,0 +1,65 @@
+"""
+Cached ownership checks for protected media.
+
+A positive or negative answer to "may user U read path P" is cached for
+MEDIA_AUTH_CACHE_TIMEOUT seconds under a key embedding the user's generation
+counter (the same scheme as core.response_cache). Saving or deleting an ES
+version bumps its owner's generation, so a changed or removed attachment is
+re-checked against the (owner, file) index on the next request.
+
+The generation is bumped after the write commits, so a concurrent request
+cannot cache a decision read from the pre-commit state under the new
+generation. The cache is only used with MEDIA_AUTH_CACHE_ENABLED (by default
+when REDIS_URL gives a backend shared by all workers): with per-process
+caches the other workers would never see the bump.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ESVersion
+
+GENERATION_KEY = "mediaauth:gen:{user_id}"
+ENTRY_KEY = "mediaauth:{user_id}:{generation}:{digest}"
+
+
+def is_enabled() -> bool:
+    return settings.MEDIA_AUTH_CACHE_ENABLED
+
+
+def generation(user_id: int) -> int:
+    key = GENERATION_KEY.format(user_id=user_id)
+    value = cache.get(key)
+    if value is None:
+        # Time-based start, so an evicted counter never reuses an old generation
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        value = cache.get(key)
+    return value
+
+
+def invalidate(user_id: int) -> None:
+    """Forget every cached media decision for the user."""
+    if not is_enabled():
+        return
+    key = GENERATION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+
+
+def owns_es_file(user_id: int, file_path: str) -> bool:
+    """Whether `file_path` is the attachment of one of the user's ES versions."""
+    # Served by the (owner, file) index
+    owned = ESVersion.objects.filter(owner_id=user_id, file=file_path)
+    if not is_enabled():
+        return owned.exists()
+    digest = hashlib.sha256(file_path.encode("utf-8")).hexdigest()[:32]
+    key = ENTRY_KEY.format(user_id=user_id, generation=generation(user_id), digest=digest)
+    allowed = cache.get(key)
+    if allowed is None:
+        allowed = owned.exists()
+        cache.set(key, allowed, timeout=settings.MEDIA_AUTH_CACHE_TIMEOUT)
+    return allowed
@@ -0,0 +1,77 @@
+"""
+Signed, expiring URLs for protected media.
+
+The ES serializers emit attachment URLs carrying `uid`, `exp` and `sig`
+query parameters, where `sig` is an HMAC-SHA256 (keyed from SECRET_KEY) over
+the user id, the user's media generation (core.media_access), the expiry and
+the file path. ProtectedMediaView accepts such a URL without a session or an
+ownership query: checking it costs one HMAC and one cache read.
+
+Saving or deleting one of the user's ES versions bumps the generation once
+the write commits, which revokes every link issued to that user, so a
+deleted or replaced attachment stops being served immediately. The generation
+must be visible to every worker, so signing needs the shared media cache
+(MEDIA_AUTH_CACHE_ENABLED). A request whose signature is stale, revoked or
+forged is not refused outright: it falls back to session authentication and
+the ownership check.
+
+Expiries are rounded up to the next MEDIA_SIGNED_URL_TTL window (and at least
+one full window ahead), so the same file gets the same URL for a whole
+window: browsers can cache the download, and cached API responses keep
+valid links. MEDIA_SIGNED_URL_TTL=0 disables signing.
+"""
+import time
+from typing import Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from . import media_access
+
+KEY_SALT = "core.media_signing"
+
+
+def is_enabled() -> bool:
+    return settings.MEDIA_SIGNED_URL_TTL > 0 and media_access.is_enabled()
+
+
+def _signature(file_path: str, user_id: int, expires: int) -> str:
+    value = f"{user_id}:{media_access.generation(user_id)}:{expires}:{file_path}"
+    return salted_hmac(KEY_SALT, value, algorithm="sha256").hexdigest()
+
+
+def current_window(now: Optional[float] = None) -> int:
+    """Index of the signing window; signed URLs change when it does."""
+    return int(now if now is not None else time.time()) // settings.MEDIA_SIGNED_URL_TTL
+
+
+def sign(file_path: str, user_id: int, now: Optional[float] = None) -> str:
+    """Query string granting `user_id` read access to `file_path` until the window ends."""
+    expires = (current_window(now) + 2) * settings.MEDIA_SIGNED_URL_TTL
+    return urlencode({
+        "uid": user_id,
+        "exp": expires,
+        "sig": _signature(file_path, user_id, expires),
+    })
+
+
+def is_signed(params) -> bool:
+    """Whether the request presents a signature (valid or not)."""
+    return "sig" in params
+
+
+def verify(file_path: str, params, now: Optional[float] = None) -> Optional[int]:
+    """Seconds the signed URL stays valid, or None if it is forged, malformed, expired or revoked."""
+    if not is_enabled():
+        return None
+    try:
+        user_id, expires = int(params.get("uid", "")), int(params.get("exp", ""))
+    except ValueError:
+        return None
+    remaining = expires - int(now if now is not None else time.time())
+    if remaining <= 0:
+        return None
+    if not constant_time_compare(_signature(file_path, user_id, expires), params.get("sig", "")):
+        return None
+    return remaining
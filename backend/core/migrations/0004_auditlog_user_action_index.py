@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 01:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_usersettings_display_name_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['user', 'action', '-created_at'], name='core_auditl_user_id_64b9a4_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 01:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_auditlog_user_action_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='esversion',
+            index=models.Index(fields=['owner', '-created_at'], name='core_esvers_owner_i_516da0_idx'),
+        ),
+    ]
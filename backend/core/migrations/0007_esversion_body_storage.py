@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-17 01:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_tombstone_and_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='esversion',
+            name='body_base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='delta_children', to='core.esversion'),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='body_chain_depth',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='body_delta',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='body_storage',
+            field=models.CharField(choices=[('FULL', 'Full'), ('DELTA', 'Delta')], default='FULL', max_length=10),
+        ),
+    ]
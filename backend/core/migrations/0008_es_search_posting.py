@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-17 01:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_esversion_body_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ESSearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=8)),
+                ('count', models.PositiveIntegerField(default=1)),
+                ('es_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_postings', to='core.esversion')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'gram'], name='core_essear_owner_i_7bb917_idx')],
+                'constraints': [models.UniqueConstraint(fields=('es_version', 'gram'), name='uniq_search_posting_gram')],
+            },
+        ),
+    ]
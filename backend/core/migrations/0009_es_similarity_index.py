@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-17 01:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_es_search_posting'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ESMinHash',
+            fields=[
+                ('es_version', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='minhash', serialize=False, to='core.esversion')),
+                ('signature', models.JSONField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ESSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(max_length=16)),
+                ('es_version', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_buckets', to='core.esversion')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'bucket'], name='core_essimi_owner_i_499f5a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('es_version', 'bucket'), name='uniq_similarity_bucket')],
+            },
+        ),
+    ]
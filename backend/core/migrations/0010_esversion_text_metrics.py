@@ -0,0 +1,130 @@
+# Generated by Django 6.0 on 2026-10-17 01:33
+
+import json
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 500
+METRIC_FIELDS = ["char_count", "char_count_no_ws", "line_count", "paragraph_count"]
+
+# Frozen copies of core.body_storage.apply_delta and core.text_metrics.compute_metrics
+# as of this migration, so later changes to those modules cannot alter it
+_PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n")
+
+
+def apply_delta(base, ops):
+    parts = []
+    position = 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op >= 0:
+            parts.append(base[position:position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(parts)
+
+
+def compute_metrics(text):
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return {
+        "char_count": len(text),
+        "char_count_no_ws": sum(1 for char in text if not char.isspace()),
+        "line_count": len(text.splitlines()),
+        "paragraph_count": sum(1 for block in _PARAGRAPH_BREAK.split(text) if block.strip()),
+    }
+
+
+def backfill_text_metrics(apps, schema_editor):
+    """
+    Compute metrics for existing rows, rebuilding delta-stored bodies by hand.
+
+    Rows are streamed in creation order, so a delta's base (an older row) has
+    normally been seen already. A body is only kept while delta rows that
+    still need it as their base remain; a base that is missing from the memo
+    is rebuilt with one query per hop.
+    """
+    ESVersion = apps.get_model("core", "ESVersion")
+    columns = ("body", "body_storage", "body_delta", "body_base_id")
+    pending = dict(
+        ESVersion.objects.filter(body_storage="DELTA", body_base__isnull=False)
+        .values_list("body_base_id")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    bodies = {}
+
+    def fetch(pk):
+        if pk is None:
+            return ""
+        body, storage, body_delta, base_id = ESVersion.objects.values_list(*columns).get(pk=pk)
+        if storage == "DELTA":
+            return apply_delta(fetch(base_id), json.loads(body_delta))
+        return body
+
+    def base_body(base_id):
+        if base_id not in bodies:
+            return fetch(base_id)
+        body = bodies[base_id]
+        pending[base_id] -= 1
+        if not pending[base_id]:
+            del bodies[base_id]
+        return body
+
+    rows = ESVersion.objects.order_by("created_at", "id").values_list("id", *columns)
+    batch = []
+    for pk, body, storage, body_delta, base_id in rows.iterator(chunk_size=BATCH_SIZE):
+        if storage == "DELTA":
+            body = apply_delta(base_body(base_id), json.loads(body_delta))
+        if pending.get(pk):
+            bodies[pk] = body
+        batch.append(ESVersion(pk=pk, **compute_metrics(body)))
+        if len(batch) >= BATCH_SIZE:
+            ESVersion.objects.bulk_update(batch, METRIC_FIELDS)
+            batch = []
+    if batch:
+        ESVersion.objects.bulk_update(batch, METRIC_FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_es_similarity_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='esversion',
+            name='char_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='char_count_no_ws',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='line_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='esversion',
+            name='paragraph_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='esversion',
+            index=models.Index(fields=['owner', 'char_count'], name='core_esvers_owner_i_ae58aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='esversion',
+            index=models.Index(fields=['owner', 'char_count_no_ws'], name='core_esvers_owner_i_71128d_idx'),
+        ),
+        migrations.RunPython(backfill_text_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 01:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_import_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('LOGIN_SUCCESS', 'Login Success'), ('LOGIN_FAIL', 'Login Fail'), ('LOGOUT', 'Logout'), ('COMPANY_CREATE', 'Company Create'), ('COMPANY_UPDATE', 'Company Update'), ('COMPANY_DELETE', 'Company Delete'), ('ES_CREATE', 'ES Create'), ('ES_UPDATE', 'ES Update'), ('ES_DELETE', 'ES Delete'), ('SETTINGS_UPDATE', 'Settings Update'), ('ACCOUNT_EXPORT', 'Account Export')], max_length=50),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-17 02:01
+
+import hashlib
+from collections import defaultdict
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def intern_user_agents(apps, schema_editor):
+    """Point existing audit rows at interned agents, one short transaction per batch."""
+    AuditLog = apps.get_model("core", "AuditLog")
+    UserAgent = apps.get_model("core", "UserAgent")
+    pending = AuditLog.objects.filter(agent__isnull=True).exclude(user_agent="").order_by("id")
+    last_id = 0
+    while True:
+        rows = list(pending.filter(id__gt=last_id).values_list("id", "user_agent")[:BATCH_SIZE])
+        if not rows:
+            return
+        digests = {_hash(value): value for _, value in rows}
+        with transaction.atomic():
+            UserAgent.objects.bulk_create(
+                [UserAgent(sha256=digest, value=value) for digest, value in digests.items()],
+                ignore_conflicts=True,
+            )
+            ids = dict(UserAgent.objects.filter(sha256__in=list(digests)).values_list("sha256", "id"))
+            rows_by_agent = defaultdict(list)
+            for pk, value in rows:
+                rows_by_agent[ids[_hash(value)]].append(pk)
+            for agent_id, pks in rows_by_agent.items():
+                AuditLog.objects.filter(id__in=pks).update(agent_id=agent_id)
+        last_id = rows[-1][0]
+
+
+def restore_user_agents(apps, schema_editor):
+    """Copy interned values back into the inline column."""
+    AuditLog = apps.get_model("core", "AuditLog")
+    UserAgent = apps.get_model("core", "UserAgent")
+    for agent_id, value in UserAgent.objects.values_list("id", "value").iterator():
+        AuditLog.objects.filter(agent_id=agent_id).update(user_agent=value)
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own, so a large table is never locked as a whole
+    # and an interrupted backfill resumes where it stopped
+    atomic = False
+
+    dependencies = [
+        ('core', '0015_user_agent_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(intern_user_agents, restore_user_agents),
+    ]
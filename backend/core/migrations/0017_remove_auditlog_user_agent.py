@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 02:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_backfill_user_agents'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='user_agent',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 02:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_remove_auditlog_user_agent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('action', models.CharField(choices=[('LOGIN_SUCCESS', 'Login Success'), ('LOGIN_FAIL', 'Login Fail'), ('LOGOUT', 'Logout'), ('COMPANY_CREATE', 'Company Create'), ('COMPANY_UPDATE', 'Company Update'), ('COMPANY_DELETE', 'Company Delete'), ('ES_CREATE', 'ES Create'), ('ES_UPDATE', 'ES Update'), ('ES_DELETE', 'ES Delete'), ('SETTINGS_UPDATE', 'Settings Update'), ('ACCOUNT_EXPORT', 'Account Export')], max_length=50)),
+                ('count', models.PositiveIntegerField()),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-period_start', 'action'],
+                'indexes': [models.Index(fields=['granularity', 'period_start'], name='core_auditr_granula_8975bc_idx'), models.Index(fields=['user', 'granularity', 'period_start'], name='core_auditr_user_id_afecb1_idx')],
+            },
+        ),
+    ]
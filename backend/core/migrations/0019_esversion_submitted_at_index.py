@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 02:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_audit_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='esversion',
+            index=models.Index(fields=['-submitted_at'], name='core_esvers_submitt_fd9b22_idx'),
+        ),
+    ]
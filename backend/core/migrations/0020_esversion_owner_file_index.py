@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 02:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_esversion_submitted_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='esversion',
+            index=models.Index(fields=['owner', 'file'], name='core_esvers_owner_i_41faaa_idx'),
+        ),
+    ]
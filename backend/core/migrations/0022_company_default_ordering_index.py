@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 03:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_auditlog_user_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='company',
+            index=models.Index(fields=['owner', 'deadline', '-updated_at', '-id'], name='core_compan_owner_i_96ebf6_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.conf import settings
+from django.core.exceptions import FieldError
 from django.db import models
+from django.utils import timezone
 
 
 class UserSettings(models.Model):
@@ -44,12 +46,52 @@ class Company(models.Model):
         indexes = [
             models.Index(fields=["owner", "deadline"]),
             models.Index(fields=["owner", "-updated_at"]),
+            # Default list ordering (deadline NULLS LAST, -updated_at, -id), so
+            # keyset pages are read in index order without a sort
+            models.Index(fields=["owner", "deadline", "-updated_at", "-id"]),
         ]
 
     def __str__(self) -> str:
         return f"Company(id={self.id}, name={self.name}, owner_id={self.owner_id})"
 
 
+class ESVersionQuerySet(models.QuerySet):
+    """
+    Keep the delta-storage columns next to `body` (see core.body_storage).
+
+    A delta row's `body` column is empty: the text can only be rebuilt when
+    body_storage / body_delta / body_base are loaded too, so only() adds them
+    and defer() never drops them while `body` is loaded. values() cannot
+    rebuild at all and refuses `body` without `body_storage`.
+    """
+
+    def only(self, *fields):
+        if "body" in fields:
+            fields = (*fields, *self.model.BODY_STORAGE_FIELDS, "updated_at")
+        return super().only(*fields)
+
+    def defer(self, *fields):
+        if fields != (None,) and "body" not in fields:
+            fields = tuple(field for field in fields if field not in self.model.BODY_STORAGE_FIELDS)
+        return super().defer(*fields)
+
+    def values(self, *fields, **expressions):
+        self._check_raw_body(fields)
+        return super().values(*fields, **expressions)
+
+    def values_list(self, *fields, flat=False, named=False):
+        self._check_raw_body(fields)
+        return super().values_list(*fields, flat=flat, named=named)
+
+    @staticmethod
+    def _check_raw_body(fields) -> None:
+        if "body" in fields and "body_storage" not in fields:
+            raise FieldError(
+                "ESVersion.body read with values() is the stored column (empty for delta rows); "
+                "include body_storage and rebuild deltas, or load instances."
+            )
+
+
 class ESVersion(models.Model):
     """ES (Entry Sheet) version model for tracking ES submissions."""
 
@@ -58,6 +100,17 @@ class ESVersion(models.Model):
         PASS = "PASS", "Pass"
         FAIL = "FAIL", "Fail"
 
+    class BodyStorage(models.TextChoices):
+        FULL = "FULL", "Full"
+        DELTA = "DELTA", "Delta"
+
+    # Columns backing delta-compressed body storage (see core.body_storage)
+    BODY_STORAGE_FIELDS = ("body", "body_storage", "body_delta", "body_base", "body_chain_depth")
+    # Attnames from_db() needs alongside `body` to rebuild a delta
+    BODY_REBUILD_ATTNAMES = ("body_storage", "body_delta", "body_base_id")
+    # Columns derived from `body` at save time (see core.text_metrics)
+    TEXT_METRIC_FIELDS = ("char_count", "char_count_no_ws", "line_count", "paragraph_count")
+
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -79,18 +132,313 @@ class ESVersion(models.Model):
     memo = models.TextField(blank=True, default="")
     file = models.FileField(upload_to="es_files/", null=True, blank=True)
 
+    # Body storage: FULL rows keep the text in `body`; DELTA rows keep an empty
+    # `body` and a delta against `body_base` (rebuilt transparently on load).
+    body_storage = models.CharField(
+        max_length=10,
+        choices=BodyStorage.choices,
+        default=BodyStorage.FULL,
+    )
+    body_delta = models.TextField(blank=True, default="")
+    body_base = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="delta_children",
+    )
+    body_chain_depth = models.PositiveSmallIntegerField(default=0)
+
+    # Body metrics, kept in sync by save() so length checks never load `body`
+    char_count = models.PositiveIntegerField(default=0)
+    char_count_no_ws = models.PositiveIntegerField(default=0)
+    line_count = models.PositiveIntegerField(default=0)
+    paragraph_count = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ESVersionQuerySet.as_manager()
+
     class Meta:
         indexes = [
             models.Index(fields=["owner", "company"]),
+            models.Index(fields=["owner", "-created_at"]),
+            models.Index(fields=["owner", "updated_at"]),
             models.Index(fields=["company", "-created_at"]),
+            models.Index(fields=["owner", "char_count"]),
+            models.Index(fields=["owner", "char_count_no_ws"]),
+            # Admin date drill-down across all owners (see core.admin_utils)
+            models.Index(fields=["-submitted_at"]),
+            # Protected media ownership check (see core.media_access)
+            models.Index(fields=["owner", "file"]),
         ]
 
     def __str__(self) -> str:
         return f"ESVersion(id={self.id}, company_id={self.company_id}, owner_id={self.owner_id})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Rebuild delta-stored bodies so `body` always holds the full text."""
+        from .body_storage import body_cache, rebuild_body
+
+        instance = super().from_db(db, field_names, values)
+        deferred = instance.get_deferred_fields()
+        if "body" in deferred:
+            return instance
+        if deferred.intersection(cls.BODY_REBUILD_ATTNAMES):
+            # ESVersionQuerySet prevents this; a raw() or foreign queryset could not
+            raise FieldError(
+                "ESVersion.body was loaded without body_storage/body_delta/body_base; "
+                "a delta row's text cannot be rebuilt."
+            )
+
+        if instance.body_storage == cls.BodyStorage.DELTA:
+            cache_key = (instance.pk, instance.updated_at) if "updated_at" not in deferred else None
+            body = body_cache.get(cache_key) if cache_key else None
+            if body is None:
+                body = rebuild_body(instance.pk, instance.body_delta, instance.body_base_id)
+                if cache_key:
+                    body_cache.set(cache_key, body)
+            instance.body = body
+        instance._loaded_body = instance.body
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """Load the storage columns together with a deferred body so it can be rebuilt."""
+        if fields is not None and "body" in fields:
+            fields = set(fields) | set(self.BODY_STORAGE_FIELDS) | {"updated_at"}
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if "body" not in self.get_deferred_fields():
+            self._loaded_body = self.body
+
+    def prepare_bulk_save(self) -> None:
+        """
+        Do the work of save() for bulk_create/bulk_update, which bypass it.
+
+        Rows are written as full keyframes (compact_es_bodies can re-delta them),
+        so every column in BODY_STORAGE_FIELDS is consistent for bulk_update.
+        """
+        from .body_storage import materialize_children
+        from .text_metrics import compute_metrics
+
+        for field, value in compute_metrics(self.body).items():
+            setattr(self, field, value)
+        is_new = self._state.adding or self.pk is None
+        if not is_new and self.body != getattr(self, "_loaded_body", None):
+            materialize_children(self)
+
+        self.body_storage = self.BodyStorage.FULL
+        self.body_delta = ""
+        self.body_base = None
+        self.body_chain_depth = 0
+
+    def save(self, *args, **kwargs):
+        """Store the body as a keyframe or delta (see core.body_storage) and refresh its metrics."""
+        from .body_storage import body_cache, prepare_for_save
+        from .text_metrics import compute_metrics
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "body" not in update_fields:
+            return super().save(*args, **kwargs)
+        if update_fields is not None:
+            kwargs["update_fields"] = (
+                set(update_fields) | set(self.BODY_STORAGE_FIELDS) | set(self.TEXT_METRIC_FIELDS)
+            )
+
+        for field, value in compute_metrics(self.body).items():
+            setattr(self, field, value)
+        prepare_for_save(self)
+        full_body = self.body
+        if self.body_storage == self.BodyStorage.DELTA:
+            self.body = ""
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self.body = full_body
+        self._loaded_body = full_body
+        body_cache.set((self.pk, self.updated_at), full_body)
+
+
+class ESSearchPosting(models.Model):
+    """Inverted-index entry: one character bigram of an ES version's body/memo (see core.search)."""
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    es_version = models.ForeignKey(
+        ESVersion,
+        on_delete=models.CASCADE,
+        related_name="search_postings",
+    )
+    gram = models.CharField(max_length=8)
+    count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "gram"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["es_version", "gram"], name="uniq_search_posting_gram"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ESSearchPosting(es_version_id={self.es_version_id}, gram={self.gram}, count={self.count})"
+
+
+class ESMinHash(models.Model):
+    """MinHash signature of an ES version's body (see core.similarity)."""
+    es_version = models.OneToOneField(
+        ESVersion,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="minhash",
+    )
+    signature = models.JSONField()
+
+    def __str__(self) -> str:
+        return f"ESMinHash(es_version_id={self.es_version_id})"
+
+
+class ESSimilarityBucket(models.Model):
+    """LSH bucket membership: one row per band of an ES version's MinHash signature."""
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    es_version = models.ForeignKey(
+        ESVersion,
+        on_delete=models.CASCADE,
+        related_name="similarity_buckets",
+    )
+    # Hex digest of (band index, band values), so one column identifies band and bucket
+    bucket = models.CharField(max_length=16)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "bucket"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["es_version", "bucket"], name="uniq_similarity_bucket"),
+        ]
+
+    def __str__(self) -> str:
+        return f"ESSimilarityBucket(es_version_id={self.es_version_id}, bucket={self.bucket})"
+
+
+class ImportJob(models.Model):
+    """Company import from an uploaded CSV/JSONL file, processed in batches (see core.importer)."""
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        JSONL = "jsonl", "JSON Lines"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    # Excel exports from Japanese Windows are usually Shift_JIS (cp932)
+    ENCODINGS = ("utf-8-sig", "cp932")
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    # Removed once the job finishes (kept after an unexpected failure so it can be
+    # resumed); empty for imports run from a local file
+    file = models.FileField(upload_to="imports/", blank=True)
+    format = models.CharField(max_length=10, choices=Format.choices)
+    encoding = models.CharField(max_length=20, default="utf-8-sig")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+
+    # Progress, committed together with each batch (a rerun resumes after processed_rows)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    detail = models.TextField(blank=True, default="")
+
+    # Request metadata for the audit log entries written by the worker
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "-created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"ImportJob(id={self.id}, owner_id={self.owner_id}, status={self.status})"
+
+
+class ImportRowError(models.Model):
+    """Validation errors of one rejected import row."""
+    job = models.ForeignKey(
+        ImportJob,
+        on_delete=models.CASCADE,
+        related_name="row_errors",
+    )
+    row = models.PositiveIntegerField()
+    errors = models.JSONField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["job", "row"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"ImportRowError(job_id={self.job_id}, row={self.row})"
+
+
+class Tombstone(models.Model):
+    """Deletion marker so delta-sync clients can drop rows removed since their watermark."""
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="tombstones",
+    )
+    target_type = models.CharField(max_length=50)
+    target_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "deleted_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Tombstone({self.target_type}:{self.target_id}, owner_id={self.owner_id})"
+
+
+class UserAgent(models.Model):
+    """One distinct User-Agent header value, shared by audit rows (see core.user_agents)."""
+
+    # SHA-256 of value; the unique index is the lookup path, value itself is unindexed
+    sha256 = models.CharField(max_length=64, unique=True)
+    value = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class AuditLogQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Intern user agents first (bulk_create skips save())."""
+        from .user_agents import resolve_agents
+
+        objs = list(objs)
+        resolve_agents(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class AuditLog(models.Model):
     """Audit log model for tracking user actions and security events."""
@@ -106,6 +454,7 @@ class AuditLog(models.Model):
         ES_UPDATE = "ES_UPDATE", "ES Update"
         ES_DELETE = "ES_DELETE", "ES Delete"
         SETTINGS_UPDATE = "SETTINGS_UPDATE", "Settings Update"
+        ACCOUNT_EXPORT = "ACCOUNT_EXPORT", "Account Export"
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -119,17 +468,101 @@ class AuditLog(models.Model):
     target_type = models.CharField(max_length=50, blank=True, default="")
     target_id = models.IntegerField(null=True, blank=True)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True, default="")
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Interned User-Agent; read and write it through the `user_agent` property
+    agent = models.ForeignKey(
+        UserAgent,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="audit_logs",
+    )
+    # Set when the entry is built, not when a batched writer inserts it (see core.audit_sink)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    objects = AuditLogQuerySet.as_manager()
 
     class Meta:
         indexes = [
             models.Index(fields=["user", "-created_at"]),
+            # MIN/MAX(id) list validators (see AuditLogViewSet)
+            models.Index(fields=["user", "id"]),
+            models.Index(fields=["user", "action", "-created_at"]),
             models.Index(fields=["action", "-created_at"]),
             models.Index(fields=["-created_at"]),
         ]
         ordering = ["-created_at"]
 
+    @property
+    def user_agent(self) -> str:
+        if hasattr(self, "_user_agent"):
+            return self._user_agent
+        return self.agent.value if self.agent_id else ""
+
+    @user_agent.setter
+    def user_agent(self, value: str) -> None:
+        # Resolved to `agent` on save()/bulk_create(), so building an entry needs no query
+        self._user_agent = value or ""
+        self.agent = None
+
+    def save(self, *args, **kwargs):
+        from .user_agents import resolve_agents
+
+        resolve_agents([self])
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         user_info = f"user_id={self.user_id}" if self.user_id else f"email={self.input_email}"
         return f"AuditLog(id={self.id}, action={self.action}, {user_info})"
+
+
+class AuditRollup(models.Model):
+    """Number of audit log entries per user and action in one hour or day (see core.audit_rollup)."""
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    granularity = models.CharField(max_length=4, choices=Granularity.choices)
+    period_start = models.DateTimeField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="audit_rollups",
+    )
+    action = models.CharField(max_length=50, choices=AuditLog.Action.choices)
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["granularity", "period_start"]),
+            models.Index(fields=["user", "granularity", "period_start"]),
+        ]
+        ordering = ["-period_start", "action"]
+
+    def __str__(self) -> str:
+        return f"AuditRollup({self.granularity} {self.period_start:%Y-%m-%d %H:00}, {self.action}={self.count})"
+
+
+class AuditLogArchive(models.Model):
+    """One compressed JSONL file of audit log rows moved out of the table (see core.audit_archive)."""
+
+    month = models.DateField()
+    part = models.PositiveIntegerField(default=1)
+    # Relative to AUDIT_ARCHIVE_DIR
+    path = models.CharField(max_length=255)
+    row_count = models.PositiveIntegerField()
+    sha256 = models.CharField(max_length=64)
+    first_id = models.BigIntegerField()
+    last_id = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["month", "part"], name="uniq_auditlog_archive_part"),
+        ]
+        ordering = ["month", "part"]
+
+    def __str__(self) -> str:
+        return f"AuditLogArchive({self.path}, rows={self.row_count})"
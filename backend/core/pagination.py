@@ -0,0 +1,221 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import F, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# (field name, descending, nullable)
+OrderingKey = Tuple[str, bool, bool]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque-cursor pagination that seeks on the queryset's own ORDER BY columns.
+
+    The cursor stores the ordering values of the last row on the page, and the next
+    page is fetched with the OR-expanded predicate
+    `(c1 > v1) OR (c1 = v1 AND c2 > v2) OR ... OR (c1 = v1 AND ... AND id > vid)`
+    (see _seek_condition), not a row-value `(c1, c2, ...) > (v1, v2, ...)`
+    comparison: each column gets its own `<` or `>` and its own NULL handling,
+    which a row value cannot express, so descending, mixed-direction and
+    nullable orderings depend on this form.
+
+    A disjunction cannot start a B-tree range scan by itself, so a redundant
+    bound on the leading column (`c1 >= v1`, or `c1 <= v1` descending) is ANDed
+    in. The plan for `owner = ? AND c1 >= v1 AND (...)` is an index scan on
+    `(owner, c1, ...)` whose Index Cond starts at the cursor, with the OR terms
+    applied as a filter to the rows sharing v1 only, so a deep page costs the
+    same as the first one (no OFFSET-like scan). Where no index matches the
+    whole ordering the database still sorts the bounded rows.
+
+    Notes:
+        - The primary key is appended as a tie-breaker, so rows sharing a deadline
+          or timestamp are never skipped or repeated.
+        - Nullable ordering fields sort NULLs last ascending and first descending
+          (PostgreSQL's native B-tree order), so the index can still be used.
+          A cursor inside the NULL tail of an ascending column bounds with
+          `c1 IS NULL`; a non-NULL cursor on a nullable ascending column needs
+          `c1 >= v1 OR c1 IS NULL`, which PostgreSQL answers with a BitmapOr.
+        - Pagination is opt-in: responses keep the plain list shape unless the
+          client sends `cursor` or `page_size`, or the view sets
+          `default_page_size` (lists that must never be returned whole).
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset, request, view=None) -> Optional[List[Any]]:
+        params = request.query_params
+        default_page_size = getattr(view, "default_page_size", None)
+        opted_in = self.cursor_query_param in params or self.page_size_query_param in params
+        if not opted_in and default_page_size is None:
+            return None
+
+        self.request = request
+        self.ordering = self._get_ordering(queryset)
+        limit = self.get_page_size(request) if opted_in else min(default_page_size, self.max_page_size)
+
+        queryset = queryset.order_by(*self._order_by_expressions())
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            values = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._seek_condition(values))
+
+        rows = list(queryset[:limit + 1])
+        self.has_next = len(rows) > limit
+        page = rows[:limit]
+        self.next_cursor = self.encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+
+    def _ordering_signature(self) -> str:
+        return ",".join(("-" if desc else "") + name for name, desc, _ in self.ordering)
+
+    def encode_cursor(self, instance) -> str:
+        """Encode the ordering values of `instance` into an opaque cursor string."""
+        values = []
+        for name, _, _ in self.ordering:
+            field = instance._meta.get_field(name)
+            value = field.value_from_object(instance)
+            values.append(None if value is None else field.value_to_string(instance))
+        payload = json.dumps({"o": self._ordering_signature(), "v": values}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> List[Any]:
+        """Decode a cursor back into typed ordering values (raises NotFound if invalid)."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            raw_values = payload["v"]
+            if payload["o"] != self._ordering_signature() or len(raw_values) != len(self.ordering):
+                raise ValueError("cursor does not match ordering")
+            values = []
+            for (name, _, _), raw in zip(self.ordering, raw_values):
+                field = self.model._meta.get_field(name)
+                values.append(None if raw is None else field.to_python(raw))
+            return values
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # ------------------------------------------------------------------
+    # Ordering / seek predicate
+    # ------------------------------------------------------------------
+
+    def _get_ordering(self, queryset: QuerySet) -> List[OrderingKey]:
+        self.model = queryset.model
+        opts = queryset.model._meta
+        ordering = list(queryset.query.order_by) or list(opts.ordering)
+
+        keys: List[OrderingKey] = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise ImproperlyConfigured(
+                    "KeysetPagination only supports string ordering fields."
+                )
+            desc = item.startswith("-")
+            name = item.lstrip("-")
+            if name == "pk":
+                name = opts.pk.name
+            keys.append((name, desc, opts.get_field(name).null))
+
+        # Tie-breaker: primary key in the direction of the last ordering column
+        if not any(name == opts.pk.name for name, _, _ in keys):
+            last_desc = keys[-1][1] if keys else False
+            keys.append((opts.pk.name, last_desc, False))
+        return keys
+
+    def _order_by_expressions(self) -> list:
+        expressions = []
+        for name, desc, nullable in self.ordering:
+            if not nullable:
+                expressions.append(f"-{name}" if desc else name)
+            elif desc:
+                expressions.append(F(name).desc(nulls_first=True))
+            else:
+                expressions.append(F(name).asc(nulls_last=True))
+        return expressions
+
+    def _seek_condition(self, values: List[Any]) -> Q:
+        """
+        Build `(c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...` honoring each column's
+        direction and NULL placement.
+        """
+        condition = Q(pk__in=[])
+        prefix = Q()
+        bound = self._leading_bound(*self.ordering[0], values[0])
+        for (name, desc, nullable), value in zip(self.ordering, values):
+            after = self._after(name, desc, nullable, value)
+            if after is not None:
+                condition |= prefix & after
+            if value is None:
+                prefix &= Q(**{f"{name}__isnull": True})
+            else:
+                prefix &= Q(**{name: value})
+        return bound & condition
+
+    @staticmethod
+    def _leading_bound(name: str, desc: bool, nullable: bool, value: Any) -> Q:
+        """Redundant range on the first ordering column, so the index scan starts at the cursor."""
+        if value is None:
+            # NULLs come last ascending (only NULLs follow) and first descending (anything follows)
+            return Q() if desc else Q(**{f"{name}__isnull": True})
+        bound = Q(**{f"{name}__lte" if desc else f"{name}__gte": value})
+        if nullable and not desc:
+            bound |= Q(**{f"{name}__isnull": True})
+        return bound
+
+    @staticmethod
+    def _after(name: str, desc: bool, nullable: bool, value: Any) -> Optional[Q]:
+        """Rows strictly after `value` in one column, or None if none can follow."""
+        if value is None:
+            # NULLs come last ascending (nothing follows) and first descending
+            return Q(**{f"{name}__isnull": False}) if desc else None
+        after = Q(**{f"{name}__lt" if desc else f"{name}__gt": value})
+        if nullable and not desc:
+            after |= Q(**{f"{name}__isnull": True})
+        return after
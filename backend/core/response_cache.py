@@ -0,0 +1,99 @@
+"""
+Per-user response cache for list endpoints, keyed by a generation counter.
+
+Every cached entry key embeds the user's current generation. Writes bump the
+generation (one `incr`), which makes all of that user's older entries
+unreachable at once - no key scanning or pattern deletes. Stale entries simply
+expire via RESPONSE_CACHE_TIMEOUT.
+"""
+import hashlib
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+GENERATION_KEY = "respcache:gen:{user_id}"
+ENTRY_KEY = "respcache:{user_id}:{generation}:{namespace}:{digest}"
+STATS_KEY = "respcache:stats:{name}"
+
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def is_enabled() -> bool:
+    return settings.RESPONSE_CACHE_ENABLED
+
+
+def get_generation(user_id: int) -> int:
+    """
+    Return the user's current generation, initializing it if missing.
+
+    The initial value is time-based so a counter evicted from the cache never
+    restarts at a number whose old entries might still be stored.
+    """
+    cache = _cache()
+    key = GENERATION_KEY.format(user_id=user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(user_id: int) -> None:
+    """Invalidate every cached response of the user in O(1)."""
+    if not is_enabled():
+        return
+    cache = _cache()
+    key = GENERATION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter missing (never read or evicted): start a fresh one
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+
+
+def build_key(user_id: int, namespace: str, path: str) -> str:
+    digest = hashlib.sha256(path.encode("utf-8")).hexdigest()[:32]
+    return ENTRY_KEY.format(
+        user_id=user_id, generation=get_generation(user_id), namespace=namespace, digest=digest
+    )
+
+
+def get_entry(key: str) -> Optional[Any]:
+    entry = _cache().get(key)
+    _record("hit" if entry is not None else "miss")
+    return entry
+
+
+def set_entry(key: str, entry: Any) -> None:
+    _cache().set(key, entry, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def _record(name: str) -> None:
+    cache = _cache()
+    key = STATS_KEY.format(name=name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def get_stats() -> dict:
+    """Return hit/miss counters (aggregated across workers when the cache is shared)."""
+    cache = _cache()
+    hits = cache.get(STATS_KEY.format(name="hit"), 0)
+    misses = cache.get(STATS_KEY.format(name="miss"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_stats() -> None:
+    _cache().delete_many([STATS_KEY.format(name="hit"), STATS_KEY.format(name="miss")])
@@ -0,0 +1,157 @@
+"""
+Bigram inverted index for searching ES bodies and memos.
+
+Japanese has no word delimiters and neither SQLite nor PostgreSQL's default
+full-text configuration tokenizes it, so text is NFKC-normalized, lowercased,
+stripped of whitespace and split into overlapping character bigrams. Each
+ESVersion gets one ESSearchPosting row per distinct bigram (with its count), so
+a query becomes an indexed `(owner, gram) IN (...)` lookup on plain tables that
+work on every database backend.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import ESSearchPosting, ESVersion
+
+GRAM_SIZE = 2
+MIN_QUERY_LENGTH = GRAM_SIZE
+SNIPPET_RADIUS = 40
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """NFKC-normalize (full/half-width folding), lowercase and drop whitespace."""
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def grams(text: str) -> Counter:
+    normalized = normalize(text)
+    return Counter(normalized[i:i + GRAM_SIZE] for i in range(len(normalized) - GRAM_SIZE + 1))
+
+
+def document_grams(es_version: ESVersion) -> Counter:
+    # Body and memo are indexed separately so no gram spans the boundary between them
+    return grams(es_version.body) + grams(es_version.memo)
+
+
+def index_es_version(es_version: ESVersion) -> None:
+    """
+    Bring the postings of one ES version up to date.
+
+    Only the difference to the stored postings is written (inserts, count
+    updates and deletes), so small edits touch few rows.
+    """
+    wanted = document_grams(es_version)
+    existing = {
+        posting.gram: posting
+        for posting in ESSearchPosting.objects.filter(es_version=es_version)
+    }
+
+    to_create = [
+        ESSearchPosting(owner_id=es_version.owner_id, es_version=es_version, gram=gram, count=count)
+        for gram, count in wanted.items()
+        if gram not in existing
+    ]
+    to_update = []
+    for gram, posting in existing.items():
+        if gram in wanted and posting.count != wanted[gram]:
+            posting.count = wanted[gram]
+            to_update.append(posting)
+    to_delete = [posting.pk for gram, posting in existing.items() if gram not in wanted]
+
+    with transaction.atomic():
+        if to_delete:
+            ESSearchPosting.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            ESSearchPosting.objects.bulk_update(to_update, ["count"])
+        if to_create:
+            ESSearchPosting.objects.bulk_create(to_create)
+
+
+def _find_snippet(text: str, query: str) -> Optional[dict]:
+    """Return a snippet around the first match with highlight offsets, or None."""
+    position = text.lower().find(query.lower())
+    if position < 0:
+        # Match only exists after normalization (width/whitespace differences)
+        text = normalize(text)
+        query = normalize(query)
+        position = text.find(query)
+        if position < 0:
+            return None
+
+    start = max(0, position - SNIPPET_RADIUS)
+    end = min(len(text), position + len(query) + SNIPPET_RADIUS)
+    return {
+        "text": text[start:end],
+        "highlights": [[position - start, position - start + len(query)]],
+        "truncated_start": start > 0,
+        "truncated_end": end < len(text),
+    }
+
+
+def search(owner, query: str, limit: int = 20) -> List[dict]:
+    """
+    Ranked, owner-scoped search over ES bodies and memos.
+
+    Candidates must contain every query bigram; they are ranked by
+    sum(count * idf) in SQL, then verified against the real text (bigrams alone
+    can match non-contiguous text) and returned with snippets.
+    """
+    query_grams = set(grams(query))
+    if not query_grams:
+        return []
+
+    postings = ESSearchPosting.objects.filter(owner=owner, gram__in=query_grams)
+    total_docs = ESVersion.objects.filter(owner=owner).count()
+    document_frequency: Dict[str, int] = dict(
+        postings.values("gram").annotate(df=Count("es_version")).values_list("gram", "df")
+    )
+    if len(document_frequency) < len(query_grams):
+        return []
+
+    idf = {gram: math.log(1 + total_docs / df) for gram, df in document_frequency.items()}
+    candidates: List[Tuple[int, float]] = list(
+        postings.values("es_version")
+        .annotate(
+            matched=Count("gram"),
+            score=Sum(
+                Case(
+                    *[When(gram=gram, then=F("count") * Value(weight)) for gram, weight in idf.items()],
+                    output_field=FloatField(),
+                )
+            ),
+        )
+        .filter(matched=len(query_grams))
+        .order_by("-score", "-es_version")
+        .values_list("es_version", "score")[:limit * 3]
+    )
+
+    versions = ESVersion.objects.filter(owner=owner, pk__in=[pk for pk, _ in candidates]).in_bulk()
+    results = []
+    for pk, score in candidates:
+        version = versions.get(pk)
+        if version is None:
+            continue
+        snippets = {}
+        for field in ("body", "memo"):
+            snippet = _find_snippet(getattr(version, field), query)
+            if snippet:
+                snippets[field] = snippet
+        if not snippets:
+            continue
+        results.append({
+            "id": version.pk,
+            "company": version.company_id,
+            "score": round(score, 4),
+            "snippets": snippets,
+        })
+        if len(results) >= limit:
+            break
+    return results
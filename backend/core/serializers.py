@@ -1,7 +1,9 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import models
 from rest_framework import serializers
-from .models import Company, ESVersion, AuditLog
+from . import media_signing
+from .models import Company, ESVersion, AuditLog, ImportJob, ImportRowError, Tombstone
 from .utils import validate_file_signature
 
 User = get_user_model()
@@ -57,15 +59,36 @@ class CompanySerializer(serializers.ModelSerializer):
     # SECURITY: Never expose 'owner' field to client
 
 
+class SignedMediaFileField(serializers.FileField):
+    """
+    File field whose URL is signed for the file's owner (see core.media_signing).
+
+    Downloads through it skip the session and the ownership query; uploads
+    behave like a plain FileField.
+    """
+
+    def to_representation(self, value):
+        url = super().to_representation(value)
+        if not url or not media_signing.is_enabled():
+            return url
+        return f"{url}?{media_signing.sign(value.name, value.instance.owner_id)}"
+
+
 class ESVersionSerializer(serializers.ModelSerializer):
     """Serializer for ESVersion model with full fields."""
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.FileField: SignedMediaFileField,
+    }
+
     class Meta:
         model = ESVersion
         fields = [
             "id", "company", "body", "submitted_at", "submitted_via",
             "result", "memo", "file", "created_at", "updated_at",
+            *ESVersion.TEXT_METRIC_FIELDS,
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
+        read_only_fields = ["id", "created_at", "updated_at", *ESVersion.TEXT_METRIC_FIELDS]
 
     def validate_company(self, value):
         """Validate that company belongs to request user."""
@@ -107,16 +130,69 @@ class ESVersionSerializer(serializers.ModelSerializer):
 
 
 class ESVersionListSerializer(serializers.ModelSerializer):
-    """Serializer for ESVersion list view (without body field)."""
+    """Serializer for ESVersion list view (without body field, with precomputed metrics)."""
+    serializer_field_mapping = ESVersionSerializer.serializer_field_mapping
+
     class Meta:
         model = ESVersion
         fields = [
             "id", "company", "submitted_at", "submitted_via",
             "result", "file", "created_at", "updated_at",
+            *ESVersion.TEXT_METRIC_FIELDS,
         ]
         read_only_fields = fields
 
 
+class CompanyImportSerializer(serializers.Serializer):
+    """Serializer for company import uploads (CSV with a header line, or JSON Lines)."""
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=ImportJob.Format.choices, required=False)
+    encoding = serializers.ChoiceField(choices=ImportJob.ENCODINGS, default="utf-8-sig")
+
+    def validate(self, attrs):
+        upload = attrs["file"]
+        if upload.size > settings.COMPANY_IMPORT_MAX_FILE_SIZE:
+            raise serializers.ValidationError(
+                {"file": f"File size must be under {settings.COMPANY_IMPORT_MAX_FILE_SIZE // (1024 * 1024)}MB."}
+            )
+        if "format" not in attrs:
+            ext = upload.name.lower().rsplit(".", 1)[-1] if "." in upload.name else ""
+            if ext not in ImportJob.Format.values:
+                raise serializers.ValidationError({"format": "Cannot infer format; pass csv or jsonl."})
+            attrs["format"] = ext
+        return attrs
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for import job progress (read-only)."""
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id", "format", "status", "processed_rows", "created_rows",
+            "error_rows", "detail", "created_at", "updated_at", "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class ImportRowErrorSerializer(serializers.ModelSerializer):
+    """Serializer for rejected import rows."""
+    class Meta:
+        model = ImportRowError
+        fields = ["id", "row", "errors"]
+        read_only_fields = fields
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    """Serializer for deletion markers returned by the sync endpoint."""
+    type = serializers.CharField(source="target_type", read_only=True)
+    id = serializers.IntegerField(source="target_id", read_only=True)
+
+    class Meta:
+        model = Tombstone
+        fields = ["type", "id", "deleted_at"]
+        read_only_fields = fields
+
+
 class AuditLogSerializer(serializers.ModelSerializer):
     """Serializer for AuditLog model (read-only)."""
     class Meta:
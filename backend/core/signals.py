@@ -1,8 +1,14 @@
+from functools import partial
+
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import UserSettings
+from .body_storage import materialize_children
+from .models import ESVersion, UserSettings
+from . import media_access, search, similarity
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
@@ -10,3 +16,47 @@ def create_user_settings(sender, instance, created, **kwargs):
     """Automatically create UserSettings when a new User is created."""
     if created:
         UserSettings.objects.get_or_create(user=instance)
+
+
+@receiver(pre_delete, sender=ESVersion)
+def materialize_delta_children(sender, instance, origin=None, **kwargs):
+    """
+    Turn versions stored as deltas against the deleted one into full keyframes.
+
+    Skipped when the delete cascades from a company or user: deltas only
+    reference versions of the same company, so the children go too.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not ESVersion:
+        return
+    materialize_children(instance)
+
+
+@receiver(post_save, sender=ESVersion)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    """Keep the bigram search index in sync with the ES body and memo."""
+    if update_fields is not None and not {"body", "memo"} & set(update_fields):
+        return
+    search.index_es_version(instance)
+
+
+@receiver(post_save, sender=ESVersion)
+def update_similarity_index(sender, instance, update_fields=None, **kwargs):
+    """Recompute the MinHash signature and LSH buckets when the ES body changes."""
+    if update_fields is not None and "body" not in update_fields:
+        return
+    similarity.index_es_version(instance)
+
+
+@receiver(post_save, sender=ESVersion)
+def invalidate_media_access_on_save(sender, instance, update_fields=None, **kwargs):
+    """Drop the owner's cached media decisions when an attachment may have changed."""
+    if update_fields is not None and "file" not in update_fields:
+        return
+    transaction.on_commit(partial(media_access.invalidate, instance.owner_id))
+
+
+@receiver(post_delete, sender=ESVersion)
+def invalidate_media_access_on_delete(sender, instance, **kwargs):
+    """Stop serving a deleted version's attachment from the cached decision."""
+    transaction.on_commit(partial(media_access.invalidate, instance.owner_id))
@@ -0,0 +1,144 @@
+"""
+Near-duplicate ES detection with MinHash signatures and an LSH bucket index.
+
+Each body is normalized like the search index and split into character
+shingles. A MinHash signature of NUM_PERMUTATIONS values estimates the Jaccard
+similarity between two shingle sets (fraction of equal positions). The
+signature is cut into BANDS bands of ROWS values; every band is hashed into an
+ESSimilarityBucket row. Two versions become candidates when they share at
+least one bucket, so a lookup is a handful of indexed `(owner, bucket)` reads
+instead of a pairwise scan of the user's corpus.
+
+With 16 bands x 4 rows the candidate probability crosses 50% around a Jaccard
+similarity of (1/16)^(1/4) = 0.5, which matches DEFAULT_THRESHOLD.
+"""
+import hashlib
+import random
+import struct
+from typing import List, Optional, Set
+
+from django.db import transaction
+
+from .models import ESMinHash, ESSimilarityBucket, ESVersion
+from .search import normalize
+
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 4
+NUM_PERMUTATIONS = BANDS * ROWS
+DEFAULT_THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures must stay comparable across processes and restarts
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def shingles(text: str) -> Set[int]:
+    """Return the 32-bit hashes of the character shingles of `text`."""
+    normalized = normalize(text)
+    if len(normalized) < SHINGLE_SIZE:
+        return {_hash32(normalized)} if normalized else set()
+    return {
+        _hash32(normalized[i:i + SHINGLE_SIZE])
+        for i in range(len(normalized) - SHINGLE_SIZE + 1)
+    }
+
+
+def _hash32(value: str) -> int:
+    return struct.unpack("<I", hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest())[0]
+
+
+def signature(text: str) -> Optional[List[int]]:
+    """MinHash signature of `text`, or None for an empty body."""
+    values = shingles(text)
+    if not values:
+        return None
+    return [
+        min(((a * value + b) % _PRIME) & _MAX_HASH for value in values)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_buckets(sig: List[int]) -> List[str]:
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS]
+        payload = struct.pack(f"<H{ROWS}I", band, *rows)
+        buckets.append(hashlib.blake2b(payload, digest_size=8).hexdigest())
+    return buckets
+
+
+def estimate_similarity(a: List[int], b: List[int]) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERMUTATIONS
+
+
+def index_es_version(es_version: ESVersion, force: bool = False) -> None:
+    """Recompute the signature and bucket rows of one ES version (no-op if unchanged unless `force`)."""
+    sig = signature(es_version.body)
+    if not force:
+        stored = ESMinHash.objects.filter(es_version=es_version).values_list("signature", flat=True).first()
+        if stored == sig:
+            return
+    with transaction.atomic():
+        ESSimilarityBucket.objects.filter(es_version=es_version).delete()
+        if sig is None:
+            ESMinHash.objects.filter(es_version=es_version).delete()
+            return
+        ESMinHash.objects.update_or_create(es_version=es_version, defaults={"signature": sig})
+        ESSimilarityBucket.objects.bulk_create([
+            ESSimilarityBucket(owner_id=es_version.owner_id, es_version=es_version, bucket=bucket)
+            for bucket in band_buckets(sig)
+        ])
+
+
+def find_similar(es_version: ESVersion, threshold: float = DEFAULT_THRESHOLD, limit: int = 20) -> List[dict]:
+    """
+    Return the owner's other ES versions whose estimated similarity is >= threshold.
+
+    Only versions sharing an LSH bucket are scored, most similar first.
+    """
+    own = ESMinHash.objects.filter(es_version=es_version).values_list("signature", flat=True).first()
+    if own is None:
+        return []
+
+    buckets = band_buckets(own)
+    candidate_ids = (
+        ESSimilarityBucket.objects.filter(owner_id=es_version.owner_id, bucket__in=buckets)
+        .exclude(es_version=es_version)
+        .values_list("es_version", flat=True)
+        .distinct()
+    )
+    signatures = ESMinHash.objects.filter(es_version__in=candidate_ids).values_list(
+        "es_version", "signature"
+    )
+
+    scored = []
+    for pk, sig in signatures:
+        similarity = estimate_similarity(own, sig)
+        if similarity >= threshold:
+            scored.append((similarity, pk))
+    scored.sort(key=lambda item: (-item[0], -item[1]))
+    scored = scored[:limit]
+
+    versions = (
+        ESVersion.objects.filter(owner_id=es_version.owner_id, pk__in=[pk for _, pk in scored])
+        .select_related("company")
+        .only("id", "company__id", "company__name", "created_at")
+        .in_bulk()
+    )
+    return [
+        {
+            "id": pk,
+            "company": versions[pk].company_id,
+            "company_name": versions[pk].company.name,
+            "similarity": round(similarity, 4),
+            "created_at": versions[pk].created_at,
+        }
+        for similarity, pk in scored
+        if pk in versions
+    ]
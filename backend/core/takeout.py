@@ -0,0 +1,119 @@
+"""
+Full-account takeout written as a ZIP stream.
+
+zipfile can write to an unseekable target by emitting data descriptors after
+each member, so the archive is produced into a small buffer that is drained
+after every write: the response carries the ZIP as it is built, with no temp
+file and no full archive in memory. Attachments are read in FILE_CHUNK_SIZE
+pieces and stored uncompressed (PDF/DOCX are already compressed); JSON members
+are deflated.
+
+Layout:
+    account.json          user profile and settings
+    companies.jsonl       one company per line
+    es_versions.jsonl     one ES version per line (full body)
+    es_files/<name>       uploaded ES attachments
+    manifest.json         member list, including attachments missing on disk
+"""
+import json
+import zipfile
+from typing import Iterator
+
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .export import company_rows, es_rows, stream_jsonl
+from .models import ESVersion, UserSettings
+
+FILE_CHUNK_SIZE = 256 * 1024
+
+
+class _StreamBuffer:
+    """Write-only, unseekable sink whose contents are handed out by drain()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _account_payload(user) -> dict:
+    settings_obj, _ = UserSettings.objects.get_or_create(user=user)
+    return {
+        "user": {
+            "id": user.pk,
+            "email": getattr(user, "email", "") or getattr(user, "username", ""),
+            "date_joined": getattr(user, "date_joined", None),
+        },
+        "settings": {
+            "diff_enabled": settings_obj.diff_enabled,
+            "display_name": settings_obj.display_name,
+            "graduation_year": settings_obj.graduation_year,
+        },
+        "exported_at": timezone.now(),
+    }
+
+
+def stream_takeout(user) -> Iterator[bytes]:
+    """Yield the takeout ZIP of `user` piece by piece."""
+    buffer = _StreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+    members, missing = [], []
+
+    def member(name: str, compress: bool = True) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=timezone.localtime().timetuple()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        members.append(name)
+        return info
+
+    def write_member(info: zipfile.ZipInfo, pieces) -> Iterator[bytes]:
+        # force_zip64: sizes are unknown up front and attachments may exceed 2 GiB in total
+        with archive.open(info, mode="w", force_zip64=True) as target:
+            for piece in pieces:
+                target.write(piece)
+                data = buffer.drain()
+                if data:
+                    yield data
+        data = buffer.drain()
+        if data:
+            yield data
+
+    account = json.dumps(_account_payload(user), ensure_ascii=False, cls=DjangoJSONEncoder, indent=2)
+    yield from write_member(member("account.json"), [account.encode("utf-8")])
+    yield from write_member(member("companies.jsonl"), stream_jsonl(company_rows(user)))
+    yield from write_member(member("es_versions.jsonl"), stream_jsonl(es_rows(user)))
+
+    file_names = (
+        ESVersion.objects.filter(owner=user)
+        .exclude(file="")
+        .exclude(file__isnull=True)
+        .order_by("file")
+        .values_list("file", flat=True)
+        .distinct()
+    )
+    for name in file_names.iterator(chunk_size=500):
+        try:
+            source = default_storage.open(name, "rb")
+        except (FileNotFoundError, OSError):
+            missing.append(name)
+            continue
+        with source:
+            yield from write_member(
+                member(name, compress=False), iter(lambda: source.read(FILE_CHUNK_SIZE), b"")
+            )
+
+    manifest = json.dumps({"members": members + ["manifest.json"], "missing_files": missing}, ensure_ascii=False)
+    yield from write_member(member("manifest.json"), [manifest.encode("utf-8")])
+    archive.close()
+    yield buffer.drain()
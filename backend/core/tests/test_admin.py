@@ -0,0 +1,125 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core import admin_utils
+from core.models import AuditLog, Company, ESVersion
+
+User = get_user_model()
+
+# The admin templates need static files without a collectstatic manifest
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES, ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+class TestLargeTableAdmin(APITestCase):
+    """Test the AuditLog/ESVersion changelists avoid full-table counts and scans."""
+
+    def setUp(self):
+        """Set up a superuser, ES versions and audit logs across months."""
+        self.admin_user = User.objects.create_superuser(
+            username="admin@example.com", email="admin@example.com", password="adminpass123"
+        )
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        for month in (1, 2, 3):
+            AuditLog.objects.create(
+                user=self.user,
+                action=AuditLog.Action.LOGIN_SUCCESS,
+                created_at=datetime(2026, month, 15, tzinfo=dt_timezone.utc),
+            )
+            ESVersion.objects.create(
+                owner=self.user, company=self.company, body=f"ES {month}",
+                submitted_at=date(2026, month, 1),
+            )
+        self.client.force_login(self.admin_user)
+
+    def _changelist(self, model, params=None):
+        url = reverse(f"admin:core_{model}_changelist")
+        response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_estimate_replaces_exact_count(self):
+        """Test a large planner estimate is shown without a COUNT(*) over the table."""
+        with mock.patch.object(admin_utils, "estimate_count", return_value=2_500_000):
+            with CaptureQueriesContext(connection) as queries:
+                response = self._changelist("auditlog")
+
+        self.assertEqual(response.context["cl"].result_count, 2_500_000)
+        self.assertEqual(len(response.context["cl"].result_list), 3)
+        self.assertFalse(
+            [q for q in queries.captured_queries if "COUNT(" in q["sql"] and "core_auditlog" in q["sql"]]
+        )
+
+    def test_small_or_unsupported_estimates_count_exactly(self):
+        """Test estimates below the threshold (or None off PostgreSQL) fall back to COUNT(*)."""
+        self.assertIsNone(admin_utils.estimate_count(AuditLog.objects.all()))
+        with mock.patch.object(admin_utils, "estimate_count", return_value=10):
+            response = self._changelist("auditlog")
+        self.assertEqual(response.context["cl"].result_count, 3)
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        """Test user/company/owner are joined instead of fetched per row."""
+        with CaptureQueriesContext(connection) as before:
+            self._changelist("esversion")
+        for day in range(2, 12):
+            ESVersion.objects.create(owner=self.user, company=self.company, body="ES", submitted_at=date(2026, 3, day))
+            AuditLog.objects.create(user=self.user, action=AuditLog.Action.LOGOUT)
+        with CaptureQueriesContext(connection) as after:
+            self._changelist("esversion")
+        self.assertEqual(len(before), len(after))
+
+        with CaptureQueriesContext(connection) as logs:
+            self._changelist("auditlog")
+        self.assertLess(len(logs), 20)
+
+    def test_changelist_defers_es_bodies(self):
+        """Test the ES list does not load bodies."""
+        with CaptureQueriesContext(connection) as queries:
+            self._changelist("esversion")
+        selects = [q["sql"] for q in queries.captured_queries if 'FROM "core_esversion"' in q["sql"]]
+        self.assertTrue(selects)
+        self.assertFalse(any('"core_esversion"."body"' in sql for sql in selects))
+
+    def test_date_drilldown_lists_months_and_filters_by_range(self):
+        """Test the drill-down offers months from newest to oldest and filters by range."""
+        response = self._changelist("auditlog")
+        spec = next(
+            f for f in response.context["cl"].filter_specs if getattr(f, "parameter_name", "") == "created_at__period"
+        )
+        self.assertEqual(
+            [value for value, _ in spec.lookup_choices],
+            ["7d", "30d", "2026-03", "2026-02", "2026-01"],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._changelist("auditlog", {"created_at__period": "2026-02"})
+        self.assertEqual([log.created_at.month for log in response.context["cl"].result_list], [2])
+        self.assertFalse(any("DISTINCT" in q["sql"] for q in queries.captured_queries))
+
+        response = self._changelist("esversion", {"submitted_at__period": "2026-01"})
+        self.assertEqual([es.submitted_at for es in response.context["cl"].result_list], [date(2026, 1, 1)])
+
+    def test_date_drilldown_ignores_bad_values(self):
+        """Test an invalid period leaves the list unfiltered."""
+        response = self._changelist("esversion", {"submitted_at__period": "2026-13"})
+        self.assertEqual(len(response.context["cl"].result_list), 3)
+
+        response = self._changelist("esversion", {"submitted_at__period": "9999-12"})
+        self.assertEqual(len(response.context["cl"].result_list), 3)
+        response = self._changelist("auditlog", {"created_at__period": "9999-12"})
+        self.assertEqual(response.status_code, 200)
@@ -1,8 +1,14 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from core.models import AuditLog
+from core.views_audit import AuditLogViewSet
 
 User = get_user_model()
 
@@ -46,9 +52,9 @@ class TestAuditLog(APITestCase):
         response = self.client.get("/api/auditlogs/")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["id"], log1.id)
-        self.assertEqual(response.data[0]["ip_address"], "1.2.3.4")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], log1.id)
+        self.assertEqual(response.data["results"][0]["ip_address"], "1.2.3.4")
 
     def test_readonly_operations_only(self):
         """Test only read operations are allowed (no create/update/delete)."""
@@ -107,3 +113,108 @@ class TestAuditLog(APITestCase):
         self.assertNotIn("input_email", response.data)
         # Should expose ip_address
         self.assertIn("ip_address", response.data)
+
+
+class TestAuditLogFilters(APITestCase):
+    """Test AuditLog time-range/action filters and cursor pagination."""
+
+    def setUp(self):
+        """Set up a user with logs spread over several days."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.logs = []
+        for day, action in [
+            (1, AuditLog.Action.LOGIN_SUCCESS),
+            (2, AuditLog.Action.COMPANY_CREATE),
+            (3, AuditLog.Action.LOGIN_SUCCESS),
+            (4, AuditLog.Action.LOGOUT),
+        ]:
+            log = AuditLog.objects.create(user=self.user, action=action)
+            # created_at is auto_now_add, so backdate with update()
+            AuditLog.objects.filter(id=log.id).update(
+                created_at=datetime(2025, 1, day, 12, 0, tzinfo=dt_timezone.utc)
+            )
+            self.logs.append(log)
+        self.client.force_authenticate(user=self.user)
+
+    def test_since_and_until_filter(self):
+        """Test since is inclusive and until is exclusive."""
+        response = self.client.get("/api/auditlogs/?since=2025-01-02&until=2025-01-04")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.logs[2].id, self.logs[1].id])
+
+    def test_action_filter(self):
+        """Test filtering by action."""
+        response = self.client.get("/api/auditlogs/?action=LOGIN_SUCCESS")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [self.logs[2].id, self.logs[0].id])
+
+    def test_invalid_filters_return_400(self):
+        """Test invalid since/action values are rejected."""
+        response = self.client.get("/api/auditlogs/?since=yesterday")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get("/api/auditlogs/?action=DROP_TABLE")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_pagination_newest_first(self):
+        """Test pages walk the log newest first without gaps."""
+        response = self.client.get("/api/auditlogs/?page_size=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [item["id"] for item in response.data["results"]]
+
+        response = self.client.get(response.data["next"])
+        second_page = [item["id"] for item in response.data["results"]]
+
+        self.assertEqual(first_page + second_page, [log.id for log in reversed(self.logs)])
+        self.assertIsNone(response.data["next"])
+
+    def test_list_validators_skip_count(self):
+        """Test list revalidation skips COUNT and still answers 304."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auditlogs/?page_size=3")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in queries.captured_queries))
+
+        etag = response["ETag"]
+        response = self.client.get("/api/auditlogs/?page_size=3", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        AuditLog.objects.create(user=self.user, action=AuditLog.Action.LOGOUT)
+        response = self.client.get("/api/auditlogs/?page_size=3", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_late_row_with_older_timestamp_changes_etag(self):
+        """Test a row inserted after the ETag but stamped earlier (batched write) is not hidden by 304."""
+        response = self.client.get("/api/auditlogs/")
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+
+        late = AuditLog.objects.create(user=self.user, action=AuditLog.Action.COMPANY_UPDATE)
+        AuditLog.objects.filter(id=late.id).update(created_at=datetime(2025, 1, 2, 18, 0, tzinfo=dt_timezone.utc))
+        response = self.client.get("/api/auditlogs/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(late.id, [item["id"] for item in response.data["results"]])
+
+    def test_archived_rows_change_etag(self):
+        """Test deleting the oldest rows (retention) invalidates the list ETag."""
+        etag = self.client.get("/api/auditlogs/")["ETag"]
+        AuditLog.objects.filter(id=self.logs[0].id).delete()
+
+        response = self.client.get("/api/auditlogs/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_is_paginated_by_default(self):
+        """Test a plain list returns one page with a next link instead of the whole log."""
+        with mock.patch.object(AuditLogViewSet, "default_page_size", 3):
+            response = self.client.get("/api/auditlogs/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [log.id for log in reversed(self.logs)][:3])
+        self.assertIsNotNone(response.data["next"])
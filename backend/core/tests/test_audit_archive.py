@@ -0,0 +1,202 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core import audit_archive
+from core.models import AuditLog, AuditLogArchive
+
+User = get_user_model()
+
+ARCHIVE_DIR = tempfile.mkdtemp()
+NOW = datetime(2026, 6, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+
+@override_settings(AUDIT_ARCHIVE_DIR=ARCHIVE_DIR, AUDIT_RETENTION_BATCH_SIZE=2)
+class TestAuditArchive(APITestCase):
+    """Test monthly audit log archiving, batched deletion and archive search."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(ARCHIVE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        """Set up audit rows spread over January, February and the current month."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        for name in os.listdir(ARCHIVE_DIR):
+            os.remove(os.path.join(ARCHIVE_DIR, name))
+        self._log(datetime(2026, 1, 3, tzinfo=dt_timezone.utc), AuditLog.Action.LOGIN_SUCCESS)
+        self._log(datetime(2026, 1, 20, tzinfo=dt_timezone.utc), AuditLog.Action.COMPANY_CREATE)
+        self._log(datetime(2026, 1, 31, 23, 59, tzinfo=dt_timezone.utc), AuditLog.Action.LOGOUT,
+                  ip_address="10.0.0.9", user_agent="Mozilla/5.0 (Special)")
+        self._log(datetime(2026, 2, 10, tzinfo=dt_timezone.utc), AuditLog.Action.LOGIN_FAIL, user=None)
+        self._log(NOW, AuditLog.Action.LOGOUT)
+        patcher = mock.patch("django.utils.timezone.now", return_value=NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _log(self, created_at, action, user="default", **fields):
+        fields.setdefault("ip_address", "127.0.0.1")
+        return AuditLog.objects.create(
+            user=self.user if user == "default" else user,
+            input_email="user1@example.com",
+            action=action,
+            created_at=created_at,
+            **fields
+        )
+
+    def _read(self, filename):
+        with gzip.open(os.path.join(ARCHIVE_DIR, filename), "rt", encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_retention_cutoff_rounds_down_to_month(self):
+        """Test the cutoff is the first instant of the month containing now - days."""
+        cutoff = audit_archive.retention_cutoff(100, now=NOW)
+        self.assertEqual(cutoff, datetime(2026, 3, 1, tzinfo=dt_timezone.utc))
+
+    def test_archives_old_months_and_deletes_rows(self):
+        """Test each old month becomes one verified file and its rows are deleted."""
+        results = audit_archive.archive_old_logs(100)
+
+        self.assertEqual([(r.month.month, r.rows) for r in results], [(1, 3), (2, 1)])
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(AuditLog.objects.get().created_at, NOW)
+
+        january = AuditLogArchive.objects.get(month="2026-01-01")
+        self.assertEqual(january.path, "auditlog-2026-01.jsonl.gz")
+        self.assertEqual(january.row_count, 3)
+        self.assertTrue(audit_archive.verify_archive(january))
+        entries = self._read(january.path)
+        self.assertEqual([e["action"] for e in entries], ["LOGIN_SUCCESS", "COMPANY_CREATE", "LOGOUT"])
+        self.assertEqual(entries[2]["created_at"], "2026-01-31T23:59:00+00:00")
+        self.assertEqual(entries[2]["user_agent"], "Mozilla/5.0 (Special)")
+        self.assertEqual(entries[0]["id"], january.first_id)
+        self.assertFalse(any(name.endswith(".tmp") for name in os.listdir(ARCHIVE_DIR)))
+
+    def test_dry_run_changes_nothing(self):
+        """Test --dry-run reports the months without writing files or deleting rows."""
+        out = StringIO()
+        call_command("archive_audit_logs", "--days", "100", "--dry-run", stdout=out)
+
+        self.assertIn("Would archive 4 audit log entries in 2 file(s).", out.getvalue())
+        self.assertEqual(AuditLog.objects.count(), 5)
+        self.assertFalse(AuditLogArchive.objects.exists())
+        self.assertEqual(os.listdir(ARCHIVE_DIR), [])
+
+    def test_deletes_in_bounded_batches(self):
+        """Test archived rows are deleted by id batches of AUDIT_RETENTION_BATCH_SIZE."""
+        with CaptureQueriesContext(connection) as queries:
+            audit_archive.archive_old_logs(100)
+
+        deletes = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("DELETE")]
+        # January: 3 rows in batches of 2; February: 1 row
+        self.assertEqual(len(deletes), 3)
+        self.assertTrue(all('"id" IN' in sql for sql in deletes))
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_late_rows_go_into_new_part(self):
+        """Test rows added to an archived month are written to a second part."""
+        audit_archive.archive_old_logs(100)
+        self._log(datetime(2026, 1, 8, tzinfo=dt_timezone.utc), AuditLog.Action.ES_CREATE)
+
+        results = audit_archive.archive_old_logs(100)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].part, 2)
+        part2 = AuditLogArchive.objects.get(month="2026-01-01", part=2)
+        self.assertEqual(part2.path, "auditlog-2026-01-part2.jsonl.gz")
+        self.assertEqual([e["action"] for e in self._read(part2.path)], ["ES_CREATE"])
+
+    def test_interrupted_delete_is_finished_not_rearchived(self):
+        """Test rows left behind by an interrupted delete are removed on the next run."""
+        with mock.patch.object(audit_archive, "delete_in_batches", side_effect=RuntimeError("worker killed")):
+            with self.assertRaises(RuntimeError):
+                audit_archive.archive_old_logs(100)
+        self.assertEqual(AuditLog.objects.count(), 5)
+
+        results = audit_archive.archive_old_logs(100)
+
+        # January is only deleted; February is archived as usual
+        self.assertEqual([(result.month.month, result.part) for result in results], [(2, 1)])
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(AuditLogArchive.objects.count(), 2)
+
+    def test_row_committed_during_export_is_kept(self):
+        """Test a row with an id inside the exported range but missing from the file is not deleted."""
+        january = list(AuditLog.objects.filter(created_at__month=1).order_by("id"))
+        gap_id = january[1].id
+        january[1].delete()
+        record = audit_archive._record
+
+        def late_commit(entry):
+            # A transaction that got its id earlier commits while the month is being exported
+            if not AuditLog.objects.filter(id=gap_id).exists():
+                self._log(datetime(2026, 1, 15, tzinfo=dt_timezone.utc), AuditLog.Action.ES_UPDATE, id=gap_id)
+            return record(entry)
+
+        with mock.patch.object(audit_archive, "_record", side_effect=late_commit):
+            audit_archive.archive_month(
+                datetime(2026, 1, 1, tzinfo=dt_timezone.utc), datetime(2026, 2, 1, tzinfo=dt_timezone.utc)
+            )
+
+        self.assertTrue(AuditLog.objects.filter(id=gap_id).exists())
+        self.assertEqual([e["id"] for e in self._read("auditlog-2026-01.jsonl.gz")], [january[0].id, january[2].id])
+
+        audit_archive.archive_old_logs(100)
+        part2 = AuditLogArchive.objects.get(month="2026-01-01", part=2)
+        self.assertEqual([e["id"] for e in self._read(part2.path)], [gap_id])
+        self.assertFalse(AuditLog.objects.filter(id=gap_id).exists())
+
+    def test_missing_rows_fail_the_delete_check(self):
+        """Test deleting fewer rows than were archived is reported."""
+        with mock.patch.object(audit_archive, "delete_in_batches", return_value=0):
+            with self.assertRaises(audit_archive.ArchiveVerificationError):
+                audit_archive.archive_old_logs(100)
+
+    def test_search_archive_filters(self):
+        """Test the search command filters archived entries and prints JSONL."""
+        audit_archive.archive_old_logs(100)
+
+        out = StringIO()
+        call_command("search_audit_archive", "--since", "2026-01", "--until", "2026-01",
+                     "--action", "LOGOUT", stdout=out, stderr=StringIO())
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["ip_address"], "10.0.0.9")
+
+        self.assertEqual(len(list(audit_archive.search_archives(contains="special"))), 1)
+        self.assertEqual(len(list(audit_archive.search_archives(user_id=self.user.id))), 3)
+        self.assertEqual(len(list(audit_archive.search_archives(since=datetime(2026, 2, 1).date()))), 1)
+        self.assertEqual(len(list(audit_archive.search_archives(ip_address="127.0.0.1"))), 3)
+
+    def test_search_rejects_tampered_archive(self):
+        """Test a file that no longer matches its checksum is refused unless --no-verify."""
+        audit_archive.archive_old_logs(100)
+        archive = AuditLogArchive.objects.get(month="2026-02-01")
+        with gzip.open(os.path.join(ARCHIVE_DIR, archive.path), "wt", encoding="utf-8") as handle:
+            handle.write(json.dumps({"user_id": None, "action": "LOGOUT", "ip_address": None}) + "\n")
+
+        with self.assertRaises(CommandError):
+            call_command("search_audit_archive", "--since", "2026-02", stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command("search_audit_archive", "--since", "2026-02", "--no-verify",
+                     stdout=out, stderr=StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
@@ -0,0 +1,212 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core import audit_rollup
+from core.models import AuditLog, AuditRollup
+
+User = get_user_model()
+
+NOW = datetime(2026, 3, 10, 15, 30, tzinfo=dt_timezone.utc)
+
+
+def at(day, hour, minute=0):
+    return datetime(2026, 3, day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+class TestAuditRollup(APITestCase):
+    """Test hourly/daily audit rollups and the aggregation endpoint."""
+
+    def setUp(self):
+        """Set up two users with login activity over two days."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self._log(self.user1, AuditLog.Action.LOGIN_FAIL, at(9, 10, 5))
+        self._log(self.user1, AuditLog.Action.LOGIN_FAIL, at(9, 10, 50))
+        self._log(self.user1, AuditLog.Action.LOGIN_SUCCESS, at(9, 11))
+        self._log(self.user1, AuditLog.Action.LOGIN_FAIL, at(10, 9))
+        self._log(self.user2, AuditLog.Action.LOGIN_FAIL, at(9, 10, 30))
+        self._log(None, AuditLog.Action.LOGIN_FAIL, at(9, 10, 40))
+        patcher = mock.patch("django.utils.timezone.now", return_value=NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _log(self, user, action, created_at):
+        return AuditLog.objects.create(user=user, action=action, created_at=created_at)
+
+    def test_compact_builds_hourly_and_daily_rows(self):
+        """Test hourly rows count per user/action and daily rows sum them."""
+        start, end = audit_rollup.compact()
+
+        self.assertEqual((start, end), (at(9, 10), at(10, 15)))
+        hourly = AuditRollup.objects.filter(granularity="hour", user=self.user1, action="LOGIN_FAIL")
+        self.assertEqual(
+            sorted(hourly.values_list("period_start", "count")),
+            [(at(9, 10), 2), (at(10, 9), 1)],
+        )
+        daily = AuditRollup.objects.get(
+            granularity="day", user=self.user1, action="LOGIN_FAIL", period_start=at(9, 0)
+        )
+        self.assertEqual(daily.count, 2)
+        anonymous = AuditRollup.objects.get(granularity="day", user=None, period_start=at(9, 0))
+        self.assertEqual(anonymous.count, 1)
+
+    def test_compact_is_idempotent_and_picks_up_late_rows(self):
+        """Test rerunning replaces the window and counts entries inserted late."""
+        audit_rollup.compact()
+        self._log(self.user1, AuditLog.Action.LOGIN_FAIL, at(10, 13))
+
+        audit_rollup.compact()
+        audit_rollup.compact()
+
+        self.assertEqual(
+            AuditRollup.objects.get(
+                granularity="day", user=self.user1, action="LOGIN_FAIL", period_start=at(10, 0)
+            ).count,
+            2,
+        )
+        self.assertEqual(
+            AuditRollup.objects.filter(granularity="hour", period_start=at(9, 10)).count(), 3
+        )
+
+    def test_compact_keeps_rollups_of_archived_periods(self):
+        """Test a forced recompute does not erase counts whose raw rows are gone."""
+        audit_rollup.compact()
+        AuditLog.objects.filter(created_at__lt=at(10, 0)).delete()
+
+        call_command("rollup_audit_logs", "--since", "2026-03-01", stdout=StringIO())
+
+        self.assertEqual(
+            AuditRollup.objects.get(
+                granularity="day", user=self.user1, action="LOGIN_FAIL", period_start=at(9, 0)
+            ).count,
+            2,
+        )
+
+    def test_counts_merge_rollups_with_recent_raw_rows(self):
+        """Test entries newer than the last rollup are counted from the raw table."""
+        audit_rollup.compact()
+        self._log(self.user1, AuditLog.Action.LOGIN_FAIL, at(10, 15, 10))
+
+        rows = audit_rollup.counts("day", at(9, 0), NOW, user=self.user1, action="LOGIN_FAIL")
+
+        self.assertEqual(
+            [(row["period"], row["count"]) for row in rows],
+            [(at(9, 0), 2), (at(10, 0), 2)],
+        )
+
+    def test_counts_without_rollups_use_raw_rows(self):
+        """Test counts are exact before the compactor has ever run."""
+        rows = audit_rollup.counts("hour", at(9, 0), NOW, user=self.user1)
+
+        self.assertEqual(
+            [(row["period"], row["action"], row["count"]) for row in rows],
+            [(at(9, 10), "LOGIN_FAIL", 2), (at(9, 11), "LOGIN_SUCCESS", 1), (at(10, 9), "LOGIN_FAIL", 1)],
+        )
+
+    def test_counts_stop_at_non_aligned_until(self):
+        """Test a rollup period cut by `until` is counted from raw rows up to `until`."""
+        audit_rollup.compact()
+
+        rows = audit_rollup.counts("day", at(9, 0), at(9, 10, 45), action="LOGIN_FAIL")
+
+        self.assertEqual([(row["period"], row["count"]) for row in rows], [(at(9, 0), 3)])
+
+    def test_endpoint_returns_only_own_counts(self):
+        """Test the rollup endpoint is scoped to the requesting user."""
+        audit_rollup.compact()
+        self.client.force_authenticate(user=self.user2)
+
+        response = self.client.get("/api/auditlogs/rollup/", {"granularity": "day", "action": "LOGIN_FAIL"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["granularity"], "day")
+        self.assertEqual(
+            [(row["period"], row["count"]) for row in response.data["results"]],
+            [(at(9, 0), 1)],
+        )
+
+    def test_endpoint_reads_rollups_not_raw_history(self):
+        """Test a compacted range is answered without aggregating AuditLog rows."""
+        audit_rollup.compact()
+        self.client.force_authenticate(user=self.user1)
+
+        with mock.patch.object(audit_rollup, "rolled_up_until", return_value=NOW):
+            response = self.client.get("/api/auditlogs/rollup/", {"since": "2026-03-09"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum(row["count"] for row in response.data["results"]), 4)
+
+    def test_endpoint_validation(self):
+        """Test invalid granularity, action and oversized ranges are rejected."""
+        self.client.force_authenticate(user=self.user1)
+
+        for params in (
+            {"granularity": "week"},
+            {"action": "NOPE"},
+            {"since": "2026-03-10", "until": "2026-03-09"},
+            {"since": "2025-01-01"},
+        ):
+            response = self.client.get("/api/auditlogs/rollup/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_endpoint_requires_auth(self):
+        """Test the rollup endpoint requires authentication."""
+        response = self.client.get("/api/auditlogs/rollup/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_staff_rollup_covers_all_users_and_anonymous_failures(self):
+        """Test the staff aggregate includes login failures recorded without a user."""
+        self.client.post(
+            "/api/auth/login", {"email": "unknown@example.com", "password": "wrong"}, format="json"
+        )
+        failure = AuditLog.objects.get(input_email="unknown@example.com", action=AuditLog.Action.LOGIN_FAIL)
+        self.assertIsNone(failure.user_id)
+        AuditLog.objects.filter(pk=failure.pk).update(created_at=at(10, 12))
+        audit_rollup.compact()
+        staff = User.objects.create_user(
+            username="staff@example.com",
+            email="staff@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=staff)
+        url = "/api/auditlogs/rollup/all/"
+        params = {"granularity": "day", "action": "LOGIN_FAIL", "since": "2026-03-09", "until": "2026-03-11"}
+
+        everyone = self.client.get(url, params)
+        anonymous = self.client.get(url, {**params, "user": "anonymous"})
+        one_user = self.client.get(url, {**params, "user": self.user2.pk})
+
+        self.assertEqual(everyone.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["period"], row["count"]) for row in everyone.data["results"]],
+            [(at(9, 0), 4), (at(10, 0), 2)],
+        )
+        self.assertEqual(
+            [(row["period"], row["count"]) for row in anonymous.data["results"]],
+            [(at(9, 0), 1), (at(10, 0), 1)],
+        )
+        self.assertEqual([row["count"] for row in one_user.data["results"]], [1])
+        self.assertEqual(self.client.get(url, {"user": "x"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_staff_rollup_requires_staff(self):
+        """Test regular users cannot read other users' counts."""
+        self.client.force_authenticate(user=self.user1)
+
+        response = self.client.get("/api/auditlogs/rollup/all/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
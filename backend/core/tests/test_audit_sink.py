@@ -0,0 +1,188 @@
+import json
+import os
+import queue
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, transaction
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.audit_sink import AuditSink, replay_spool
+from core.models import AuditLog
+
+User = get_user_model()
+
+
+@override_settings(AUDIT_LOG_MODE="async", AUDIT_LOG_BATCH_SIZE=10)
+class TestAuditSink(APITestCase):
+    """Test the batched audit log writer (queue, flush, spool, metrics)."""
+
+    def setUp(self):
+        """Set up a user and a sink whose queue is drained by the test instead of a thread."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.sink = AuditSink()
+        self.sink._queue = queue.Queue(maxsize=100)
+        self.sink._ensure_worker = lambda: None
+        spool_dir = tempfile.mkdtemp()
+        self.spool_path = os.path.join(spool_dir, "audit_spool.jsonl")
+        self.quarantine_path = os.path.join(spool_dir, "audit_quarantine.jsonl")
+        for path in (self.spool_path, self.quarantine_path):
+            self.addCleanup(lambda path=path: os.path.exists(path) and os.remove(path))
+
+    def _entry(self, action=AuditLog.Action.COMPANY_UPDATE, target_id=None):
+        return AuditLog(user=self.user, action=action, ip_address="127.0.0.1", target_id=target_id)
+
+    def _reject_target(self, target_id):
+        """Make bulk_create fail like a foreign key violation for batches containing target_id."""
+        original = AuditLog.objects.bulk_create
+
+        def bulk_create(objs, *args, **kwargs):
+            objs = list(objs)
+            if any(obj.target_id == target_id for obj in objs):
+                raise IntegrityError("FOREIGN KEY constraint failed")
+            return original(objs, *args, **kwargs)
+
+        return mock.patch.object(AuditLog.objects, "bulk_create", side_effect=bulk_create)
+
+    def _read_quarantine(self):
+        with open(self.quarantine_path, encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_entries_queued_until_flush(self):
+        """Test async entries are enqueued on commit and written in one batch."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sink.record_many([self._entry(), self._entry(), None])
+
+        self.assertEqual(AuditLog.objects.count(), 0)
+        self.assertEqual(self.sink.get_stats()["queue_depth"], 2)
+
+        self.assertEqual(self.sink.flush(), 2)
+
+        self.assertEqual(AuditLog.objects.count(), 2)
+        stats = self.sink.get_stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(stats["flushes"], 1)
+        self.assertGreaterEqual(stats["avg_flush_ms"], 0.0)
+
+    def test_rolled_back_entries_not_queued(self):
+        """Test entries recorded inside a rolled-back transaction are discarded."""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.sink.record(self._entry())
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.sink.get_stats()["queue_depth"], 0)
+
+    def test_full_queue_writes_inline(self):
+        """Test a full queue applies backpressure instead of dropping entries."""
+        self.sink._queue = queue.Queue(maxsize=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sink.record_many([self._entry(), self._entry()])
+
+        self.assertEqual(AuditLog.objects.count(), 1)
+        self.assertEqual(self.sink.get_stats()["queue_depth"], 1)
+
+    def test_failed_flush_spooled_and_replayed(self):
+        """Test a batch the database rejects is spooled and replayed with its timestamps."""
+        entry = self._entry()
+        entry.created_at = timezone.now() - timedelta(minutes=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sink.record(entry)
+
+        with override_settings(AUDIT_LOG_SPOOL_PATH=self.spool_path):
+            with mock.patch.object(AuditLog.objects, "bulk_create", side_effect=DatabaseError("down")):
+                self.sink.flush()
+
+            self.assertEqual(AuditLog.objects.count(), 0)
+            self.assertEqual(self.sink.get_stats()["spooled"], 1)
+
+            out = StringIO()
+            call_command("replay_audit_spool", stdout=out)
+
+        self.assertIn("Replayed 1", out.getvalue())
+        replayed = AuditLog.objects.get()
+        self.assertEqual(replayed.user, self.user)
+        self.assertEqual(replayed.created_at, entry.created_at)
+        self.assertFalse(os.path.exists(self.spool_path))
+
+    def test_invalid_row_quarantined_rest_written(self):
+        """Test one rejected row is quarantined while the rest of its batch is written."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sink.record_many([self._entry(target_id=1), self._entry(target_id=2), self._entry(target_id=3)])
+
+        with override_settings(AUDIT_LOG_SPOOL_PATH=self.spool_path, AUDIT_LOG_QUARANTINE_PATH=self.quarantine_path):
+            with self._reject_target(2):
+                self.sink.flush()
+
+        self.assertEqual(sorted(AuditLog.objects.values_list("target_id", flat=True)), [1, 3])
+        self.assertFalse(os.path.exists(self.spool_path))
+        quarantined = self._read_quarantine()
+        self.assertEqual([(q["target_id"], q["error"]) for q in quarantined], [(2, "FOREIGN KEY constraint failed")])
+        self.assertEqual(self.sink.get_stats()["quarantined"], 1)
+
+    def test_replay_quarantines_invalid_lines(self):
+        """Test a spool with one invalid line is replayed instead of failing forever."""
+        created_at = timezone.now().isoformat()
+        with open(self.spool_path, "w", encoding="utf-8") as spool:
+            for target_id in (1, 2, 3):
+                spool.write(json.dumps({
+                    "user_id": self.user.id, "input_email": "", "action": "COMPANY_UPDATE",
+                    "target_type": "Company", "target_id": target_id, "ip_address": None,
+                    "user_agent": "", "created_at": created_at,
+                }) + "\n")
+
+        with override_settings(AUDIT_LOG_QUARANTINE_PATH=self.quarantine_path):
+            with self._reject_target(2):
+                self.assertEqual(replay_spool(self.spool_path, batch_size=10), (2, 1))
+
+        self.assertEqual(sorted(AuditLog.objects.values_list("target_id", flat=True)), [1, 3])
+        self.assertEqual([q["target_id"] for q in self._read_quarantine()], [2])
+        self.assertFalse(os.path.exists(self.spool_path))
+
+        # Once fixed, quarantined lines can be replayed like a spool
+        self.assertEqual(replay_spool(self.quarantine_path), (1, 0))
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_security_events_written_inline(self):
+        """Test login/logout events bypass the queue in async mode."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sink.record_many([self._entry(AuditLog.Action.LOGIN_FAIL), self._entry()])
+
+        self.assertEqual(list(AuditLog.objects.values_list("action", flat=True)), ["LOGIN_FAIL"])
+        self.assertEqual(self.sink.get_stats()["queue_depth"], 1)
+
+    @override_settings(AUDIT_LOG_MODE="sync")
+    def test_sync_mode_writes_immediately(self):
+        """Test sync mode inserts inside the caller's transaction."""
+        self.sink.record(self._entry())
+
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_metrics_endpoint_staff_only(self):
+        """Test /api/metrics exposes queue depth and flush latency to staff only."""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get("/api/metrics").status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get("/api/metrics")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("queue_depth", response.data["audit_sink"])
+        self.assertIn("max_flush_ms", response.data["audit_sink"])
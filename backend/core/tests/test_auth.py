@@ -133,6 +133,24 @@ class TestAuth(APITestCase):
         self.assertEqual(response.data["email"], "test@example.com")
         self.assertIn("diff_enabled", response.data)
 
+    def test_me_conditional_get(self):
+        """Test /api/me returns 304 until settings change."""
+        user = User.objects.create_user(
+            username="test@example.com",
+            email="test@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(user=user)
+
+        etag = self.client.get("/api/me")["ETag"]
+        response = self.client.get("/api/me", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch("/api/me/settings", {"display_name": "New Name"})
+        response = self.client.get("/api/me", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["display_name"], "New Name")
+
     def test_me_requires_auth(self):
         """Test /api/me requires authentication."""
         response = self.client.get("/api/me")
@@ -0,0 +1,166 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import AuditLog, Company, ESSearchPosting, ESVersion, Tombstone
+
+User = get_user_model()
+
+
+class TestBulkEndpoints(APITestCase):
+    """Test transactional bulk create/update/delete for companies and ES versions."""
+
+    def setUp(self):
+        """Set up two users with one company each."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="Company 1")
+        self.company2 = Company.objects.create(owner=self.user2, name="Company 2")
+        self.client.force_authenticate(user=self.user1)
+
+    def test_company_bulk_create_update_delete(self):
+        """Test mixed operations are applied and audited in one request."""
+        doomed = Company.objects.create(owner=self.user1, name="Doomed")
+
+        response = self.client.post("/api/companies/bulk/", {
+            "create": [{"name": "New A"}, {"name": "New B", "job_role": "SE"}],
+            "update": [{"id": self.company1.id, "status_text": "一次面接"}],
+            "delete": [doomed.id],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["name"] for item in response.data["created"]], ["New A", "New B"])
+        self.assertEqual(response.data["updated"][0]["status_text"], "一次面接")
+        self.assertEqual(response.data["deleted"], [doomed.id])
+
+        self.assertEqual(Company.objects.filter(owner=self.user1).count(), 3)
+        self.company1.refresh_from_db()
+        self.assertEqual(self.company1.status_text, "一次面接")
+        self.assertTrue(Tombstone.objects.filter(target_type="Company", target_id=doomed.id).exists())
+        actions = sorted(AuditLog.objects.filter(user=self.user1).values_list("action", flat=True))
+        self.assertEqual(actions, sorted([
+            AuditLog.Action.COMPANY_CREATE, AuditLog.Action.COMPANY_CREATE,
+            AuditLog.Action.COMPANY_UPDATE, AuditLog.Action.COMPANY_DELETE,
+        ]))
+
+    def test_bulk_update_bumps_updated_at(self):
+        """Test bulk_update still refreshes auto_now timestamps."""
+        before = self.company1.updated_at
+
+        self.client.post("/api/companies/bulk/", {
+            "update": [{"id": self.company1.id, "memo": "x"}],
+        }, format="json")
+
+        self.company1.refresh_from_db()
+        self.assertGreater(self.company1.updated_at, before)
+
+    def test_other_users_ids_rejected_and_nothing_written(self):
+        """Test IDOR: other users' rows are not found and the whole batch is rolled back."""
+        response = self.client.post("/api/companies/bulk/", {
+            "create": [{"name": "Should not exist"}],
+            "update": [{"id": self.company2.id, "name": "Hacked"}],
+            "delete": [self.company2.id],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["update"][0]["id"], ["Not found."])
+        self.assertEqual(response.data["delete"][0]["id"], ["Not found."])
+        self.assertFalse(Company.objects.filter(name="Should not exist").exists())
+        self.company2.refresh_from_db()
+        self.assertEqual(self.company2.name, "Company 2")
+        self.assertFalse(AuditLog.objects.exists())
+
+    def test_es_bulk_validates_company_per_item(self):
+        """Test ESVersionSerializer.validate_company runs for every created item."""
+        response = self.client.post("/api/es/bulk/", {
+            "create": [
+                {"company": self.company1.id, "body": "OK"},
+                {"company": self.company2.id, "body": "Other user's company"},
+            ],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["create"][0], {})
+        self.assertIn("company", response.data["create"][1])
+        self.assertFalse(ESVersion.objects.exists())
+
+    def test_es_bulk_keeps_metrics_and_search_index(self):
+        """Test bulk-written ES versions get metrics and search postings like save()."""
+        es = ESVersion.objects.create(owner=self.user1, company=self.company1, body="古い本文")
+
+        response = self.client.post("/api/es/bulk/", {
+            "create": [{"company": self.company1.id, "body": "志望動機です"}],
+            "update": [{"id": es.id, "body": "自己PRです"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"][0]["char_count"], 6)
+        self.assertEqual(response.data["updated"][0]["char_count"], 6)
+        results = self.client.get("/api/es/search/", {"q": "自己PR"}).data["results"]
+        self.assertEqual([item["id"] for item in results], [es.id])
+        self.assertFalse(ESSearchPosting.objects.filter(es_version=es, gram="古い").exists())
+
+    @override_settings(ES_BODY_STORAGE="delta", ES_BODY_KEYFRAME_INTERVAL=10)
+    def test_es_bulk_update_keeps_delta_children_readable(self):
+        """Test changing a delta base in bulk materializes its children first."""
+        body = "私は大学時代、軽音楽サークルの部長として部員をまとめました。" * 4
+        base = ESVersion.objects.create(owner=self.user1, company=self.company1, body=body)
+        child = ESVersion.objects.create(owner=self.user1, company=self.company1, body=body + "以上。")
+        self.assertEqual(child.body_storage, ESVersion.BodyStorage.DELTA)
+
+        response = self.client.post("/api/es/bulk/", {
+            "update": [{"id": base.id, "body": "全く別の本文"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(f"/api/es/{child.id}/").data["body"], body + "以上。")
+
+    def test_duplicate_ids_rejected(self):
+        """Test an id may appear only once across update and delete."""
+        response = self.client.post("/api/companies/bulk/", {
+            "update": [{"id": self.company1.id, "memo": "x"}],
+            "delete": [self.company1.id],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["delete"][0]["id"], ["Duplicate id."])
+
+    def test_boolean_ids_rejected(self):
+        """Test JSON true/false are not accepted as ids (bool is an int subclass in Python)."""
+        Company.objects.filter(pk=self.company1.pk).update(id=1)
+        response = self.client.post("/api/companies/bulk/", {
+            "update": [{"id": True, "memo": "x"}],
+            "delete": [True],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["update"][0]["id"], ["Not found."])
+        self.assertEqual(response.data["delete"][0]["id"], ["Not found."])
+        self.assertTrue(Company.objects.filter(pk=1, memo="").exists())
+
+    @override_settings(BULK_MAX_OPERATIONS=2)
+    def test_operation_limit(self):
+        """Test requests over BULK_MAX_OPERATIONS are rejected."""
+        response = self.client.post("/api/companies/bulk/", {
+            "create": [{"name": "A"}, {"name": "B"}, {"name": "C"}],
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Company.objects.filter(name="A").exists())
+
+    def test_bulk_requires_authentication(self):
+        """Test anonymous bulk requests are rejected."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post("/api/companies/bulk/", {"create": [{"name": "A"}]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
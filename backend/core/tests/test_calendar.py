@@ -0,0 +1,75 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company
+
+User = get_user_model()
+
+
+class TestDeadlineCalendar(APITestCase):
+    """Test the deadline calendar endpoint."""
+
+    def setUp(self):
+        """Set up test users and companies with deadlines."""
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.c1 = Company.objects.create(owner=self.user1, name="C1", deadline=date(2025, 3, 10))
+        self.c2 = Company.objects.create(owner=self.user1, name="C2", deadline=date(2025, 3, 10))
+        self.c3 = Company.objects.create(owner=self.user1, name="C3", deadline=date(2025, 3, 31))
+        Company.objects.create(owner=self.user1, name="April", deadline=date(2025, 4, 1))
+        Company.objects.create(owner=self.user1, name="No deadline")
+        Company.objects.create(owner=self.user2, name="Other", deadline=date(2025, 3, 10))
+
+    def test_requires_auth(self):
+        """Test calendar requires authentication."""
+        response = self.client.get("/api/calendar/deadlines?month=2025-03")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_month_grouped_by_day(self):
+        """Test deadlines are grouped per day and scoped to the user and month."""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get("/api/calendar/deadlines?month=2025-03")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["start"], "2025-03-01")
+        self.assertEqual(response.data["end"], "2025-03-31")
+        self.assertEqual(
+            [(d["date"], [c["id"] for c in d["companies"]]) for d in response.data["days"]],
+            [("2025-03-10", [self.c1.id, self.c2.id]), ("2025-03-31", [self.c3.id])],
+        )
+
+    def test_invalid_parameters_return_400(self):
+        """Test malformed month and ranges are rejected."""
+        self.client.force_authenticate(user=self.user1)
+
+        for query in ["month=2025-13", "month=march", "start=2025-03-01", "start=2025-03-10&end=2025-03-01",
+                      "start=2020-01-01&end=2025-01-01"]:
+            response = self.client.get(f"/api/calendar/deadlines?{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_cached_month_is_invalidated_by_writes(self):
+        """Test a cached month is served without queries until a company changes."""
+        self.client.force_authenticate(user=self.user1)
+        self.client.get("/api/calendar/deadlines?month=2025-03")
+
+        with self.assertNumQueries(0):
+            self.client.get("/api/calendar/deadlines?month=2025-03")
+
+        self.client.patch(f"/api/companies/{self.c3.id}/", {"deadline": "2025-04-02"})
+        response = self.client.get("/api/calendar/deadlines?month=2025-03")
+        self.assertEqual([d["date"] for d in response.data["days"]], ["2025-03-10"])
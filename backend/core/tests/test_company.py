@@ -1,8 +1,14 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import date
+from urllib.parse import parse_qs, urlparse
 
+from core import response_cache
+from core.pagination import KeysetPagination
 from core.models import Company, AuditLog
 
 User = get_user_model()
@@ -150,3 +156,215 @@ class TestCompanyCRUD(APITestCase):
                 target_id=company_id
             ).exists()
         )
+
+
+class TestCompanyPagination(APITestCase):
+    """Test keyset (cursor) pagination on the company list."""
+
+    def setUp(self):
+        """Set up a user with companies sharing and missing deadlines."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        deadlines = [date(2025, 1, 1), date(2025, 1, 1), None, date(2025, 2, 1), None, date(2025, 3, 1), date(2025, 1, 1)]
+        for i, deadline in enumerate(deadlines):
+            Company.objects.create(owner=self.user, name=f"C{i}", deadline=deadline)
+        self.client.force_authenticate(user=self.user)
+
+    def _walk(self, url):
+        """Follow `next` links and collect every returned id."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_unpaginated_without_params(self):
+        """Test list keeps the plain array shape when pagination is not requested."""
+        response = self.client.get("/api/companies/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 7)
+
+    def test_pages_cover_all_rows_for_each_ordering(self):
+        """Test walking pages returns every company exactly once in order."""
+        for ordering in ["deadline", "-deadline", "updated_at", "-updated_at", None]:
+            query = f"ordering={ordering}&" if ordering else ""
+            ids = self._walk(f"/api/companies/?{query}page_size=2")
+
+            self.assertEqual(len(ids), 7, ordering)
+            self.assertEqual(len(set(ids)), 7, ordering)
+
+    def test_deadline_order_puts_nulls_last(self):
+        """Test ascending deadline pages end with companies without a deadline."""
+        ids = self._walk("/api/companies/?ordering=deadline&page_size=3")
+        deadlines = [Company.objects.get(id=i).deadline for i in ids]
+
+        self.assertEqual(deadlines[-2:], [None, None])
+        self.assertEqual(deadlines[:5], sorted(deadlines[:5]))
+
+    def test_invalid_cursor_returns_404(self):
+        """Test a tampered cursor is rejected."""
+        response = self.client.get("/api/companies/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_from_other_ordering_is_rejected(self):
+        """Test a cursor cannot be replayed against a different ordering."""
+        response = self.client.get("/api/companies/?ordering=deadline&page_size=2")
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+
+        response = self.client.get(f"/api/companies/?ordering=-updated_at&cursor={cursor}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_seek_bounds_leading_column_in_index_scan(self):
+        """Test the cursor predicate starts the (owner, ...) index scan at the cursor, not at the first row."""
+        pagination = KeysetPagination()
+        for ordering, column in [("updated_at", "updated_at"), ("-updated_at", "updated_at"), ("-deadline", "deadline")]:
+            queryset = Company.objects.filter(owner=self.user).order_by(ordering)
+            pagination.ordering = pagination._get_ordering(queryset)
+            last = queryset.order_by(*pagination._order_by_expressions())[2]
+            values = [getattr(last, name) for name, _, _ in pagination.ordering]
+            seek = queryset.order_by(*pagination._order_by_expressions()).filter(pagination._seek_condition(values))
+
+            with transaction.atomic():
+                if connection.vendor == "postgresql":
+                    # Seven rows: force the planner off the sequential scan it would rightly pick
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_seqscan = off")
+                plan = seek.explain()
+
+            if connection.vendor == "sqlite":
+                # e.g. SEARCH core_company USING INDEX core_compan_owner_i_... (owner_id=? AND updated_at<?)
+                self.assertRegex(plan, rf"USING INDEX \S+ \(owner_id=\? AND {column}[<>]\?\)", ordering)
+            elif connection.vendor == "postgresql":
+                self.assertRegex(plan, rf"Index Cond: .*{column} [<>]=", ordering)
+
+
+class TestCompanyConditionalGet(APITestCase):
+    """Test ETag / Last-Modified handling on company endpoints."""
+
+    def setUp(self):
+        """Set up a user with one company."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        self.client.force_authenticate(user=self.user)
+
+    def test_unchanged_list_returns_304(self):
+        """Test list revalidation with a matching ETag short-circuits to 304."""
+        response = self.client.get("/api/companies/")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get("/api/companies/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        """Test writes invalidate the list ETag."""
+        etag = self.client.get("/api/companies/")["ETag"]
+        self.client.patch(f"/api/companies/{self.company.id}/", {"name": "Renamed"})
+
+        response = self.client.get("/api/companies/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        Company.objects.create(owner=self.user, name="Company 2")
+        self.client.delete(f"/api/companies/{self.company.id}/")
+
+        response = self.client.get("/api/companies/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_conditional_get(self):
+        """Test detail revalidation returns 304 until the company changes."""
+        etag = self.client.get(f"/api/companies/{self.company.id}/")["ETag"]
+
+        response = self.client.get(f"/api/companies/{self.company.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(f"/api/companies/{self.company.id}/", {"memo": "updated"})
+        response = self.client.get(f"/api/companies/{self.company.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_is_per_user(self):
+        """Test another user's ETag never produces a 304."""
+        etag = self.client.get("/api/companies/")["ETag"]
+        other = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get("/api/companies/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class TestCompanyResponseCache(APITestCase):
+    """Test the per-user generation-keyed list response cache."""
+
+    def setUp(self):
+        """Set up a user with one company and an empty cache."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        self.client.force_authenticate(user=self.user)
+
+    def test_repeated_list_is_served_without_queries(self):
+        """Test a cache hit skips the database and reports hit/miss counts."""
+        self.client.get("/api/companies/")
+
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/companies/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["name"], "Company 1")
+        self.assertEqual(response_cache.get_stats()["hits"], 1)
+        self.assertEqual(response_cache.get_stats()["misses"], 1)
+
+    def test_cache_hit_honors_if_none_match(self):
+        """Test a cached entry still answers revalidation with 304."""
+        etag = self.client.get("/api/companies/")["ETag"]
+
+        response = self.client.get("/api/companies/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_writes_invalidate_cached_list(self):
+        """Test create/update/delete through the API bump the generation."""
+        self.client.get("/api/companies/")
+
+        self.client.patch(f"/api/companies/{self.company.id}/", {"name": "Renamed"})
+        response = self.client.get("/api/companies/")
+        self.assertEqual(response.data[0]["name"], "Renamed")
+
+        self.client.post("/api/companies/", {"name": "Company 2"})
+        response = self.client.get("/api/companies/")
+        self.assertEqual(len(response.data), 2)
+
+        self.client.delete(f"/api/companies/{self.company.id}/")
+        response = self.client.get("/api/companies/")
+        self.assertEqual([c["name"] for c in response.data], ["Company 2"])
+
+    def test_cache_is_per_user(self):
+        """Test one user's cached list is never served to another."""
+        self.client.get("/api/companies/")
+        other = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get("/api/companies/")
+        self.assertEqual(response.data, [])
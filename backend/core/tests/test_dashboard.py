@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company, ESVersion
+
+User = get_user_model()
+
+
+class TestDashboard(APITestCase):
+    """Test the dashboard summary endpoint."""
+
+    def setUp(self):
+        """Set up test users, companies and ES versions."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        today = timezone.localdate()
+        self.company_a = Company.objects.create(owner=self.user1, name="A", deadline=today + timedelta(days=10))
+        self.company_b = Company.objects.create(owner=self.user1, name="B", deadline=today + timedelta(days=3))
+        self.company_c = Company.objects.create(owner=self.user1, name="C", deadline=today - timedelta(days=1))
+        ESVersion.objects.create(owner=self.user1, company=self.company_a, result=ESVersion.Result.PASS)
+        ESVersion.objects.create(owner=self.user1, company=self.company_a, result=ESVersion.Result.FAIL)
+        self.latest_a = ESVersion.objects.create(owner=self.user1, company=self.company_a)
+        other = Company.objects.create(owner=self.user2, name="Other")
+        ESVersion.objects.create(owner=self.user2, company=other, result=ESVersion.Result.PASS)
+
+    def test_requires_auth(self):
+        """Test dashboard requires authentication."""
+        response = self.client.get("/api/dashboard")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_summary_in_single_query(self):
+        """Test per-company ES statistics are computed in one query."""
+        self.client.force_authenticate(user=self.user1)
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/dashboard")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_name = {c["name"]: c for c in response.data["companies"]}
+        self.assertEqual(set(by_name), {"A", "B", "C"})
+
+        a = by_name["A"]
+        self.assertEqual((a["es_count"], a["pass_count"], a["fail_count"], a["unknown_count"]), (3, 1, 1, 1))
+        self.assertEqual(a["latest_es"]["id"], self.latest_a.id)
+        self.assertIsNone(by_name["B"]["latest_es"])
+
+        self.assertEqual(response.data["totals"], {"companies": 3, "es": 3, "pass": 1, "fail": 1, "unknown": 1})
+        self.assertEqual(response.data["next_deadline"]["company_id"], self.company_b.id)
@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 
-from core.models import Company, ESVersion, AuditLog
+from core.diff import diff_cache
+from core.models import Company, ESVersion, AuditLog, UserSettings
 
 User = get_user_model()
 
@@ -166,3 +168,136 @@ class TestESVersionCRUD(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("body", response.data)
         self.assertEqual(response.data["body"], "Full ES body content")
+
+    def test_cursor_pagination_global_and_nested(self):
+        """Test global and nested ES lists page newest first without gaps."""
+        other_company = Company.objects.create(owner=self.user1, name="Company 3")
+        created = [
+            ESVersion.objects.create(
+                owner=self.user1,
+                company=self.company1 if i % 2 else other_company,
+                body=f"ES {i}",
+            )
+            for i in range(5)
+        ]
+        ESVersion.objects.create(owner=self.user2, company=self.company2, body="Other user")
+
+        self.client.force_authenticate(user=self.user1)
+
+        ids = []
+        url = "/api/es/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(ids, [es.id for es in reversed(created)])
+
+        response = self.client.get(f"/api/companies/{self.company1.id}/es?page_size=1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], created[3].id)
+        response = self.client.get(response.data["next"])
+        self.assertEqual([item["id"] for item in response.data["results"]], [created[1].id])
+
+
+class TestESDiff(APITestCase):
+    """Test the server-side ES diff API."""
+
+    def setUp(self):
+        """Set up users, companies and two versions to compare."""
+        diff_cache.clear()
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="Company 1")
+        self.base = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="私は学生時代にサークル活動に力を入れました。"
+        )
+        self.target = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="私は学生時代にゼミ活動に力を入れました。"
+        )
+        self.client.force_authenticate(user=self.user1)
+
+    def _url(self, base=None, **params):
+        query = "&".join(f"{k}={v}" for k, v in {"base": base or self.base.id, **params}.items())
+        return f"/api/es/{self.target.id}/diff/?{query}"
+
+    def test_character_level_diff(self):
+        """Test Japanese text is diffed per character and reconstructs both sides."""
+        response = self.client.get(self._url())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ops = response.data["ops"]
+        old = "".join(text for op, text in ops if op in ("=", "-"))
+        new = "".join(text for op, text in ops if op in ("=", "+"))
+        self.assertEqual(old, self.base.body)
+        self.assertEqual(new, self.target.body)
+        self.assertIn(["-", "サークル"], ops)
+        self.assertIn(["+", "ゼミ"], ops)
+
+    @override_settings(ES_DIFF_MAX_LENGTH=15)
+    def test_long_bodies_fall_back_to_line_diff(self):
+        """Test bodies over ES_DIFF_MAX_LENGTH characters are diffed per line, or refused."""
+        self.base = ESVersion.objects.create(owner=self.user1, company=self.company1, body="一行目です。\n" * 3)
+        self.target = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="一行目です。\n" * 2 + "三行目です。\n"
+        )
+
+        response = self.client.get(self._url())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["granularity"], "line")
+        self.assertIn(["-", "一行目です。\n"], response.data["ops"])
+
+        with override_settings(ES_DIFF_MAX_LENGTH=2):
+            response = self.client.get(self._url(granularity="line"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_context_collapses_equal_runs(self):
+        """Test context=N replaces long unchanged runs with skip markers."""
+        response = self.client.get(self._url(context=2))
+
+        ops = response.data["ops"]
+        self.assertEqual(ops[0][0], "~")
+        self.assertEqual(response.data["stats"], {"inserted": 2, "deleted": 4})
+
+    def test_result_is_cached_until_version_changes(self):
+        """Test repeated diffs hit the cache and edits produce a fresh diff."""
+        self.client.get(self._url())
+        self.client.get(self._url())
+        self.assertEqual(diff_cache.hits, 1)
+
+        self.client.patch(f"/api/es/{self.target.id}/", {"body": "全く別の文章です。"})
+        response = self.client.get(self._url())
+        new = "".join(text for op, text in response.data["ops"] if op in ("=", "+"))
+        self.assertEqual(new, "全く別の文章です。")
+
+    def test_disabled_in_settings_returns_403(self):
+        """Test the diff is refused when the user turned diffing off."""
+        UserSettings.objects.filter(user=self.user1).update(diff_enabled=False)
+
+        response = self.client.get(self._url())
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_other_users_version_returns_404(self):
+        """Test diffing against another user's version is not possible (IDOR prevention)."""
+        company2 = Company.objects.create(owner=self.user2, name="Company 2")
+        other = ESVersion.objects.create(owner=self.user2, company=company2, body="secret")
+
+        response = self.client.get(self._url(base=other.id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_different_companies_return_400(self):
+        """Test versions of different companies cannot be compared."""
+        company3 = Company.objects.create(owner=self.user1, name="Company 3")
+        other = ESVersion.objects.create(owner=self.user1, company=company3, body="別企業")
+
+        response = self.client.get(self._url(base=other.id))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
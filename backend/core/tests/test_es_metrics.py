@@ -0,0 +1,122 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company, ESVersion
+from core.text_metrics import compute_metrics
+
+User = get_user_model()
+
+
+class TestESTextMetrics(APITestCase):
+    """Test precomputed ES body metrics and length filters."""
+
+    def setUp(self):
+        """Set up a user and a company."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        self.client.force_authenticate(user=self.user)
+
+    def _create(self, body):
+        return ESVersion.objects.create(owner=self.user, company=self.company, body=body)
+
+    def test_compute_metrics(self):
+        """Test counts with/without whitespace (incl. full-width space), lines and paragraphs."""
+        metrics = compute_metrics("私は　学生です。\r\nよろしく\n\n  \n二段落目")
+
+        self.assertEqual(metrics, {
+            "char_count": 22,
+            "char_count_no_ws": 15,
+            "line_count": 5,
+            "paragraph_count": 2,
+        })
+        self.assertEqual(compute_metrics(""), {
+            "char_count": 0, "char_count_no_ws": 0, "line_count": 0, "paragraph_count": 0,
+        })
+
+    def test_metrics_stored_on_create_and_update(self):
+        """Test metrics follow body edits made through the API."""
+        response = self.client.post("/api/es/", {"company": self.company.id, "body": "あいう"})
+        self.assertEqual(response.data["char_count"], 3)
+
+        es_id = response.data["id"]
+        response = self.client.patch(f"/api/es/{es_id}/", {"body": "あいう\nえお"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["char_count"], 6)
+        self.assertEqual(response.data["line_count"], 2)
+        row = ESVersion.objects.filter(id=es_id).values("char_count_no_ws").get()
+        self.assertEqual(row["char_count_no_ws"], 5)
+
+    def test_metrics_in_list(self):
+        """Test the list exposes metrics without a body."""
+        self._create("字" * 10)
+
+        response = self.client.get("/api/es/")
+
+        self.assertNotIn("body", response.data[0])
+        self.assertEqual(response.data[0]["char_count"], 10)
+        self.assertEqual(response.data[0]["paragraph_count"], 1)
+
+    def test_length_range_filters(self):
+        """Test min/max filters select versions that fit within N chars."""
+        short = self._create("字" * 300)
+        fits = self._create("字" * 400)
+        self._create("字" * 401)
+        spaced = self._create("字 " * 400)
+
+        response = self.client.get("/api/es/", {"max_chars": 400})
+        self.assertEqual({item["id"] for item in response.data}, {short.id, fits.id})
+
+        response = self.client.get("/api/es/", {"min_chars": 350, "max_chars_no_ws": 400})
+        self.assertEqual({item["id"] for item in response.data}, {fits.id, spaced.id})
+
+    def test_length_filter_does_not_load_body(self):
+        """Test the filtered list query never selects the body column."""
+        self._create("字" * 10)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/es/", {"max_chars": 400})
+
+        self.assertEqual(len(response.data), 1)
+        for query in context.captured_queries:
+            self.assertNotIn('"core_esversion"."body"', query["sql"])
+
+    def test_invalid_length_filter_rejected(self):
+        """Test non-integer and negative values return 400."""
+        self.assertEqual(
+            self.client.get("/api/es/", {"max_chars": "abc"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get("/api/es/", {"min_chars": "-1"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @override_settings(ES_BODY_STORAGE="delta", ES_BODY_KEYFRAME_INTERVAL=10)
+    def test_backfill_migration_rebuilds_delta_chains_in_bounded_queries(self):
+        """Test the 0010 backfill streams rows and reuses base bodies instead of querying per row."""
+        bodies = ["志望動機です。" * 20 + f"第{i}版" for i in range(6)]
+        for body in bodies:
+            self._create(body)
+        self.assertTrue(ESVersion.objects.filter(body_storage="DELTA").exists())
+        ESVersion.objects.update(char_count=0, char_count_no_ws=0, line_count=0, paragraph_count=0)
+        migration = import_module("core.migrations.0010_esversion_text_metrics")
+
+        with CaptureQueriesContext(connection) as queries:
+            migration.backfill_text_metrics(apps, None)
+
+        selects = [q for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertLessEqual(len(selects), 2)
+        stored = ESVersion.objects.order_by("created_at", "id").values_list("char_count", flat=True)
+        self.assertEqual(list(stored), [compute_metrics(body)["char_count"] for body in bodies])
@@ -0,0 +1,177 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldError
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.body_storage import apply_delta, body_cache, make_delta
+from core.models import Company, ESVersion
+
+User = get_user_model()
+
+BODY = "私は大学時代、軽音楽サークルの部長として五十人の部員をまとめました。" * 4
+
+
+@override_settings(ES_BODY_STORAGE="delta", ES_BODY_KEYFRAME_INTERVAL=3)
+class TestESDeltaStorage(APITestCase):
+    """Test delta-compressed ES body storage."""
+
+    def setUp(self):
+        """Set up a user, a company and an empty body cache."""
+        body_cache.clear()
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        self.client.force_authenticate(user=self.user)
+
+    def _create_versions(self, count):
+        bodies = [BODY.replace("五十人", f"{50 + i}人") for i in range(count)]
+        ids = []
+        for body in bodies:
+            response = self.client.post("/api/es/", {"company": self.company.id, "body": body})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            ids.append(response.data["id"])
+        return ids, bodies
+
+    def _raw(self, es_id):
+        return ESVersion.objects.filter(id=es_id).values("body", "body_storage", "body_chain_depth").get()
+
+    def test_delta_roundtrip(self):
+        """Test make_delta/apply_delta reconstruct the new text."""
+        new = BODY.replace("部長", "副部長") + "以上です。"
+        self.assertEqual(apply_delta(BODY, make_delta(BODY, new)), new)
+
+    @override_settings(ES_DIFF_MAX_LENGTH=20)
+    def test_long_bodies_use_line_deltas_or_keyframes(self):
+        """Test deltas of long bodies are matched per line, and skipped when lines exceed the cap."""
+        base = "".join(f"{i}行目の文章です。\n" for i in range(10))
+        new = base.replace("3行目", "三行目")
+
+        ops = make_delta(base, new)
+        self.assertEqual(apply_delta(base, ops), new)
+        self.assertEqual([op for op in ops if isinstance(op, str)], ["三行目の文章です。\n"])
+        self.assertIsNone(make_delta(base * 3, new * 3))
+
+    def test_versions_stored_as_keyframes_and_deltas(self):
+        """Test keyframes every N versions with deltas in between (empty body column)."""
+        ids, bodies = self._create_versions(5)
+
+        storage = [self._raw(es_id)["body_storage"] for es_id in ids]
+        self.assertEqual(storage, ["FULL", "DELTA", "DELTA", "FULL", "DELTA"])
+        self.assertEqual(self._raw(ids[1])["body"], "")
+
+        body_cache.clear()
+        for es_id, body in zip(ids, bodies):
+            response = self.client.get(f"/api/es/{es_id}/")
+            self.assertEqual(response.data["body"], body)
+
+    def test_editing_a_base_materializes_children(self):
+        """Test changing a base body keeps dependent versions intact."""
+        ids, bodies = self._create_versions(3)
+
+        response = self.client.patch(f"/api/es/{ids[0]}/", {"body": "全面的に書き直しました。"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body_cache.clear()
+        self.assertEqual(self._raw(ids[1])["body_storage"], "FULL")
+        self.assertEqual(ESVersion.objects.get(id=ids[1]).body, bodies[1])
+        self.assertEqual(ESVersion.objects.get(id=ids[2]).body, bodies[2])
+        self.assertEqual(ESVersion.objects.get(id=ids[0]).body, "全面的に書き直しました。")
+
+    def test_editing_a_delta_row_recomputes_its_delta(self):
+        """Test a delta row can be edited and read back."""
+        ids, _ = self._create_versions(2)
+        edited = BODY + "追記しました。"
+
+        self.client.patch(f"/api/es/{ids[1]}/", {"body": edited})
+
+        body_cache.clear()
+        self.assertEqual(self._raw(ids[1])["body_storage"], "DELTA")
+        self.assertEqual(ESVersion.objects.get(id=ids[1]).body, edited)
+
+    def test_deleting_a_base_keeps_children_readable(self):
+        """Test deleting a keyframe converts its dependants first."""
+        ids, bodies = self._create_versions(3)
+
+        response = self.client.delete(f"/api/es/{ids[0]}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        body_cache.clear()
+        self.assertEqual(ESVersion.objects.get(id=ids[1]).body, bodies[1])
+        self.assertEqual(ESVersion.objects.get(id=ids[2]).body, bodies[2])
+
+    def test_partial_loads_still_rebuild_delta_bodies(self):
+        """Test only()/defer() keep the storage columns next to body, and values() refuses a raw body."""
+        ids, bodies = self._create_versions(2)
+        self.assertEqual(self._raw(ids[1])["body_storage"], ESVersion.BodyStorage.DELTA)
+
+        body_cache.clear()
+        self.assertEqual(ESVersion.objects.only("body").get(id=ids[1]).body, bodies[1])
+        body_cache.clear()
+        self.assertEqual(ESVersion.objects.defer("body_storage", "body_delta").get(id=ids[1]).body, bodies[1])
+        with self.assertRaises(FieldError):
+            ESVersion.objects.values_list("body", flat=True).get(id=ids[1])
+
+    def test_company_delete_skips_materializing_children(self):
+        """Test a cascade from the company does not rewrite versions that are deleted anyway."""
+        self._create_versions(3)
+
+        with mock.patch("core.signals.materialize_children") as materialize:
+            response = self.client.delete(f"/api/companies/{self.company.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        materialize.assert_not_called()
+        self.assertFalse(ESVersion.objects.filter(company=self.company).exists())
+
+    def test_list_does_not_rebuild_bodies(self):
+        """Test the list endpoint never loads bodies."""
+        self._create_versions(3)
+        body_cache.clear()
+
+        response = self.client.get("/api/es/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(body_cache.misses, 0)
+
+
+class TestCompactESBodiesCommand(APITestCase):
+    """Test the compact_es_bodies backfill command."""
+
+    def setUp(self):
+        """Set up versions stored as full text."""
+        body_cache.clear()
+        user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        company = Company.objects.create(owner=user, name="Company 1")
+        self.bodies = [BODY.replace("五十人", f"{50 + i}人") for i in range(4)]
+        self.ids = [
+            ESVersion.objects.create(owner=user, company=company, body=body).id
+            for body in self.bodies
+        ]
+
+    def test_compact_and_expand(self):
+        """Test converting to deltas and back preserves every body and updated_at."""
+        updated_at = list(ESVersion.objects.order_by("id").values_list("updated_at", flat=True))
+
+        call_command("compact_es_bodies", "--keyframe-interval=3", stdout=StringIO())
+        storage = list(ESVersion.objects.order_by("id").values_list("body_storage", flat=True))
+        self.assertEqual(storage, ["FULL", "DELTA", "DELTA", "FULL"])
+
+        body_cache.clear()
+        self.assertEqual([ESVersion.objects.get(id=i).body for i in self.ids], self.bodies)
+        self.assertEqual(list(ESVersion.objects.order_by("id").values_list("updated_at", flat=True)), updated_at)
+
+        call_command("compact_es_bodies", "--mode=full", stdout=StringIO())
+        self.assertEqual(
+            list(ESVersion.objects.order_by("id").values_list("body", "body_storage")),
+            [(body, "FULL") for body in self.bodies],
+        )
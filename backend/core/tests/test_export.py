@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.body_storage import body_cache
+from core.models import Company, ESVersion
+
+User = get_user_model()
+
+
+class TestExport(APITestCase):
+    """Test streaming CSV/JSONL export of companies and ES history."""
+
+    def setUp(self):
+        """Set up two users with companies and ES versions."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="株式会社テスト", memo="改行\nあり")
+        self.company2 = Company.objects.create(owner=self.user2, name="Other")
+        self.es1 = ESVersion.objects.create(owner=self.user1, company=self.company1, body="志望動機, 本文")
+        self.es2 = ESVersion.objects.create(owner=self.user1, company=self.company1, body="二版目")
+        ESVersion.objects.create(owner=self.user2, company=self.company2, body="secret")
+        self.client.force_authenticate(user=self.user1)
+
+    def _content(self, response) -> str:
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_company_csv(self):
+        """Test the company CSV has a BOM, a header and only the user's rows."""
+        response = self.client.get("/api/export/companies.csv")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("attachment;", response["Content-Disposition"])
+        content = self._content(response)
+        self.assertTrue(content.startswith("\ufeffid,name,"))
+        rows = list(csv.DictReader(io.StringIO(content.lstrip("\ufeff"))))
+        self.assertEqual([row["name"] for row in rows], ["株式会社テスト"])
+        self.assertEqual(rows[0]["memo"], "改行\nあり")
+        self.assertEqual(rows[0]["deadline"], "")
+
+    def test_es_jsonl(self):
+        """Test ES history lines include bodies and company names, oldest first."""
+        response = self.client.get("/api/export/es.jsonl")
+
+        lines = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([line["id"] for line in lines], [self.es1.id, self.es2.id])
+        self.assertEqual(lines[0]["company_name"], "株式会社テスト")
+        self.assertEqual(lines[0]["body"], "志望動機, 本文")
+        self.assertEqual(lines[0]["char_count"], 8)
+
+    def test_es_csv_uses_one_query(self):
+        """Test the ES export joins companies instead of querying per row."""
+        for i in range(5):
+            ESVersion.objects.create(owner=self.user1, company=self.company1, body=f"本文{i}")
+        response = self.client.get("/api/export/es.csv")
+
+        with self.assertNumQueries(1):
+            content = self._content(response)
+
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(content.lstrip("\ufeff"))))), 7)
+
+    @override_settings(ES_BODY_STORAGE="delta", ES_BODY_KEYFRAME_INTERVAL=3)
+    def test_es_delta_bodies_rebuilt_without_extra_queries(self):
+        """Test delta-stored bodies are rebuilt from the previous row, still in one query."""
+        company = Company.objects.create(owner=self.user1, name="差分")
+        base = "私は大学時代、軽音楽サークルの部長として五十人の部員をまとめました。" * 4
+        bodies = [base.replace("五十人", f"{50 + i}人") for i in range(7)]
+        for body in bodies:
+            ESVersion.objects.create(owner=self.user1, company=company, body=body)
+        self.assertTrue(ESVersion.objects.filter(company=company, body_storage=ESVersion.BodyStorage.DELTA).exists())
+        body_cache.clear()
+        response = self.client.get("/api/export/es.jsonl")
+
+        with self.assertNumQueries(1):
+            content = self._content(response)
+
+        lines = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([line["body"] for line in lines if line["company_id"] == company.id], bodies)
+
+    def test_unknown_format_not_found(self):
+        """Test unsupported suffixes return 404."""
+        response = self.client.get("/api/export/companies.xlsx")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_requires_authentication(self):
+        """Test anonymous exports are rejected."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get("/api/export/es.csv")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,209 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.importer import run_import
+from core.models import AuditLog, Company, ImportJob
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, COMPANY_IMPORT_ASYNC=False, COMPANY_IMPORT_BATCH_SIZE=2)
+class TestCompanyImport(APITestCase):
+    """Test streaming CSV/JSONL company import."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """Set up two users."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user1)
+
+    def _upload(self, name, content, **extra):
+        upload = SimpleUploadedFile(name, content)
+        return self.client.post("/api/companies/import/", {"file": upload, **extra}, format="multipart")
+
+    def test_csv_import_with_row_errors(self):
+        """Test valid rows are created in batches and invalid rows are reported."""
+        content = (
+            "name,job_role,deadline\n"
+            "株式会社A,SE,2026-03-01\n"
+            ",PM,\n"
+            "株式会社B,,\n"
+            "株式会社C,営業,not-a-date\n"
+            "株式会社D,,2026-04-01\n"
+        ).encode("utf-8-sig")
+
+        response = self._upload("companies.csv", content)
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], ImportJob.Status.SUCCEEDED)
+        self.assertEqual(response.data["processed_rows"], 5)
+        self.assertEqual(response.data["created_rows"], 3)
+        self.assertEqual(response.data["error_rows"], 2)
+        names = set(Company.objects.filter(owner=self.user1).values_list("name", flat=True))
+        self.assertEqual(names, {"株式会社A", "株式会社B", "株式会社D"})
+        self.assertEqual(
+            AuditLog.objects.filter(user=self.user1, action=AuditLog.Action.COMPANY_CREATE).count(), 3
+        )
+
+        errors = self.client.get(f"/api/imports/{response.data['id']}/errors/").data
+        self.assertEqual([item["row"] for item in errors], [2, 4])
+        self.assertIn("name", errors[0]["errors"])
+        self.assertIn("deadline", errors[1]["errors"])
+
+    def test_jsonl_import(self):
+        """Test JSON Lines import, including malformed lines."""
+        lines = [json.dumps({"name": "X社", "memo": "メモ"}, ensure_ascii=False), "{broken", "[1]", ""]
+        content = "\n".join(lines).encode("utf-8")
+
+        response = self._upload("companies.jsonl", content)
+
+        self.assertEqual(response.data["created_rows"], 1)
+        self.assertEqual(response.data["error_rows"], 2)
+        self.assertEqual(Company.objects.get(owner=self.user1).memo, "メモ")
+
+    def test_cp932_csv(self):
+        """Test Shift_JIS files exported from Excel."""
+        content = "name\n日本語企業\n".encode("cp932")
+
+        response = self._upload("companies.csv", content, encoding="cp932")
+
+        self.assertEqual(response.data["created_rows"], 1)
+        self.assertTrue(Company.objects.filter(owner=self.user1, name="日本語企業").exists())
+
+    def test_missing_header_fails_job(self):
+        """Test a CSV without a name column fails as a whole."""
+        response = self._upload("companies.csv", b"title\nA\n")
+
+        self.assertEqual(response.data["status"], ImportJob.Status.FAILED)
+        self.assertIn("name", response.data["detail"])
+
+    def test_unknown_format_rejected(self):
+        """Test uploads with an unknown extension and no format return 400."""
+        response = self._upload("companies.txt", b"name\nA\n")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_uploaded_file_removed_after_import(self):
+        """Test the stored upload is deleted once the job finishes."""
+        response = self._upload("companies.csv", b"name\nA\n")
+
+        job = ImportJob.objects.get(pk=response.data["id"])
+        self.assertFalse(job.file)
+        self.assertFalse(os.listdir(os.path.join(MEDIA_ROOT, "imports")))
+
+    def test_jobs_are_owner_scoped(self):
+        """Test other users cannot see a job or its errors."""
+        job_id = self._upload("companies.csv", b"name\n\n,x\n").data["id"]
+
+        self.client.force_authenticate(user=self.user2)
+
+        self.assertEqual(self.client.get(f"/api/imports/{job_id}/").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(f"/api/imports/{job_id}/errors/").status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_import_command(self):
+        """Test the management command imports a local file and reports progress."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+            handle.write("name\nA\nB\nC\n")
+        out = StringIO()
+
+        call_command("import_companies", handle.name, "--user-id", str(self.user1.id), stdout=out)
+        os.unlink(handle.name)
+
+        self.assertIn("3 created", out.getvalue())
+        self.assertIn("2 rows processed", out.getvalue())
+        self.assertEqual(Company.objects.filter(owner=self.user1).count(), 3)
+
+    def test_resume_skips_committed_rows(self):
+        """Test rerunning an interrupted job continues after processed_rows."""
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as handle:
+            handle.write(b"name\nA\nB\nC\n")
+        job = ImportJob.objects.create(owner=self.user1, format="csv", processed_rows=2)
+        Company.objects.bulk_create([Company(owner=self.user1, name="A"), Company(owner=self.user1, name="B")])
+
+        with open(handle.name, "rb") as stream:
+            run_import(job, stream)
+        os.unlink(handle.name)
+
+        self.assertEqual(
+            sorted(Company.objects.filter(owner=self.user1).values_list("name", flat=True)), ["A", "B", "C"]
+        )
+        self.assertEqual(job.processed_rows, 3)
+
+    def test_upload_kept_after_unexpected_error(self):
+        """Test a job that fails unexpectedly keeps its upload and can be resumed."""
+        with mock.patch("core.importer.run_import", side_effect=RuntimeError("boom")):
+            response = self._upload("companies.csv", b"name\nA\nB\nC\n")
+
+        job = ImportJob.objects.get(pk=response.data["id"])
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertTrue(job.file)
+
+        out = StringIO()
+        call_command("import_companies", "--job", str(job.id), stdout=out)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.Status.SUCCEEDED)
+        self.assertEqual(job.detail, "")
+        self.assertFalse(job.file)
+        self.assertEqual(Company.objects.filter(owner=self.user1).count(), 3)
+
+    @override_settings(COMPANY_IMPORT_STALE_AFTER=60)
+    def test_stale_running_job_marked_failed(self):
+        """Test a RUNNING job without progress is reported FAILED, a fresh one is not."""
+        stale = ImportJob.objects.create(owner=self.user1, format="csv", status=ImportJob.Status.RUNNING)
+        ImportJob.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(minutes=5))
+        fresh = ImportJob.objects.create(owner=self.user1, format="csv", status=ImportJob.Status.RUNNING)
+
+        response = self.client.get(f"/api/imports/{stale.id}/")
+        self.assertEqual(response.data["status"], ImportJob.Status.FAILED)
+        self.assertEqual(response.data["detail"], "Import worker stopped.")
+
+        response = self.client.get("/api/imports/")
+        statuses = {job["id"]: job["status"] for job in response.data}
+        self.assertEqual(statuses[fresh.id], ImportJob.Status.RUNNING)
+
+    def test_import_command_marks_job_failed_on_error(self):
+        """Test a database error during a command import leaves the job FAILED, not RUNNING."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+            handle.write("name\nA\nB\nC\n")
+
+        with mock.patch("core.importer._flush_batch", side_effect=DatabaseError("connection lost")):
+            with self.assertRaises(CommandError):
+                call_command("import_companies", handle.name, "--user-id", str(self.user1.id), stdout=StringIO())
+        os.unlink(handle.name)
+
+        job = ImportJob.objects.get(owner=self.user1)
+        self.assertEqual(job.status, ImportJob.Status.FAILED)
+        self.assertEqual(job.detail, "Internal error.")
@@ -0,0 +1,395 @@
+import os
+import shutil
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core import media_signing
+from core.models import Company, ESVersion
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_DELIVERY="django")
+class TestProtectedMedia(APITestCase):
+    """Test protected media delivery (ownership, ranges, validators, offload)."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """Set up two users and an ES attachment owned by user1."""
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        company = Company.objects.create(owner=self.user1, name="Company 1")
+        self.content = b"%PDF-" + bytes(range(256)) * 40
+        self.es = ESVersion.objects.create(owner=self.user1, company=company, body="ES")
+        self.es.file.save("resume.pdf", ContentFile(self.content))
+        self.url = f"/media/{self.es.file.name}"
+        self.client.force_authenticate(user=self.user1)
+
+    def _body(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_owner_downloads_full_file_with_validators(self):
+        """Test a plain GET streams the file with ETag, Last-Modified and Accept-Ranges."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._body(response), self.content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_access_is_owner_only(self):
+        """Test other users get 404 and anonymous users 403."""
+        self.client.force_authenticate(user=self.user2)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_directory_traversal_rejected(self):
+        """Test paths escaping MEDIA_ROOT or outside es_files/ are not served."""
+        self.assertEqual(self.client.get("/media/es_files/../../etc/passwd").status_code, 404)
+        self.assertEqual(self.client.get("/media/imports/x.csv").status_code, 404)
+
+    def test_byte_range(self):
+        """Test single ranges, suffix ranges and open-ended ranges return 206."""
+        size = len(self.content)
+        for header, start, end in (
+            ("bytes=10-19", 10, 19),
+            ("bytes=-5", size - 5, size - 1),
+            (f"bytes={size - 3}-", size - 3, size - 1),
+            (f"bytes=0-{size + 100}", 0, size - 1),
+        ):
+            response = self.client.get(self.url, HTTP_RANGE=header)
+            self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT, header)
+            self.assertEqual(self._body(response), self.content[start:end + 1], header)
+            self.assertEqual(response["Content-Range"], f"bytes {start}-{end}/{size}")
+            self.assertEqual(response["Content-Length"], str(end - start + 1))
+            self.assertEqual(response["Content-Type"], "application/pdf")
+
+    def test_unsatisfiable_range(self):
+        """Test a range past the end of the file returns 416."""
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(self.content)}-")
+
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_ignored_ranges_serve_full_file(self):
+        """Test multiple ranges, malformed ranges and a stale If-Range return the whole file."""
+        etag = self.client.get(self.url)["ETag"]
+        for headers in (
+            {"HTTP_RANGE": "bytes=0-1,5-6"},
+            {"HTTP_RANGE": "items=0-1"},
+            {"HTTP_RANGE": "bytes=0-4", "HTTP_IF_RANGE": '"stale"'},
+        ):
+            response = self.client.get(self.url, **headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, headers)
+            self.assertEqual(self._body(response), self.content)
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-4", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+
+    def test_conditional_requests(self):
+        """Test If-None-Match and If-Modified-Since return 304 while the file is unchanged."""
+        first = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        path = os.path.join(MEDIA_ROOT, self.es.file.name)
+        with open(path, "ab") as handle:
+            handle.write(b"more")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(MEDIA_DELIVERY="x-accel", MEDIA_ACCEL_PREFIX="/protected-media/")
+    def test_x_accel_offload(self):
+        """Test nginx offload returns only the internal redirect header after the check."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.es.file.name}")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertIn("ETag", response)
+        self.assertEqual(response.content, b"")
+
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("X-Accel-Redirect", response)
+
+    @override_settings(MEDIA_DELIVERY="x-sendfile")
+    def test_x_sendfile_offload(self):
+        """Test X-Sendfile offload points at the absolute file path."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response["X-Sendfile"], os.path.join(os.path.abspath(MEDIA_ROOT), self.es.file.name))
+        self.assertEqual(response.content, b"")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, MEDIA_DELIVERY="django", MEDIA_AUTH_CACHE_ENABLED=True)
+class TestMediaAccessCache(APITestCase):
+    """Test the cached per-user media ownership decisions and their invalidation."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """Set up a user with an ES attachment."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.company = Company.objects.create(owner=self.user, name="Company 1")
+        self.es = ESVersion.objects.create(owner=self.user, company=self.company, body="ES")
+        self.es.file.save("photo.png", ContentFile(b"\x89PNG\r\n\x1a\n" + b"0" * 100))
+        self.url = f"/media/{self.es.file.name}"
+        self.client.force_authenticate(user=self.user)
+
+    def _es_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        return response, [q for q in queries.captured_queries if "core_esversion" in q["sql"]]
+
+    def test_repeated_fetches_skip_database(self):
+        """Test only the first fetch of a file checks ownership in the database."""
+        response, first = self._es_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first), 1)
+
+        response, second = self._es_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(second, [])
+
+    def test_unrelated_update_keeps_cache(self):
+        """Test saving other fields does not invalidate cached decisions."""
+        self.client.get(self.url)
+        self.es.memo = "note"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.es.save(update_fields=["memo"])
+
+        _, queries = self._es_queries()
+        self.assertEqual(queries, [])
+
+    def test_delete_invalidates(self):
+        """Test a deleted ES version's file is refused even though it is still on disk."""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.es.delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_replaced_file_invalidates(self):
+        """Test replacing an attachment stops serving the old path."""
+        old_url = self.url
+        self.assertEqual(self.client.get(old_url).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.es.file.save("photo2.png", ContentFile(b"\x89PNG\r\n\x1a\n"))
+
+        self.assertEqual(self.client.get(old_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(f"/media/{self.es.file.name}").status_code, status.HTTP_200_OK)
+
+    def test_invalidation_waits_for_commit(self):
+        """Test the generation is only bumped once the deleting transaction commits."""
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.es.delete()
+            _, queries = self._es_queries()
+            # Still the cached pre-commit decision; nothing new is cached under a bumped generation
+            self.assertEqual(queries, [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(MEDIA_AUTH_CACHE_ENABLED=False)
+    def test_disabled_without_shared_cache(self):
+        """Test every fetch checks the database when the cache is not shared."""
+        self.assertEqual(len(self._es_queries()[1]), 1)
+        self.assertEqual(len(self._es_queries()[1]), 1)
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT, MEDIA_DELIVERY="django", MEDIA_AUTH_CACHE_ENABLED=True, MEDIA_SIGNED_URL_TTL=3600
+)
+class TestSignedMediaUrls(APITestCase):
+    """Test signed, expiring attachment URLs emitted by the ES serializers."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """Set up a user with an ES attachment and fetch its signed URL."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        company = Company.objects.create(owner=self.user, name="Company 1")
+        self.content = b"%PDF-" + b"0" * 100
+        self.es = ESVersion.objects.create(owner=self.user, company=company, body="ES")
+        self.es.file.save("resume.pdf", ContentFile(self.content))
+        self.client.force_authenticate(user=self.user)
+        self.path = f"/media/{self.es.file.name}"
+
+    def _signed_url(self, **params):
+        url = self.client.get(f"/api/es/{self.es.pk}/").data["file"]
+        parts = urlsplit(url)
+        query = parts.query
+        for key, value in params.items():
+            query = "&".join(
+                f"{key}={value}" if item.startswith(f"{key}=") else item for item in query.split("&")
+            )
+        return f"{parts.path}?{query}"
+
+    def test_serializers_emit_signed_urls(self):
+        """Test detail, list and sync responses carry the signed URL."""
+        detail = self.client.get(f"/api/es/{self.es.pk}/").data["file"]
+        listed = self.client.get("/api/es/").data[0]["file"]
+        synced = self.client.get("/api/sync").data["es_versions"][0]["file"]
+
+        self.assertEqual(detail, listed)
+        self.assertEqual(detail, synced)
+        self.assertEqual(urlsplit(detail).path, self.path)
+        self.assertIn("sig=", detail)
+
+    def test_signed_url_needs_no_session_or_database(self):
+        """Test an anonymous client downloads through a signed URL without any query."""
+        url = self._signed_url()
+        self.client.force_authenticate(user=None)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(queries.captured_queries, [])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+        self.assertNotIn("no-cache", response["Cache-Control"])
+
+    def test_unsigned_anonymous_request_rejected(self):
+        """Test the plain path still requires authentication."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.path)
+
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_tampered_signatures_rejected(self):
+        """Test a changed uid, expiry, signature or path is refused to anonymous clients."""
+        query = urlsplit(self._signed_url()).query
+        forged = [
+            self._signed_url(uid=self.user.pk + 1),
+            self._signed_url(exp=int(time.time()) + 10 ** 6),
+            self._signed_url(sig="0" * 64),
+            self._signed_url(uid="x"),
+            f"/media/es_files/other.pdf?{query}",
+        ]
+        self.client.force_authenticate(user=None)
+
+        for bad in forged:
+            self.assertEqual(self.client.get(bad).status_code, status.HTTP_403_FORBIDDEN, bad)
+
+    def test_expired_signature_rejected(self):
+        """Test a URL signed two windows ago no longer works."""
+        query = media_signing.sign(self.es.file.name, self.user.pk, now=time.time() - 3 * 3600)
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(f"{self.path}?{query}")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stale_signature_falls_back_to_session(self):
+        """Test the logged-in owner still downloads through an expired or forged link."""
+        expired = media_signing.sign(self.es.file.name, self.user.pk, now=time.time() - 3 * 3600)
+
+        self.assertEqual(self.client.get(f"{self.path}?{expired}").status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self._signed_url(sig="0" * 64)).status_code, status.HTTP_200_OK)
+
+    def test_other_users_session_does_not_rescue_forged_link(self):
+        """Test the fallback still applies the ownership check."""
+        other = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        forged = self._signed_url(sig="0" * 64)
+        self.client.force_authenticate(user=other)
+
+        self.assertEqual(self.client.get(forged).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_revokes_issued_links(self):
+        """Test a deleted version's attachment is not served through its signed link."""
+        url = self._signed_url()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.es.delete()
+        self.client.force_authenticate(user=None)
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_url_is_stable_within_a_window(self):
+        """Test signing twice in one window yields the same URL (browser-cacheable)."""
+        window_start = media_signing.current_window() * 3600
+
+        first = media_signing.sign("es_files/a.pdf", 1, now=window_start)
+        second = media_signing.sign("es_files/a.pdf", 1, now=window_start + 3599)
+
+        self.assertEqual(first, second)
+        self.assertGreaterEqual(media_signing.verify("es_files/a.pdf", dict(
+            item.split("=") for item in first.split("&")
+        ), now=window_start + 3599), 3600)
+
+    @override_settings(MEDIA_SIGNED_URL_TTL=0)
+    def test_signing_can_be_disabled(self):
+        """Test MEDIA_SIGNED_URL_TTL=0 emits plain URLs."""
+        url = self.client.get(f"/api/es/{self.es.pk}/").data["file"]
+
+        self.assertEqual(urlsplit(url).query, "")
+
+    @override_settings(MEDIA_AUTH_CACHE_ENABLED=False)
+    def test_no_signing_without_shared_cache(self):
+        """Test links are not signed when revocation could not reach every worker."""
+        url = self.client.get(f"/api/es/{self.es.pk}/").data["file"]
+
+        self.assertEqual(urlsplit(url).query, "")
@@ -0,0 +1,122 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company, ESSearchPosting, ESVersion
+
+User = get_user_model()
+
+
+class TestESSearch(APITestCase):
+    """Test the bigram inverted index and the ES search endpoint."""
+
+    def setUp(self):
+        """Set up two users with one company each."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="Company 1")
+        self.company2 = Company.objects.create(owner=self.user2, name="Company 2")
+        self.client.force_authenticate(user=self.user1)
+
+    def _search(self, query, **params):
+        return self.client.get("/api/es/search/", {"q": query, **params})
+
+    def test_search_ranks_by_term_frequency(self):
+        """Test results contain the query and rank repeated matches first."""
+        once = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="学生時代にリーダーシップを発揮した。"
+        )
+        twice = ESVersion.objects.create(
+            owner=self.user1, company=self.company1,
+            body="リーダーシップとは何か。私のリーダーシップは傾聴です。"
+        )
+        ESVersion.objects.create(owner=self.user1, company=self.company1, body="研究活動について。")
+
+        response = self._search("リーダーシップ")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [twice.id, once.id])
+        snippet = response.data["results"][1]["snippets"]["body"]
+        start, end = snippet["highlights"][0]
+        self.assertEqual(snippet["text"][start:end], "リーダーシップ")
+
+    def test_search_matches_memo(self):
+        """Test memo text is indexed too."""
+        es = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="本文", memo="面接で深掘りされた"
+        )
+
+        response = self._search("深掘り")
+
+        self.assertEqual([item["id"] for item in response.data["results"]], [es.id])
+        self.assertIn("memo", response.data["results"][0]["snippets"])
+
+    def test_search_requires_contiguous_match(self):
+        """Test documents containing all bigrams but not the phrase are dropped."""
+        ESVersion.objects.create(owner=self.user1, company=self.company1, body="東京、京都")
+
+        response = self._search("東京都")
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_search_normalizes_width_and_case(self):
+        """Test full-width and half-width forms match each other."""
+        es = ESVersion.objects.create(
+            owner=self.user1, company=self.company1, body="ＰｙｔｈｏｎでＡＰＩを開発した"
+        )
+
+        response = self._search("python")
+
+        self.assertEqual([item["id"] for item in response.data["results"]], [es.id])
+
+    def test_search_is_owner_scoped(self):
+        """Test other users' ES versions are never returned."""
+        ESVersion.objects.create(owner=self.user2, company=self.company2, body="志望動機を書く")
+
+        response = self._search("志望動機")
+
+        self.assertEqual(response.data["results"], [])
+
+    def test_short_query_rejected(self):
+        """Test queries shorter than one bigram return 400."""
+        response = self._search(" 志 ")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_updated_on_edit_and_delete(self):
+        """Test postings follow body edits and are removed with the ES version."""
+        response = self.client.post("/api/es/", {"company": self.company1.id, "body": "自己紹介"})
+        es_id = response.data["id"]
+
+        self.client.patch(f"/api/es/{es_id}/", {"body": "自己PR"}, format="json")
+
+        self.assertEqual(self._search("紹介").data["results"], [])
+        self.assertEqual(len(self._search("自己").data["results"]), 1)
+        grams = set(ESSearchPosting.objects.filter(es_version_id=es_id).values_list("gram", flat=True))
+        self.assertEqual(grams, {"自己", "己p", "pr"})
+
+        self.client.delete(f"/api/es/{es_id}/")
+
+        self.assertFalse(ESSearchPosting.objects.filter(es_version_id=es_id).exists())
+
+    def test_rebuild_search_index_command(self):
+        """Test the management command restores missing postings."""
+        es = ESVersion.objects.create(owner=self.user1, company=self.company1, body="ガクチカ")
+        ESSearchPosting.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+
+        self.assertIn("Reindexed 1", out.getvalue())
+        self.assertEqual([item["id"] for item in self._search("ガクチカ").data["results"]], [es.id])
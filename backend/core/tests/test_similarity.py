@@ -0,0 +1,115 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company, ESMinHash, ESSimilarityBucket, ESVersion
+from core.similarity import BANDS, estimate_similarity, signature
+
+User = get_user_model()
+
+ANSWER = (
+    "私が学生時代に最も力を入れたことは、飲食店のアルバイトでの業務改善です。"
+    "注文ミスが多いという課題に対し、メニュー表の改訂と声出し確認を提案し、"
+    "三か月でミスを半分に減らしました。この経験から課題発見力を培いました。"
+)
+TWEAKED = ANSWER.replace("三か月", "二か月").replace("半分", "三割")
+UNRELATED = (
+    "貴社を志望する理由は、物流の効率化を通じて地域社会に貢献したいからです。"
+    "大学では交通工学を専攻し、配送ルート最適化の研究に取り組みました。"
+)
+
+
+class TestESSimilarity(APITestCase):
+    """Test MinHash/LSH near-duplicate detection for ES versions."""
+
+    def setUp(self):
+        """Set up two users with companies."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company_a = Company.objects.create(owner=self.user1, name="Company A")
+        self.company_b = Company.objects.create(owner=self.user1, name="Company B")
+        self.company_other = Company.objects.create(owner=self.user2, name="Company Other")
+        self.client.force_authenticate(user=self.user1)
+
+    def _create(self, body, company=None, owner=None):
+        return ESVersion.objects.create(
+            owner=owner or self.user1, company=company or self.company_a, body=body
+        )
+
+    def test_signature_estimates_similarity(self):
+        """Test identical texts score 1.0 and unrelated texts score low."""
+        self.assertEqual(estimate_similarity(signature(ANSWER), signature(ANSWER)), 1.0)
+        self.assertGreater(estimate_similarity(signature(ANSWER), signature(TWEAKED)), 0.7)
+        self.assertLess(estimate_similarity(signature(ANSWER), signature(UNRELATED)), 0.2)
+
+    def test_signature_and_buckets_stored_on_save(self):
+        """Test saving an ES version stores its signature and one bucket per band."""
+        es = self._create(ANSWER)
+
+        self.assertTrue(ESMinHash.objects.filter(es_version=es).exists())
+        self.assertEqual(ESSimilarityBucket.objects.filter(es_version=es).count(), BANDS)
+
+    def test_similar_returns_tweaked_answers_across_companies(self):
+        """Test the endpoint finds reused answers and skips unrelated ones."""
+        es = self._create(ANSWER)
+        tweaked = self._create(TWEAKED, company=self.company_b)
+        self._create(UNRELATED, company=self.company_b)
+
+        response = self.client.get(f"/api/es/{es.id}/similar/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([item["id"] for item in results], [tweaked.id])
+        self.assertEqual(results[0]["company_name"], "Company B")
+        self.assertGreaterEqual(results[0]["similarity"], 0.5)
+
+    def test_similar_is_owner_scoped(self):
+        """Test other users' identical answers are not returned, nor their ES reachable."""
+        es = self._create(ANSWER)
+        other = self._create(ANSWER, company=self.company_other, owner=self.user2)
+
+        response = self.client.get(f"/api/es/{es.id}/similar/")
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get(f"/api/es/{other.id}/similar/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_buckets_follow_body_edits(self):
+        """Test editing the body moves the version out of the old buckets."""
+        es = self._create(ANSWER)
+        copy = self._create(ANSWER, company=self.company_b)
+
+        self.client.patch(f"/api/es/{copy.id}/", {"body": UNRELATED}, format="json")
+
+        response = self.client.get(f"/api/es/{es.id}/similar/")
+        self.assertEqual(response.data["results"], [])
+
+    def test_invalid_threshold_rejected(self):
+        """Test thresholds outside (0, 1] return 400."""
+        es = self._create(ANSWER)
+
+        response = self.client.get(f"/api/es/{es.id}/similar/", {"threshold": "1.5"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_restores_buckets(self):
+        """Test the rebuild command recreates lost bucket rows."""
+        es = self._create(ANSWER)
+        copy = self._create(ANSWER, company=self.company_b)
+        ESSimilarityBucket.objects.all().delete()
+
+        call_command("rebuild_search_index", "--only", "similarity", stdout=StringIO())
+
+        response = self.client.get(f"/api/es/{es.id}/similar/")
+        self.assertEqual([item["id"] for item in response.data["results"]], [copy.id])
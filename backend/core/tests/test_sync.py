@@ -0,0 +1,172 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import Company, ESVersion, Tombstone
+
+User = get_user_model()
+
+
+class TestSync(APITestCase):
+    """Test the delta sync endpoint and deletion tombstones."""
+
+    def setUp(self):
+        """Set up test users and companies."""
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="Company 1")
+        self.company2 = Company.objects.create(owner=self.user2, name="Company 2")
+        self.es1 = ESVersion.objects.create(owner=self.user1, company=self.company1, body="ES 1")
+
+    def test_requires_auth(self):
+        """Test sync requires authentication."""
+        response = self.client.get("/api/sync")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_full_snapshot_only_own_rows(self):
+        """Test sync without watermark returns only the user's rows."""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get("/api/sync")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c["id"] for c in response.data["companies"]], [self.company1.id])
+        self.assertEqual([e["id"] for e in response.data["es_versions"]], [self.es1.id])
+        self.assertNotIn("body", response.data["es_versions"][0])
+        self.assertEqual(response.data["deleted"], [])
+        self.assertIn("watermark", response.data)
+
+    @override_settings(SYNC_SAFETY_MARGIN=0)
+    def test_delta_returns_only_changes_since_watermark(self):
+        """Test rows untouched since the watermark are not re-sent."""
+        self.client.force_authenticate(user=self.user1)
+        watermark = self.client.get("/api/sync").data["watermark"]
+
+        company = Company.objects.create(owner=self.user1, name="New Company")
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c["id"] for c in response.data["companies"]], [company.id])
+        self.assertEqual(response.data["es_versions"], [])
+
+    def test_delete_records_tombstones_including_cascade(self):
+        """Test deleting a company tombstones it and its cascaded ES versions."""
+        self.client.force_authenticate(user=self.user1)
+        watermark = self.client.get("/api/sync").data["watermark"]
+
+        response = self.client.delete(f"/api/companies/{self.company1.id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+        deleted = {(d["type"], d["id"]) for d in response.data["deleted"]}
+        self.assertEqual(deleted, {("Company", self.company1.id), ("ESVersion", self.es1.id)})
+
+    def test_tombstones_are_owner_scoped(self):
+        """Test other users' tombstones are never returned."""
+        Tombstone.objects.create(owner=self.user2, target_type="Company", target_id=self.company2.id)
+
+        self.client.force_authenticate(user=self.user1)
+        watermark = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+
+        self.assertFalse(response.data["full_resync"])
+        self.assertEqual(response.data["deleted"], [])
+
+    def test_invalid_watermark_returns_400(self):
+        """Test an unparseable watermark is rejected."""
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get("/api/sync", {"updated_since": "last week"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SYNC_SAFETY_MARGIN=60)
+    def test_row_committed_after_sync_with_earlier_timestamp_is_sent(self):
+        """Test a write stamped before a sync but committed after it reaches the next sync."""
+        self.client.force_authenticate(user=self.user1)
+        before = timezone.now()
+        watermark = self.client.get("/api/sync").data["watermark"]
+        self.assertLessEqual(parse_datetime(watermark), before - timedelta(seconds=59))
+
+        # Saved (stamped) one second before the sync read, visible only afterwards
+        company = Company.objects.create(owner=self.user1, name="Late")
+        Company.objects.filter(id=company.id).update(updated_at=before - timedelta(seconds=1))
+        tombstone = Tombstone.objects.create(owner=self.user1, target_type="Company", target_id=999)
+        Tombstone.objects.filter(id=tombstone.id).update(deleted_at=before - timedelta(seconds=1))
+
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+        self.assertIn(company.id, [c["id"] for c in response.data["companies"]])
+        self.assertIn(("Company", 999), [(d["type"], d["id"]) for d in response.data["deleted"]])
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=30)
+    def test_watermark_older_than_retention_gets_full_resync(self):
+        """Test a watermark outside the tombstone window returns the full snapshot."""
+        self.client.force_authenticate(user=self.user1)
+        watermark = (timezone.now() - timedelta(days=31)).isoformat()
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["full_resync"])
+        self.assertEqual([c["id"] for c in response.data["companies"]], [self.company1.id])
+        self.assertEqual(response.data["deleted"], [])
+
+        watermark = (timezone.now() - timedelta(days=29)).isoformat()
+        response = self.client.get("/api/sync", {"updated_since": watermark})
+        self.assertFalse(response.data["full_resync"])
+
+    def test_delete_rolls_back_without_tombstone(self):
+        """Test a failed tombstone write leaves the row in place."""
+        self.client.raise_request_exception = False
+        self.client.force_authenticate(user=self.user1)
+        with mock.patch.object(Tombstone.objects, "bulk_create", side_effect=RuntimeError):
+            response = self.client.delete(f"/api/companies/{self.company1.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertTrue(Company.objects.filter(id=self.company1.id).exists())
+        self.assertTrue(ESVersion.objects.filter(id=self.es1.id).exists())
+
+
+class TestPruneTombstones(APITestCase):
+    """Test the prune_tombstones management command."""
+
+    def setUp(self):
+        """Set up one expired and one recent tombstone."""
+        user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.old = Tombstone.objects.create(owner=user, target_type="Company", target_id=1)
+        Tombstone.objects.filter(id=self.old.id).update(deleted_at=timezone.now() - timedelta(days=31))
+        self.recent = Tombstone.objects.create(owner=user, target_type="Company", target_id=2)
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=30)
+    def test_deletes_only_expired(self):
+        """Test only tombstones older than the retention window are deleted."""
+        out = StringIO()
+        call_command("prune_tombstones", "--batch-size", "1", stdout=out)
+
+        self.assertEqual(list(Tombstone.objects.values_list("id", flat=True)), [self.recent.id])
+        self.assertIn("Deleted 1 tombstones", out.getvalue())
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=30)
+    def test_dry_run_deletes_nothing(self):
+        """Test --dry-run only reports the count."""
+        out = StringIO()
+        call_command("prune_tombstones", "--dry-run", stdout=out)
+
+        self.assertEqual(Tombstone.objects.count(), 2)
+        self.assertIn("Would delete 1 tombstones", out.getvalue())
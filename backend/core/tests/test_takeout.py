@@ -0,0 +1,112 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.models import AuditLog, Company, ESVersion
+from core.takeout import FILE_CHUNK_SIZE
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class TestTakeout(APITestCase):
+    """Test the streamed full-account takeout ZIP."""
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove uploaded files."""
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """Set up two users, each with a company and an ES version with an attachment."""
+        cache.clear()
+        self.user1 = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="user2@example.com",
+            email="user2@example.com",
+            password="testpass123"
+        )
+        self.company1 = Company.objects.create(owner=self.user1, name="株式会社A")
+        self.company2 = Company.objects.create(owner=self.user2, name="Other")
+        self.attachment = os.urandom(FILE_CHUNK_SIZE * 3 + 123)
+        self.es1 = ESVersion.objects.create(owner=self.user1, company=self.company1, body="本文")
+        self.es1.file.save("resume.pdf", ContentFile(self.attachment))
+        es2 = ESVersion.objects.create(owner=self.user2, company=self.company2, body="secret")
+        es2.file.save("other.pdf", ContentFile(b"%PDF-other"))
+        self.client.force_authenticate(user=self.user1)
+
+    def _download(self):
+        response = self.client.get("/api/export/takeout.zip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        chunks = list(response.streaming_content)
+        return response, chunks, zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+    def test_takeout_contains_account_data_and_files(self):
+        """Test the ZIP holds settings, companies, ES versions and the user's files only."""
+        response, _, archive = self._download()
+
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIsNone(archive.testzip())
+        names = archive.namelist()
+        self.assertIn("account.json", names)
+        self.assertIn(self.es1.file.name, names)
+        self.assertFalse(any("other" in name for name in names))
+
+        account = json.loads(archive.read("account.json"))
+        self.assertEqual(account["user"]["email"], "user1@example.com")
+        self.assertIn("display_name", account["settings"])
+        companies = archive.read("companies.jsonl").decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["name"] for line in companies], ["株式会社A"])
+        es_lines = archive.read("es_versions.jsonl").decode("utf-8").splitlines()
+        self.assertEqual(json.loads(es_lines[0])["body"], "本文")
+        self.assertEqual(archive.read(self.es1.file.name), self.attachment)
+
+    def test_attachments_streamed_in_chunks(self):
+        """Test no single response chunk holds much more than one file read."""
+        _, chunks, _ = self._download()
+
+        self.assertGreater(len(chunks), 4)
+        self.assertLessEqual(max(len(chunk) for chunk in chunks), FILE_CHUNK_SIZE + 1024)
+
+    def test_missing_file_listed_in_manifest(self):
+        """Test attachments missing on disk are skipped and reported."""
+        os.remove(self.es1.file.path)
+
+        _, _, archive = self._download()
+
+        manifest = json.loads(archive.read("manifest.json"))
+        self.assertEqual(manifest["missing_files"], [self.es1.file.name])
+        self.assertNotIn(self.es1.file.name, archive.namelist())
+
+    def test_takeout_is_audit_logged(self):
+        """Test each takeout writes an ACCOUNT_EXPORT audit entry."""
+        self._download()
+
+        self.assertTrue(
+            AuditLog.objects.filter(user=self.user1, action=AuditLog.Action.ACCOUNT_EXPORT).exists()
+        )
+
+    def test_takeout_requires_authentication(self):
+        """Test anonymous takeout requests are rejected."""
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get("/api/export/takeout.zip")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
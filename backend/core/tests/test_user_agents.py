@@ -0,0 +1,132 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from core.audit_sink import audit_sink
+from core.models import AuditLog, UserAgent
+from core.user_agents import agent_cache, agent_hash, intern_many, space_report
+
+User = get_user_model()
+
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+SAFARI = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 Safari/604.1"
+
+# The admin templates need static files without a collectstatic manifest
+TEST_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class TestUserAgentInterning(APITestCase):
+    """Test that audit log user agents are stored once and referenced by id."""
+
+    def setUp(self):
+        """Set up a user and an empty agent cache."""
+        self.user = User.objects.create_user(
+            username="user1@example.com",
+            email="user1@example.com",
+            password="testpass123"
+        )
+        agent_cache.clear()
+
+    def test_api_writes_share_one_agent_row(self):
+        """Test repeated requests from one browser reference a single UserAgent."""
+        self.client.force_authenticate(user=self.user)
+        for name in ("A", "B", "C"):
+            response = self.client.post("/api/companies/", {"name": name}, HTTP_USER_AGENT=FIREFOX)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(UserAgent.objects.count(), 1)
+        agent = UserAgent.objects.get()
+        self.assertEqual(agent.sha256, agent_hash(FIREFOX))
+        logs = AuditLog.objects.filter(action=AuditLog.Action.COMPANY_CREATE)
+        self.assertEqual(set(logs.values_list("agent_id", flat=True)), {agent.id})
+        self.assertEqual(logs.first().user_agent, FIREFOX)
+
+    def test_empty_agent_stores_no_row(self):
+        """Test entries without a User-Agent keep a null reference."""
+        log = AuditLog.objects.create(user=self.user, action=AuditLog.Action.LOGOUT, user_agent="")
+
+        self.assertIsNone(log.agent_id)
+        self.assertEqual(AuditLog.objects.get(pk=log.pk).user_agent, "")
+        self.assertFalse(UserAgent.objects.exists())
+
+    def test_bulk_create_resolves_agents(self):
+        """Test batched writes through the audit sink intern every distinct agent once."""
+        audit_sink.record_many([
+            AuditLog(user=self.user, action=AuditLog.Action.LOGOUT, user_agent=agent)
+            for agent in (FIREFOX, SAFARI, FIREFOX, SAFARI)
+        ])
+
+        self.assertEqual(UserAgent.objects.count(), 2)
+        self.assertEqual(
+            sorted(log.user_agent for log in AuditLog.objects.select_related("agent")),
+            sorted([FIREFOX, SAFARI, FIREFOX, SAFARI]),
+        )
+
+    def test_cached_agent_needs_no_query(self):
+        """Test a committed agent is resolved from the in-process cache."""
+        with self.captureOnCommitCallbacks(execute=True):
+            first = intern_many([FIREFOX])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(intern_many([FIREFOX]), first)
+        self.assertEqual(agent_cache.hits, 1)
+
+    def test_rolled_back_agent_not_cached(self):
+        """Test an agent inserted by a rolled-back transaction is not cached."""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    intern_many([SAFARI])
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(len(agent_cache), 0)
+        self.assertFalse(UserAgent.objects.exists())
+
+    def test_space_report(self):
+        """Test the report compares inline strings with the interned form."""
+        audit_sink.record_many([
+            AuditLog(user=self.user, action=AuditLog.Action.LOGOUT, user_agent=FIREFOX)
+            for _ in range(10)
+        ])
+
+        report = space_report()
+
+        self.assertEqual(report["agents"], 1)
+        self.assertEqual(report["audit_rows"], 10)
+        self.assertEqual(report["inline_bytes"], 10 * len(FIREFOX))
+        self.assertEqual(report["interned_bytes"], len(FIREFOX) + 64 + 10 * 8)
+        self.assertGreater(report["reclaimed_bytes"], 0)
+
+        out = StringIO()
+        call_command("user_agent_report", stdout=out)
+        self.assertIn("distinct agents: 1", out.getvalue())
+        self.assertIn("Reclaimed (estimate)", out.getvalue())
+
+    @override_settings(STORAGES=TEST_STORAGES)
+    def test_admin_search_and_detail(self):
+        """Test the admin changelist searches agents and the detail page shows the string."""
+        admin_user = User.objects.create_superuser(
+            username="admin@example.com", email="admin@example.com", password="adminpass123"
+        )
+        firefox_log = AuditLog.objects.create(user=self.user, action=AuditLog.Action.LOGOUT, user_agent=FIREFOX)
+        AuditLog.objects.create(user=self.user, action=AuditLog.Action.LOGOUT, user_agent=SAFARI)
+        self.client.force_login(admin_user)
+
+        response = self.client.get(reverse("admin:core_auditlog_changelist"), {"q": "Firefox"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["cl"].result_list), [firefox_log])
+
+        response = self.client.get(reverse("admin:core_auditlog_change", args=[firefox_log.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Firefox/128.0")
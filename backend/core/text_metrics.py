@@ -0,0 +1,27 @@
+"""
+Character/line/paragraph metrics of ES bodies, stored on ESVersion at save time.
+
+Japanese ES forms enforce limits such as 400字, so counts are exposed on list
+responses and filterable in SQL without ever loading `body`.
+"""
+import re
+from typing import Dict
+
+# Paragraphs are separated by one or more blank (whitespace-only) lines
+_PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n")
+
+
+def compute_metrics(text: str) -> Dict[str, int]:
+    """
+    Return char_count, char_count_no_ws, line_count and paragraph_count.
+
+    CRLF counts as a single newline character. Whitespace includes the
+    full-width space (U+3000).
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return {
+        "char_count": len(text),
+        "char_count_no_ws": sum(1 for char in text if not char.isspace()),
+        "line_count": len(text.splitlines()),
+        "paragraph_count": sum(1 for block in _PARAGRAPH_BREAK.split(text) if block.strip()),
+    }
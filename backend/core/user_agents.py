@@ -0,0 +1,103 @@
+"""
+Interned User-Agent strings for AuditLog.
+
+A user only has a handful of distinct browsers, so each distinct header value is
+stored once in UserAgent, keyed by its SHA-256 (unique index), and audit rows
+keep a foreign key to it. A per-worker LRU maps hash -> id so steady-state
+audit inserts resolve their agent without touching the UserAgent table.
+"""
+import hashlib
+from functools import partial
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Length
+
+from .lru import LRUCache
+from .models import AuditLog, UserAgent
+
+agent_cache = LRUCache(max_entries=settings.USER_AGENT_CACHE_SIZE)
+
+
+def agent_hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def intern_many(values: Iterable[str]) -> Dict[str, int]:
+    """Map each non-empty value to its UserAgent id, inserting the missing ones."""
+    ids: Dict[str, int] = {}
+    missing: Dict[str, str] = {}
+    for value in set(values):
+        if not value:
+            continue
+        digest = agent_hash(value)
+        cached = agent_cache.get(digest)
+        if cached is None:
+            missing[digest] = value
+        else:
+            ids[value] = cached
+    if not missing:
+        return ids
+
+    # Concurrent workers may insert the same agent; the unique hash settles it
+    UserAgent.objects.bulk_create(
+        [UserAgent(sha256=digest, value=value) for digest, value in missing.items()],
+        ignore_conflicts=True,
+    )
+    for digest, pk in UserAgent.objects.filter(sha256__in=missing).values_list("sha256", "id"):
+        ids[missing[digest]] = pk
+        # Cache only once committed: a rolled-back insert must not leave a dangling id
+        transaction.on_commit(partial(agent_cache.set, digest, pk))
+    return ids
+
+
+def resolve_agents(entries: Iterable) -> None:
+    """Point AuditLog instances built with user_agent="..." at their UserAgent row."""
+    pending = [
+        entry for entry in entries
+        if entry.agent_id is None and getattr(entry, "_user_agent", "")
+    ]
+    if not pending:
+        return
+    ids = intern_many(entry._user_agent for entry in pending)
+    for entry in pending:
+        entry.agent_id = ids[entry._user_agent]
+
+
+# Per-row cost of the interned form: the bigint foreign key on each audit row,
+# and the hash column on each agent row
+FK_BYTES = 8
+HASH_BYTES = 64
+
+
+def space_report() -> dict:
+    """
+    Estimate the bytes saved by interning, from character counts.
+
+    `inline_bytes` is what the agent strings would take stored on every audit
+    row; `interned_bytes` is the agent table plus one foreign key per row.
+    On PostgreSQL the on-disk sizes of both tables are included as well.
+    """
+    agents = UserAgent.objects.aggregate(rows=Count("id"), chars=Sum(Length("value")))
+    referencing = AuditLog.objects.filter(agent__isnull=False).aggregate(
+        rows=Count("id"), chars=Sum(Length("agent__value"))
+    )
+    inline = referencing["chars"] or 0
+    interned = (agents["chars"] or 0) + agents["rows"] * HASH_BYTES + referencing["rows"] * FK_BYTES
+    report = {
+        "agents": agents["rows"],
+        "audit_rows": referencing["rows"],
+        "inline_bytes": inline,
+        "interned_bytes": interned,
+        "reclaimed_bytes": inline - interned,
+    }
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_total_relation_size(%s), pg_total_relation_size(%s)",
+                [AuditLog._meta.db_table, UserAgent._meta.db_table],
+            )
+            report["auditlog_table_bytes"], report["useragent_table_bytes"] = cursor.fetchone()
+    return report
@@ -1,9 +1,16 @@
 """
 Shared utility functions for the core application.
 """
-from typing import Optional, Tuple
+import hashlib
+from datetime import datetime, time
+from typing import Any, Optional, Tuple
 
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponseBase
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
 
 
 # File magic bytes (signatures) for MIME type validation
@@ -90,3 +97,91 @@ def get_user_agent(request: HttpRequest) -> str:
     Returns empty string if not present.
     """
     return request.META.get('HTTP_USER_AGENT', '')
+
+
+def parse_timestamp(value: str, param: str) -> datetime:
+    """
+    Parse an ISO 8601 datetime or date query parameter into an aware datetime.
+
+    Dates are interpreted as midnight in the current time zone.
+    Raises ValidationError (400) for unparseable values.
+    """
+    parsed: Optional[datetime] = None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            if day is not None:
+                parsed = datetime.combine(day, time.min)
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        raise ValidationError({param: "Enter a valid ISO 8601 date or datetime."})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted ETag from the given validator parts (e.g. user id, count, max(updated_at))."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32])
+
+
+def get_not_modified_response(
+    request: HttpRequest, etag: str, last_modified: Optional[datetime]
+) -> Optional[HttpResponseBase]:
+    """
+    Return a 304 response if the request's If-None-Match / If-Modified-Since
+    validators still match, otherwise None.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: HttpResponseBase, etag: str, last_modified: Optional[datetime]) -> None:
+    """
+    Attach ETag / Last-Modified headers and require revalidation.
+
+    Responses are per-user, so they are marked private (never shared-cached).
+    """
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header into inclusive (start, end).
+
+    Returns None when the header should be ignored (absent, malformed, or
+    several ranges, which are served as a full response). Raises ValueError
+    when the range is unsatisfiable for a file of `size` bytes (416).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        start, end = max(size - length, 0), size - 1
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size - 1)
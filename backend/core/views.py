@@ -1,8 +1,15 @@
+import os
+
 from django.http import JsonResponse
 from django.views.decorators.csrf import ensure_csrf_cookie
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import response_cache
+from .audit_sink import audit_sink
+from .user_agents import agent_cache
+
 
 class HealthView(APIView):
     """Health check endpoint for monitoring."""
@@ -17,3 +24,25 @@ class HealthView(APIView):
 def csrf(request):
     """CSRF cookie endpoint for frontend."""
     return JsonResponse({"detail": "CSRF cookie set"})
+
+
+class MetricsView(APIView):
+    """
+    Operational metrics for staff users.
+
+    Audit sink figures (queue depth, flush latency) are per process: each
+    gunicorn worker answers with its own.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "pid": os.getpid(),
+            "audit_sink": audit_sink.get_stats(),
+            "response_cache": response_cache.get_stats(),
+            "user_agent_cache": {
+                "entries": len(agent_cache),
+                "hits": agent_cache.hits,
+                "misses": agent_cache.misses,
+            },
+        })
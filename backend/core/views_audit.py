@@ -1,11 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
 from rest_framework import viewsets, mixins
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
 
-from .models import AuditLog
+from .audit_rollup import counts
+from .models import AuditLog, AuditRollup
+from .pagination import KeysetPagination
 from .serializers import AuditLogSerializer
+from .utils import parse_timestamp
+from .viewsets import ConditionalGetMixin
 
 
 class AuditLogViewSet(
+    ConditionalGetMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
     viewsets.GenericViewSet
@@ -13,14 +26,121 @@ class AuditLogViewSet(
     """
     Read-only ViewSet for AuditLog.
     Users can only see their own logs.
+
+    List filters (all served by the (user, -created_at) / (user, action, -created_at) indexes):
+        - since: created_at >= since (ISO date or datetime)
+        - until: created_at < until (ISO date or datetime)
+        - action: exact AuditLog.Action value
+
+    Pagination:
+        - Always keyset-paginated: default_page_size rows unless `?page_size=N`
+          is given, then follow `next` (the log grows without bound)
+
+    Caching:
+        - ETag from min(id) / max(id) (the log is append-only), two index seeks
+          instead of a full COUNT on every page; ids rather than created_at
+          because batched entries are inserted after newer inline ones
+
+    Aggregates:
+        - GET /api/auditlogs/rollup/ - counts per hour or day and action (see rollup)
+        - GET /api/auditlogs/rollup/all/ - staff only, across users (see rollup_all)
     """
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    default_page_size = 50
+    conditional_timestamp_field = "created_at"
+    conditional_append_only = True
 
-    def get_queryset(self):
+    def get_queryset(self) -> QuerySet[AuditLog]:
         """
         CRITICAL SECURITY: Filter by user=request.user.
         Users can only see their own audit logs.
         """
-        return AuditLog.objects.filter(user=self.request.user)
+        qs = AuditLog.objects.filter(user=self.request.user)
+        if self.action == "list":
+            qs = self.filter_queryset_by_params(qs)
+        return qs.order_by("-created_at")
+
+    def filter_queryset_by_params(self, qs: QuerySet[AuditLog]) -> QuerySet[AuditLog]:
+        """Apply since/until/action query parameters (validated)."""
+        params = self.request.query_params
+
+        since = params.get("since")
+        if since:
+            qs = qs.filter(created_at__gte=parse_timestamp(since, "since"))
+
+        until = params.get("until")
+        if until:
+            qs = qs.filter(created_at__lt=parse_timestamp(until, "until"))
+
+        action = params.get("action")
+        if action:
+            if action not in AuditLog.Action.values:
+                raise ValidationError({"action": f"Unknown action '{action}'."})
+            qs = qs.filter(action=action)
+
+        return qs
+
+    @action(detail=False, methods=["get"])
+    def rollup(self, request):
+        """
+        The user's audit entry counts per period and action.
+
+        GET /api/auditlogs/rollup/[?granularity=hour|day][&since=...][&until=...][&action=...]
+
+        Served from the hourly/daily rollup tables plus the few raw rows newer
+        than the last rollup run, so the cost does not grow with history.
+        Defaults to the last 7 days (hour) or 30 days (day).
+        """
+        return self.rollup_response(request, user=request.user)
+
+    @action(detail=False, methods=["get"], url_path="rollup/all", permission_classes=[IsAdminUser])
+    def rollup_all(self, request):
+        """
+        Staff only: counts over every user, including entries without one.
+
+        GET /api/auditlogs/rollup/all/[?user=<id>|anonymous] plus the rollup parameters
+
+        Failed logins for unknown addresses are recorded without a user, so
+        login-failure trends need this view (`?action=LOGIN_FAIL`).
+        """
+        user = request.query_params.get("user")
+        if not user:
+            return self.rollup_response(request)
+        if user == "anonymous":
+            return self.rollup_response(request, anonymous=True)
+        try:
+            return self.rollup_response(request, user=int(user))
+        except ValueError:
+            raise ValidationError({"user": "Must be a user id or 'anonymous'."})
+
+    def rollup_response(self, request, **scope) -> Response:
+        """Validate the rollup parameters and answer with the counts for `scope`."""
+        params = request.query_params
+        granularity = params.get("granularity", AuditRollup.Granularity.HOUR)
+        if granularity not in AuditRollup.Granularity.values:
+            raise ValidationError({"granularity": "Must be 'hour' or 'day'."})
+        period = timedelta(hours=1) if granularity == AuditRollup.Granularity.HOUR else timedelta(days=1)
+
+        until = parse_timestamp(params["until"], "until") if params.get("until") else timezone.now()
+        default_span = timedelta(days=7) if granularity == AuditRollup.Granularity.HOUR else timedelta(days=30)
+        since = parse_timestamp(params["since"], "since") if params.get("since") else until - default_span
+        if since >= until:
+            raise ValidationError({"since": "Must be before until."})
+        if (until - since) / period > settings.AUDIT_ROLLUP_MAX_PERIODS:
+            raise ValidationError({
+                "since": f"At most {settings.AUDIT_ROLLUP_MAX_PERIODS} {granularity}s per request."
+            })
+
+        action_value = params.get("action")
+        if action_value and action_value not in AuditLog.Action.values:
+            raise ValidationError({"action": f"Unknown action '{action_value}'."})
+
+        return Response({
+            "granularity": granularity,
+            "since": since,
+            "until": until,
+            "results": counts(granularity, since, until, action=action_value, **scope),
+        })
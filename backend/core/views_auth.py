@@ -11,9 +11,10 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .audit_sink import audit_sink
 from .models import UserSettings, AuditLog
 from .serializers import LoginSerializer, RegisterSerializer, UserSettingsUpdateSerializer
-from .utils import get_client_ip, get_user_agent
+from .utils import get_client_ip, get_user_agent, make_etag, get_not_modified_response, set_validators
 
 User = get_user_model()
 
@@ -47,13 +48,13 @@ def _build_user_payload(user, settings_obj=None) -> dict:
 
 def _create_audit_log(request, action: AuditLog.Action, user=None, input_email: str = "") -> None:
     """Helper to create audit log entries for authentication events."""
-    AuditLog.objects.create(
+    audit_sink.record(AuditLog(
         user=user,
         input_email=input_email,
         action=action,
         ip_address=get_client_ip(request),
         user_agent=get_user_agent(request),
-    )
+    ))
 
 
 @method_decorator(ratelimit(key='ip', rate='5/m', method='POST', block=True), name='post')
@@ -136,11 +137,26 @@ class LogoutView(APIView):
 
 
 class MeView(APIView):
-    """Get current user information endpoint."""
+    """
+    Get current user information endpoint.
+
+    Sends ETag / Last-Modified derived from UserSettings.updated_at, so unchanged
+    polls return 304 without building the payload.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return Response(_build_user_payload(request.user), status=status.HTTP_200_OK)
+        settings_obj, _ = UserSettings.objects.get_or_create(user=request.user)
+        email = getattr(request.user, "email", "") or getattr(request.user, "username", "")
+        etag = make_etag(request.user.pk, email, settings_obj.updated_at)
+
+        not_modified = get_not_modified_response(request, etag, settings_obj.updated_at)
+        if not_modified is not None:
+            return not_modified
+
+        response = Response(_build_user_payload(request.user, settings_obj), status=status.HTTP_200_OK)
+        set_validators(response, etag, settings_obj.updated_at)
+        return response
 
 
 @method_decorator(ratelimit(key='user', rate='30/m', method='PATCH', block=True), name='patch')
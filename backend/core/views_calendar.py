@@ -0,0 +1,100 @@
+"""
+Deadline calendar endpoint (company deadlines grouped by day).
+"""
+import calendar
+from datetime import date
+from typing import Tuple
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import response_cache
+from .models import Company
+
+
+class DeadlineCalendarView(APIView):
+    """
+    Return the user's company deadlines within a month or date range, grouped by day.
+
+    GET /api/calendar/deadlines?month=YYYY-MM
+    GET /api/calendar/deadlines?start=YYYY-MM-DD&end=YYYY-MM-DD  (inclusive)
+
+    The query is a range scan on the (owner, deadline) index. Responses go through
+    the per-user response cache keyed on the range, so flipping between months
+    that have not changed does not hit the database.
+
+    Security:
+        - IDOR prevention: filtered by owner=request.user
+    """
+    permission_classes = [IsAuthenticated]
+
+    # Upper bound for custom ranges
+    MAX_RANGE_DAYS = 366
+
+    def get_range(self, request) -> Tuple[date, date]:
+        """Parse and validate the requested range (defaults to the current month)."""
+        params = request.query_params
+        month = params.get("month")
+        start_param, end_param = params.get("start"), params.get("end")
+
+        if start_param or end_param:
+            try:
+                start = parse_date(start_param or "")
+                end = parse_date(end_param or "")
+            except ValueError:
+                start = end = None
+            if start is None or end is None:
+                raise ValidationError({"detail": "start and end must both be valid YYYY-MM-DD dates."})
+            if end < start:
+                raise ValidationError({"detail": "end must not be before start."})
+            if (end - start).days >= self.MAX_RANGE_DAYS:
+                raise ValidationError({"detail": f"Range must be shorter than {self.MAX_RANGE_DAYS} days."})
+            return start, end
+
+        if month:
+            try:
+                year, month_num = (int(part) for part in month.split("-"))
+                start = date(year, month_num, 1)
+            except ValueError:
+                raise ValidationError({"month": "Enter a valid month (YYYY-MM)."})
+        else:
+            start = timezone.localdate().replace(day=1)
+        end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+        return start, end
+
+    def get(self, request):
+        start, end = self.get_range(request)
+
+        cache_key = None
+        if response_cache.is_enabled():
+            cache_key = response_cache.build_key(request.user.pk, "calendar", f"{start}:{end}")
+            cached = response_cache.get_entry(cache_key)
+            if cached is not None:
+                return Response(cached, status=status.HTTP_200_OK)
+
+        rows = (
+            Company.objects.filter(owner=request.user, deadline__gte=start, deadline__lte=end)
+            .order_by("deadline", "id")
+            .values("id", "name", "status_text", "deadline")
+        )
+
+        days = []
+        for row in rows:
+            day = row.pop("deadline").isoformat()
+            if not days or days[-1]["date"] != day:
+                days.append({"date": day, "companies": []})
+            days[-1]["companies"].append(row)
+
+        data = {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "days": days,
+        }
+        if cache_key:
+            response_cache.set_entry(cache_key, data)
+        return Response(data, status=status.HTTP_200_OK)
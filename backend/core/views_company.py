@@ -1,18 +1,34 @@
 """
 ViewSet for Company CRUD operations.
 """
+from typing import List, Tuple
+
 from django.db.models import QuerySet
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
+from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from .models import Company, AuditLog
-from .serializers import CompanySerializer
-from .viewsets import TypedModelViewSet, AuditLogMixin
+from .importer import start_import_job
+from .models import Company, AuditLog, ImportJob
+from .pagination import KeysetPagination
+from .serializers import CompanySerializer, CompanyImportSerializer, ImportJobSerializer
+from .utils import get_client_ip, get_user_agent
+from .viewsets import (
+    TypedModelViewSet, AuditLogMixin, BulkWriteMixin, ConditionalGetMixin, ResponseCacheMixin
+)
 
 
 @method_decorator(ratelimit(key='user', rate='100/h', method='ALL'), name='dispatch')
-class CompanyViewSet(AuditLogMixin, TypedModelViewSet[Company, CompanySerializer]):
+class CompanyViewSet(
+    BulkWriteMixin,
+    AuditLogMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    TypedModelViewSet[Company, CompanySerializer],
+):
     """
     ViewSet for Company CRUD operations.
 
@@ -20,10 +36,25 @@ class CompanyViewSet(AuditLogMixin, TypedModelViewSet[Company, CompanySerializer
         - IDOR prevention: All queries filtered by owner=request.user
         - Rate limiting: 100 requests/hour per user
         - Audit logging: All CRUD operations are logged
+        - Bulk writes (`POST .../bulk/`): one transaction, per-item owner checks,
+          one batched audit insert
+        - Import (`POST .../import/`): CSV/JSONL upload processed in batches,
+          progress at /api/imports/{id}/
+
+    Caching:
+        - ETag / Last-Modified from max(updated_at) + row count; unchanged GETs return 304
+        - Per-user list response cache, invalidated by the audit-logged writes
+
+    Pagination:
+        - Opt-in keyset pagination (`?page_size=N`, then follow `next`)
+        - The cursor seeks on the active ordering, backed by the
+          (owner, deadline, -updated_at, -id) index for the default ordering and
+          (owner, deadline) / (owner, -updated_at) for `?ordering=`
     """
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     # Audit logging configuration
     audit_log_target_type = "Company"
@@ -33,6 +64,12 @@ class CompanyViewSet(AuditLogMixin, TypedModelViewSet[Company, CompanySerializer
         'delete': AuditLog.Action.COMPANY_DELETE,
     }
 
+    # Per-user list response cache
+    response_cache_namespace = "company"
+
+    # Conditional GET: company deletions also bump Last-Modified
+    conditional_tombstone_type = "Company"
+
     # Allowed ordering fields (whitelist for security)
     ALLOWED_ORDERING = {"deadline", "-deadline", "updated_at", "-updated_at"}
 
@@ -50,3 +87,32 @@ class CompanyViewSet(AuditLogMixin, TypedModelViewSet[Company, CompanySerializer
 
         # Default ordering: deadline (asc), updated_at (desc)
         return qs.order_by("deadline", "-updated_at")
+
+    def get_tombstone_targets(self, instance: Company) -> List[Tuple[str, int]]:
+        """Deleting a company cascades to its ES versions; tombstone those too."""
+        es_ids = instance.es_versions.values_list("id", flat=True)
+        return super().get_tombstone_targets(instance) + [("ESVersion", es_id) for es_id in es_ids]
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_companies(self, request):
+        """
+        Start a company import from an uploaded CSV (header line) or JSONL file.
+
+        POST /api/companies/import/ (multipart: file, [format=csv|jsonl], [encoding=utf-8-sig|cp932])
+
+        Returns 202 with the job; poll /api/imports/{id}/ for progress and
+        /api/imports/{id}/errors/ for rejected rows.
+        """
+        serializer = CompanyImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = ImportJob.objects.create(
+            owner=request.user,
+            file=serializer.validated_data["file"],
+            format=serializer.validated_data["format"],
+            encoding=serializer.validated_data["encoding"],
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request),
+        )
+        start_import_job(job)
+        job.refresh_from_db()
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
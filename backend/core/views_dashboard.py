@@ -0,0 +1,81 @@
+"""
+Dashboard summary endpoint (companies joined with their ES statistics).
+"""
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Company, ESVersion
+
+LATEST_ES_FIELDS = ("id", "result", "submitted_at", "created_at")
+
+
+def _latest_es_subquery(field: str) -> Subquery:
+    """Correlated subquery for one column of the company's newest ES (uses (company, -created_at))."""
+    latest = ESVersion.objects.filter(company=OuterRef("pk")).order_by("-created_at", "-id")
+    return Subquery(latest.values(field)[:1])
+
+
+class DashboardView(APIView):
+    """
+    Return everything the dashboard needs in a single query.
+
+    Per company: ES count, PASS/FAIL/UNKNOWN counts and the latest ES version,
+    computed with conditional aggregates and correlated subqueries instead of
+    per-company lookups. Totals and the next upcoming deadline are derived from
+    the same rows.
+
+    Security:
+        - IDOR prevention: companies filtered by owner=request.user, and ES
+          versions are reached only through those companies
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        rows = (
+            Company.objects.filter(owner=request.user)
+            .annotate(
+                es_count=Count("es_versions"),
+                pass_count=Count("es_versions", filter=Q(es_versions__result=ESVersion.Result.PASS)),
+                fail_count=Count("es_versions", filter=Q(es_versions__result=ESVersion.Result.FAIL)),
+                unknown_count=Count("es_versions", filter=Q(es_versions__result=ESVersion.Result.UNKNOWN)),
+                **{f"latest_es_{field}": _latest_es_subquery(field) for field in LATEST_ES_FIELDS},
+            )
+            .order_by("-updated_at")
+            .values(
+                "id", "name", "job_role", "deadline", "status_text", "updated_at",
+                "es_count", "pass_count", "fail_count", "unknown_count",
+                *(f"latest_es_{field}" for field in LATEST_ES_FIELDS),
+            )
+        )
+
+        today = timezone.localdate()
+        companies = []
+        totals = {"companies": 0, "es": 0, "pass": 0, "fail": 0, "unknown": 0}
+        next_deadline = None
+
+        for row in rows:
+            latest = {field: row.pop(f"latest_es_{field}") for field in LATEST_ES_FIELDS}
+            row["latest_es"] = latest if latest["id"] is not None else None
+            companies.append(row)
+
+            totals["companies"] += 1
+            totals["es"] += row["es_count"]
+            totals["pass"] += row["pass_count"]
+            totals["fail"] += row["fail_count"]
+            totals["unknown"] += row["unknown_count"]
+
+            deadline = row["deadline"]
+            if deadline and deadline >= today and (
+                next_deadline is None or deadline < next_deadline["deadline"]
+            ):
+                next_deadline = {"company_id": row["id"], "name": row["name"], "deadline": deadline}
+
+        return Response({
+            "companies": companies,
+            "totals": totals,
+            "next_deadline": next_deadline,
+        }, status=status.HTTP_200_OK)
@@ -1,19 +1,36 @@
 """
 ViewSet for ESVersion (Entry Sheet Version) CRUD operations.
 """
+from django.conf import settings
 from django.db.models import QuerySet
 from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from .models import ESVersion, AuditLog
+from . import media_access, media_signing
+from .diff import GRANULARITIES, collapse_context, compute_diff, diff_cache, diff_stats
+from .models import ESVersion, AuditLog, UserSettings
+from .pagination import KeysetPagination
+from .search import MIN_QUERY_LENGTH, normalize, search as search_versions
 from .serializers import ESVersionSerializer, ESVersionListSerializer
-from .viewsets import TypedModelViewSet, AuditLogMixin
+from .similarity import DEFAULT_THRESHOLD, find_similar
+from .utils import make_etag
+from .viewsets import (
+    TypedModelViewSet, AuditLogMixin, BulkWriteMixin, ConditionalGetMixin, ResponseCacheMixin
+)
 
 
 @method_decorator(ratelimit(key='user', rate='100/h', method='ALL'), name='dispatch')
-class ESVersionViewSet(AuditLogMixin, TypedModelViewSet[ESVersion, ESVersionSerializer]):
+class ESVersionViewSet(
+    BulkWriteMixin,
+    AuditLogMixin,
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    TypedModelViewSet[ESVersion, ESVersionSerializer],
+):
     """
     ViewSet for ESVersion CRUD operations.
 
@@ -22,10 +39,31 @@ class ESVersionViewSet(AuditLogMixin, TypedModelViewSet[ESVersion, ESVersionSeri
         - Company ownership validation: ES can only be created for user's own companies
         - Rate limiting: 100 requests/hour per user
         - Audit logging: All CRUD operations are logged
+        - Bulk writes (`POST .../bulk/`): one transaction, per-item owner checks,
+          one batched audit insert
+
+    Caching:
+        - ETag / Last-Modified from max(updated_at) + row count; unchanged GETs return 304
+        - Per-user list response cache, invalidated by the audit-logged writes
+        - Attachment URLs are signed (core.media_signing); validators include
+          the signing window so clients pick up fresh links
+
+    Pagination:
+        - Opt-in keyset pagination (`?page_size=N`, then follow `next`)
+        - Global list seeks on (owner, -created_at), nested list on (company, -created_at)
+
+    Filtering:
+        - Length ranges on the list without loading `body` (`?max_chars=400`,
+          `min_chars`, `min_chars_no_ws`, `max_chars_no_ws`), indexed per owner
+
+    Search:
+        - Bigram inverted index over body and memo (`/api/es/search/?q=`)
+        - Near-duplicate answers via MinHash/LSH buckets (`/api/es/{id}/similar/`)
     """
     queryset = ESVersion.objects.all()
     serializer_class = ESVersionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     # Audit logging configuration
     audit_log_target_type = "ESVersion"
@@ -35,6 +73,23 @@ class ESVersionViewSet(AuditLogMixin, TypedModelViewSet[ESVersion, ESVersionSeri
         'delete': AuditLog.Action.ES_DELETE,
     }
 
+    # Per-user list response cache
+    response_cache_namespace = "es"
+
+    # Bulk writes bypass save(): store keyframes and refresh metrics per row
+    bulk_update_extra_fields = ESVersion.BODY_STORAGE_FIELDS + ESVersion.TEXT_METRIC_FIELDS
+
+    # Conditional GET: ES deletions also bump Last-Modified
+    conditional_tombstone_type = "ESVersion"
+
+    # List query parameter -> metric lookup
+    length_filters = {
+        "min_chars": "char_count__gte",
+        "max_chars": "char_count__lte",
+        "min_chars_no_ws": "char_count_no_ws__gte",
+        "max_chars_no_ws": "char_count_no_ws__lte",
+    }
+
     def get_queryset(self) -> QuerySet[ESVersion]:
         """
         CRITICAL SECURITY: Filter by owner=request.user to prevent IDOR.
@@ -47,9 +102,46 @@ class ESVersionViewSet(AuditLogMixin, TypedModelViewSet[ESVersion, ESVersionSeri
         if company_id:
             qs = qs.filter(company_id=company_id)
 
+        # List serializer has no body: skip loading (and rebuilding) it
+        if self.action == "list":
+            qs = self.filter_queryset_by_length(qs.defer("body", "body_delta"))
+
         # Select related company for N+1 prevention
         return qs.select_related("company").order_by("-created_at")
 
+    def filter_queryset_by_length(self, qs: QuerySet[ESVersion]) -> QuerySet[ESVersion]:
+        """Apply min/max character count query parameters (validated)."""
+        params = self.request.query_params
+        for param, lookup in self.length_filters.items():
+            value = params.get(param)
+            if value is None or value == "":
+                continue
+            try:
+                limit = int(value)
+            except ValueError:
+                raise ValidationError({param: "Must be an int."})
+            if limit < 0:
+                raise ValidationError({param: "Must not be negative."})
+            qs = qs.filter(**{lookup: limit})
+        return qs
+
+    def prepare_bulk_instance(self, instance: ESVersion) -> None:
+        instance.prepare_bulk_save()
+
+    def get_list_validators(self, queryset):
+        etag, last_modified = super().get_list_validators(queryset)
+        return self.with_signing_window(etag), last_modified
+
+    def get_object_validators(self, instance):
+        etag, last_modified = super().get_object_validators(instance)
+        return self.with_signing_window(etag), last_modified
+
+    def with_signing_window(self, etag: str) -> str:
+        """Signed file URLs change every window and on revocation; a 304 must not keep stale ones."""
+        if not media_signing.is_enabled():
+            return etag
+        return make_etag(etag, media_signing.current_window(), media_access.generation(self.request.user.pk))
+
     def get_serializer_class(self):
         """Use lightweight serializer for list view (excludes body field)."""
         if self.action == "list":
@@ -67,3 +159,121 @@ class ESVersionViewSet(AuditLogMixin, TypedModelViewSet[ESVersion, ESVersionSeri
 
         # Call parent's perform_create (handles owner assignment and audit logging)
         super().perform_create(serializer)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request, company_id=None):
+        """
+        Ranked full-text search over the user's ES bodies and memos.
+
+        GET /api/es/search/?q=<query>[&limit=N]
+
+        Queries are normalized like the index (NFKC, lowercase, no whitespace),
+        so full-width and half-width forms match each other.
+        """
+        query = request.query_params.get("q", "")
+        if len(normalize(query)) < MIN_QUERY_LENGTH:
+            raise ValidationError({"q": f"Must be at least {MIN_QUERY_LENGTH} characters."})
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an int."})
+        if not 1 <= limit <= 100:
+            raise ValidationError({"limit": "Must be between 1 and 100."})
+
+        return Response({
+            "query": query,
+            "results": search_versions(request.user, query, limit=limit),
+        })
+
+    @action(detail=True, methods=["get"])
+    def similar(self, request, pk=None, company_id=None):
+        """
+        The user's other ES versions whose body is similar to this one.
+
+        GET /api/es/{id}/similar/[?threshold=0.5][&limit=N]
+
+        Similarity is the MinHash estimate of the Jaccard similarity of
+        character shingles; only versions sharing an LSH bucket are scored.
+        """
+        es_version = self.get_object()
+        try:
+            threshold = float(request.query_params.get("threshold", DEFAULT_THRESHOLD))
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise ValidationError({"detail": "threshold must be a number and limit an int."})
+        if not 0 < threshold <= 1:
+            raise ValidationError({"threshold": "Must be in (0, 1]."})
+        if not 1 <= limit <= 100:
+            raise ValidationError({"limit": "Must be between 1 and 100."})
+
+        return Response({
+            "id": es_version.pk,
+            "threshold": threshold,
+            "results": find_similar(es_version, threshold=threshold, limit=limit),
+        })
+
+    @action(detail=True, methods=["get"])
+    def diff(self, request, pk=None):
+        """
+        Diff this ES version against another version of the same company.
+
+        GET /api/es/{id}/diff/?base=<other_id>[&granularity=char|line][&context=N]
+
+        Returns compact opcodes ([op, text], op in "=", "-", "+"; "~" carries a
+        skipped length when `context` is given) instead of both bodies.
+        Refused with 403 when UserSettings.diff_enabled is off. Bodies longer than
+        ES_DIFF_MAX_LENGTH characters are diffed per line (the response's
+        `granularity` says which was used).
+        """
+        settings_obj, _ = UserSettings.objects.get_or_create(user=request.user)
+        if not settings_obj.diff_enabled:
+            raise PermissionDenied("Diff is disabled in your settings.")
+
+        params = request.query_params
+        granularity = params.get("granularity", "char")
+        if granularity not in GRANULARITIES:
+            raise ValidationError({"granularity": f"Must be one of: {', '.join(GRANULARITIES)}."})
+        try:
+            target_id = int(pk)
+            base_id = int(params["base"])
+            context = int(params["context"]) if "context" in params else None
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "base (int) is required; context must be an int."})
+        if context is not None and context < 0:
+            raise ValidationError({"context": "Must not be negative."})
+
+        # Load only validators first; bodies are fetched on a cache miss
+        candidates = self.get_queryset().filter(pk__in=[base_id, target_id]).defer("body", "body_delta")
+        versions = {version.pk: version for version in candidates}
+        if base_id not in versions or target_id not in versions:
+            raise NotFound()
+        base, target = versions[base_id], versions[target_id]
+        if base.company_id != target.company_id:
+            raise ValidationError({"base": "Versions must belong to the same company."})
+
+        # SequenceMatcher is quadratic: long bodies are compared per line, and refused
+        # when even that is too long (decided from the stored metrics, before loading bodies)
+        limit = settings.ES_DIFF_MAX_LENGTH
+        if granularity == "char" and max(base.char_count, target.char_count) > limit:
+            granularity = "line"
+        if granularity == "line" and max(base.line_count, target.line_count) > limit:
+            raise ValidationError({"detail": f"Versions are too long to diff (over {limit} lines)."})
+
+        cache_key = (base.pk, base.updated_at, target.pk, target.updated_at, granularity)
+        ops = diff_cache.get(cache_key)
+        if ops is None:
+            # Load through the model so delta-stored bodies are rebuilt
+            bodies = {
+                version.pk: version.body
+                for version in ESVersion.objects.filter(pk__in=[base.pk, target.pk])
+            }
+            ops = compute_diff(bodies[base.pk], bodies[target.pk], granularity)
+            diff_cache.set(cache_key, ops)
+
+        return Response({
+            "base": base.pk,
+            "target": target.pk,
+            "granularity": granularity,
+            "stats": diff_stats(ops),
+            "ops": collapse_context(ops, context) if context is not None else ops,
+        })
@@ -0,0 +1,100 @@
+"""
+Streaming export endpoints: companies and ES history (CSV / JSON Lines) and the
+full-account takeout ZIP.
+"""
+from typing import Callable, Iterator
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django_ratelimit.decorators import ratelimit
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from .audit_sink import audit_sink
+from .export import COMPANY_FIELDS, ES_FIELDS, company_rows, es_rows, stream_csv, stream_jsonl
+from .models import AuditLog
+from .takeout import stream_takeout
+from .utils import get_client_ip, get_user_agent
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+
+class BaseExportView(APIView):
+    """
+    Stream the user's rows as `<name>.csv` or `<name>.jsonl`.
+
+    The response body is generated while the rows are read with
+    QuerySet.iterator(), so nothing is materialized in the worker.
+
+    Subclasses define:
+        - export_name: str - file name prefix
+        - export_fields: tuple - CSV column order
+        - export_rows: (user) -> iterator of dicts, e.g. core.export.company_rows
+    """
+    permission_classes = [IsAuthenticated]
+    export_name = ""
+    export_fields: tuple = ()
+    export_rows: Callable[..., Iterator[dict]]
+
+    def get(self, request, export_format):
+        # The format is a URL suffix: DRF reserves `?format=` for renderer selection
+        if export_format not in CONTENT_TYPES:
+            raise NotFound()
+
+        rows = self.export_rows(request.user)
+        if export_format == "csv":
+            content = stream_csv(rows, self.export_fields)
+        else:
+            content = stream_jsonl(rows)
+
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[export_format])
+        filename = f"{self.export_name}-{timezone.localdate():%Y%m%d}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "private, no-store"
+        # Let nginx-style proxies pass chunks through instead of buffering the whole body
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class CompanyExportView(BaseExportView):
+    """Export the user's companies. Security: filtered by owner=request.user."""
+    export_name = "companies"
+    export_fields = COMPANY_FIELDS
+    export_rows = staticmethod(company_rows)
+
+
+class ESExportView(BaseExportView):
+    """Export the user's ES history with company names (one joined query)."""
+    export_name = "es-history"
+    export_fields = ES_FIELDS
+    export_rows = staticmethod(es_rows)
+
+
+@method_decorator(ratelimit(key='user', rate='5/h', method='GET', block=True), name='get')
+class TakeoutView(APIView):
+    """
+    Download everything the account holds as one ZIP, streamed while it is built.
+
+    Includes account settings, companies, ES versions and every uploaded ES file.
+    Security: scoped to request.user, audit-logged, rate limited to 5/hour.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        audit_sink.record(AuditLog(
+            user=request.user,
+            action=AuditLog.Action.ACCOUNT_EXPORT,
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request),
+        ))
+        response = StreamingHttpResponse(stream_takeout(request.user), content_type="application/zip")
+        filename = f"entrynest-takeout-{timezone.localdate():%Y%m%d}.zip"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response["Cache-Control"] = "private, no-store"
+        response["X-Accel-Buffering"] = "no"
+        return response
@@ -0,0 +1,58 @@
+"""
+Read-only ViewSet for company import jobs (progress and per-row errors).
+"""
+from django.db.models import QuerySet
+from rest_framework import viewsets, mixins
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .importer import fail_stale_jobs
+from .models import ImportJob
+from .pagination import KeysetPagination
+from .serializers import ImportJobSerializer, ImportRowErrorSerializer
+
+
+class ImportJobViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Read-only ViewSet for ImportJob.
+    Users can only see their own jobs.
+
+    Poll GET /api/imports/{id}/ for progress; counters are committed with every
+    batch, so they advance while the import runs. Rejected rows are listed at
+    /api/imports/{id}/errors/ (opt-in keyset pagination, ordered by row).
+    Jobs whose worker stopped reporting progress are marked FAILED when read
+    (see core.importer.fail_stale_jobs).
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self) -> QuerySet[ImportJob]:
+        """CRITICAL SECURITY: Filter by owner=request.user."""
+        return ImportJob.objects.filter(owner=self.request.user).order_by("-created_at")
+
+    def list(self, request, *args, **kwargs):
+        fail_stale_jobs(self.get_queryset())
+        return super().list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        if fail_stale_jobs(ImportJob.objects.filter(pk=job.pk)):
+            job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
+
+    @action(detail=True, methods=["get"])
+    def errors(self, request, pk=None):
+        """Rejected rows of the job with their validation errors."""
+        job = self.get_object()
+        queryset = job.row_errors.order_by("row", "id")
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(ImportRowErrorSerializer(page, many=True).data)
+        return Response(ImportRowErrorSerializer(queryset, many=True).data)
@@ -1,22 +1,85 @@
 """
 Media file access control views.
 Require authentication to access uploaded files.
+
+Access is granted either to a valid signed, expiring URL from the ES
+serializers (see core.media_signing), which needs no session and no database
+query, or to the authenticated owner (session, ownership check).
+
+Delivery (MEDIA_DELIVERY):
+    - "django": the worker streams the file itself, with Range and
+      conditional-request (ETag / If-Modified-Since) support
+    - "x-accel" (nginx) / "x-sendfile" (Apache, lighttpd): after the ownership
+      check the response only carries an internal-redirect header, and the
+      front proxy sends the bytes (including ranges) without holding a
+      gunicorn thread
 """
-from django.http import FileResponse, Http404
+import mimetypes
+import os
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional
+from urllib.parse import quote
+
 from django.conf import settings
-from rest_framework.views import APIView
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import content_disposition_header, http_date
 from rest_framework.permissions import IsAuthenticated
-from pathlib import Path
-import os
+from rest_framework.views import APIView
+
+from . import media_signing
+from .media_access import owns_es_file
+from .utils import get_not_modified_response, make_etag, parse_byte_range, set_validators
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _content_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def _read_range(path: str, start: int, length: int):
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(STREAM_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
 
 
 class ProtectedMediaView(APIView):
     """
-    Serve media files only to authenticated users who own them.
+    Serve media files only to authenticated users who own them,
+    or to holders of a valid signed URL.
     """
     permission_classes = [IsAuthenticated]
 
+    def signature_max_age(self) -> Optional[int]:
+        """Seconds left on a valid signed URL; None if unsigned or the signature fails."""
+        if not hasattr(self, "_signature_max_age"):
+            self._signature_max_age = None
+            if media_signing.is_signed(self.request.GET):
+                self._signature_max_age = media_signing.verify(self.kwargs["file_path"], self.request.GET)
+        return self._signature_max_age
+
+    def get_authenticators(self):
+        # A valid signed URL is its own credential: skip the session (and its DB read).
+        # Stale or revoked links fall back to the session and the ownership check.
+        if self.signature_max_age() is not None:
+            return []
+        return super().get_authenticators()
+
+    def get_permissions(self):
+        if self.signature_max_age() is not None:
+            return []
+        return super().get_permissions()
+
     def get(self, request, file_path):
+        max_age = self.signature_max_age()
+        signed = max_age is not None
+
         # Construct full file path
         full_path = os.path.join(settings.MEDIA_ROOT, file_path)
 
@@ -33,16 +96,77 @@ class ProtectedMediaView(APIView):
 
         # Verify file ownership
         if file_path.startswith('es_files/'):
-            # ES files: check ownership via ESVersion model
-            from core.models import ESVersion
-
+            # ES files: a signed URL was issued to the owner; otherwise check
+            # ownership via ESVersion model (cached per user)
             # Use exact match on full file path to prevent prefix attacks
-            if not ESVersion.objects.filter(file=file_path, owner=request.user).exists():
+            if not signed and not owns_es_file(request.user.pk, file_path):
                 raise Http404("File not found")
         else:
             # Deny access to any files outside es_files/ directory
             # Future extensions should add explicit ownership checks here
             raise Http404("File not found")
 
-        # Serve file
-        return FileResponse(open(full_path, 'rb'))
+        return self.serve(request, file_path, full_path, max_age=max_age)
+
+    def serve(self, request, file_path: str, full_path: str, max_age: Optional[int] = None):
+        """
+        Answer with 304, an offload header, or the (partial) file.
+
+        With `max_age` (signed URLs) the browser may reuse its private copy
+        until the link expires instead of revalidating every time.
+        """
+        stat = os.stat(full_path)
+        last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=dt_timezone.utc)
+        etag = make_etag(file_path, stat.st_size, stat.st_mtime_ns)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return self.set_freshness(not_modified, max_age)
+
+        delivery = settings.MEDIA_DELIVERY
+        if delivery in ("x-accel", "x-sendfile"):
+            response = HttpResponse(content_type=_content_type(full_path))
+            response["Content-Disposition"] = content_disposition_header(False, os.path.basename(full_path))
+            if delivery == "x-accel":
+                response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(file_path)
+            else:
+                response["X-Sendfile"] = full_path
+        else:
+            response = self.stream(request, full_path, stat.st_size, etag, last_modified)
+        response["Accept-Ranges"] = "bytes"
+        set_validators(response, etag, last_modified)
+        return self.set_freshness(response, max_age)
+
+    @staticmethod
+    def set_freshness(response, max_age: Optional[int]):
+        if max_age is not None:
+            del response["Cache-Control"]
+            patch_cache_control(response, private=True, max_age=max_age)
+        return response
+
+    def stream(self, request, full_path: str, size: int, etag: str, last_modified: datetime):
+        """Stream the file from this worker, honouring a single Range request."""
+        byte_range = None
+        range_header = request.headers.get("Range")
+        if_range = request.headers.get("If-Range")
+        # A stale If-Range means the client's partial copy is outdated: send everything
+        if range_header and (not if_range or if_range in (etag, http_date(last_modified.timestamp()))):
+            try:
+                byte_range = parse_byte_range(range_header, size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        if byte_range is None:
+            return FileResponse(open(full_path, "rb"))
+
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _read_range(full_path, start, length),
+            status=206,
+            content_type=_content_type(full_path),
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(length)
+        return response
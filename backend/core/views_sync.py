@@ -0,0 +1,77 @@
+"""
+Delta sync endpoint for the SPA's local company/ES cache.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Company, ESVersion, Tombstone
+from .serializers import CompanySerializer, ESVersionListSerializer, TombstoneSerializer
+from .utils import parse_timestamp
+
+
+class SyncView(APIView):
+    """
+    Return companies and ES versions changed since a client watermark.
+
+    GET /api/sync?updated_since=<watermark>
+
+    Response:
+        - watermark: pass back as `updated_since` on the next call
+        - companies / es_versions: rows with updated_at >= updated_since
+        - deleted: tombstones ({type, id, deleted_at}) recorded since the watermark
+        - full_resync: true when the response is a full snapshot that replaces
+          the client's cache instead of being merged into it
+
+    Without `updated_since` the full (owner-scoped) snapshot is returned and
+    `deleted` is empty. The comparison is inclusive: re-sending a row is
+    harmless for an upsert-style merge, while missing one is not.
+
+    updated_at / deleted_at are stamped when a row is saved, not when its
+    transaction commits, so a write still in flight during this request can
+    carry a timestamp before "now" and become visible only afterwards. The
+    returned watermark therefore lags by SYNC_SAFETY_MARGIN seconds: rows from
+    that window are sent again on the next call instead of being skipped.
+
+    Tombstones are pruned after TOMBSTONE_RETENTION_DAYS (`manage.py
+    prune_tombstones`), so a watermark older than that window may have missed
+    deletions: such clients get the full snapshot with full_resync=true.
+
+    Security:
+        - IDOR prevention: every query is filtered by owner=request.user
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Taken before querying, minus the margin for transactions that commit after this read
+        now = timezone.now()
+        watermark = now - timedelta(seconds=settings.SYNC_SAFETY_MARGIN)
+
+        companies = Company.objects.filter(owner=request.user)
+        es_versions = ESVersion.objects.filter(owner=request.user).defer("body", "body_delta")
+        tombstones = Tombstone.objects.none()
+        full_resync = True
+
+        updated_since = request.query_params.get("updated_since")
+        since = parse_timestamp(updated_since, "updated_since") if updated_since else None
+        if since is not None and since >= now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+            full_resync = False
+            # Served by the (owner, -updated_at) / (owner, updated_at) / (owner, deleted_at) indexes
+            companies = companies.filter(updated_at__gte=since)
+            es_versions = es_versions.filter(updated_at__gte=since)
+            tombstones = Tombstone.objects.filter(owner=request.user, deleted_at__gte=since)
+
+        return Response({
+            "watermark": serializers.DateTimeField().to_representation(watermark),
+            "companies": CompanySerializer(companies.order_by("updated_at"), many=True).data,
+            "es_versions": ESVersionListSerializer(
+                es_versions.order_by("updated_at"), many=True, context={"request": request}
+            ).data,
+            "deleted": TombstoneSerializer(tombstones.order_by("deleted_at"), many=True).data,
+            "full_resync": full_resync,
+        }, status=status.HTTP_200_OK)
@@ -1,15 +1,26 @@
 """
 Shared ViewSet classes and mixins for the core application.
 """
-from typing import Generic, TypeVar, cast, Type, Optional
+from datetime import datetime, timezone as dt_timezone
+from typing import Generic, List, Tuple, TypeVar, cast, Type, Optional
 
-from django.db import models
-from django.db.models import QuerySet
-from rest_framework import viewsets
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Max, Min, QuerySet
+from django.db.models.signals import post_save
+from django.utils.http import parse_http_date_safe
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
 
-from .models import AuditLog
-from .utils import get_client_ip, get_user_agent
+from . import response_cache
+from .audit_sink import audit_sink
+from .models import AuditLog, Tombstone
+from .utils import (
+    get_client_ip, get_user_agent, make_etag, get_not_modified_response, set_validators
+)
 
 ModelT = TypeVar("ModelT", bound=models.Model)
 SerializerT = TypeVar("SerializerT", bound=BaseSerializer)
@@ -23,6 +34,131 @@ class TypedModelViewSet(viewsets.ModelViewSet, Generic[ModelT, SerializerT]):
         return cast(QuerySet[ModelT], super().get_queryset())
 
 
+class ConditionalGetMixin:
+    """
+    Mixin that adds ETag / Last-Modified validators to list and retrieve.
+
+    List validators come from a single aggregate (row count + max timestamp)
+    over the filtered queryset, so an unchanged list is answered with 304
+    before any row is loaded or serialized.
+
+    Subclasses may define:
+        - conditional_timestamp_field: str (default "updated_at")
+        - conditional_tombstone_type: str - Tombstone.target_type whose latest
+          deletion also bumps Last-Modified (deletions do not raise max(updated_at))
+        - conditional_append_only: bool - rows are only inserted (or deleted
+          oldest first by retention), so MIN(pk) and MAX(pk) identify the list:
+          each is a single seek on a (filter, id) index, while COUNT would read
+          every matching row on each (keyset) page. Primary keys are assigned at
+          insert time, unlike timestamps set when an entry is built and written
+          later by a batching writer, so a late row with an older timestamp still
+          changes the ETag. No Last-Modified is sent for the same reason.
+    """
+    conditional_timestamp_field: str = "updated_at"
+    conditional_tombstone_type: str = ""
+    conditional_append_only: bool = False
+
+    def get_list_validators(self, queryset: QuerySet) -> Tuple[str, Optional[datetime]]:
+        """Return (etag, last_modified) for a list request without fetching rows."""
+        if self.conditional_append_only:
+            stats = queryset.order_by().aggregate(first=Min("pk"), last=Max("pk"))
+            etag = make_etag(self.request.user.pk, self.request.get_full_path(), stats["first"], stats["last"])
+            return etag, None
+
+        stats = queryset.order_by().aggregate(
+            count=Count("pk"),
+            last_modified=Max(self.conditional_timestamp_field),
+        )
+        last_modified = stats["last_modified"]
+
+        if self.conditional_tombstone_type:
+            last_deleted = Tombstone.objects.filter(
+                owner=self.request.user, target_type=self.conditional_tombstone_type
+            ).aggregate(last=Max("deleted_at"))["last"]
+            if last_deleted and (last_modified is None or last_deleted > last_modified):
+                last_modified = last_deleted
+
+        etag = make_etag(
+            self.request.user.pk, self.request.get_full_path(),
+            stats["count"], last_modified,
+        )
+        return etag, last_modified
+
+    def get_object_validators(self, instance) -> Tuple[str, Optional[datetime]]:
+        """Return (etag, last_modified) for a single object."""
+        last_modified = getattr(instance, self.conditional_timestamp_field)
+        etag = make_etag(self.request.user.pk, self.request.get_full_path(), instance.pk, last_modified)
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(self.filter_queryset(self.get_queryset()))
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        set_validators(response, etag, last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        set_validators(response, etag, last_modified)
+        return response
+
+
+class ResponseCacheMixin:
+    """
+    Mixin that caches serialized list responses per user (see core.response_cache).
+
+    Entries are keyed by the user's generation counter and the full request URL,
+    so AuditLogMixin's write hooks invalidate them with a single counter bump.
+    A hit skips the database and the serializer entirely, and still honors
+    If-None-Match using the cached ETag.
+
+    Place before ConditionalGetMixin in the bases so the cache is checked first.
+
+    Subclasses should define:
+        - response_cache_namespace: str (e.g., "company", "es")
+    """
+    response_cache_namespace: str = ""
+
+    def list(self, request, *args, **kwargs):
+        if not response_cache.is_enabled():
+            return super().list(request, *args, **kwargs)
+
+        key = response_cache.build_key(
+            request.user.pk, self.response_cache_namespace, request.build_absolute_uri()
+        )
+        entry = response_cache.get_entry(key)
+        if entry is not None:
+            data, etag, last_modified_header = entry
+            last_modified = None
+            if last_modified_header:
+                last_modified = datetime.fromtimestamp(
+                    parse_http_date_safe(last_modified_header), tz=dt_timezone.utc
+                )
+            not_modified = get_not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            response = Response(data)
+            set_validators(response, etag, last_modified)
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and response.has_header("ETag"):
+            response_cache.set_entry(
+                key, (response.data, response["ETag"], response.get("Last-Modified"))
+            )
+        return response
+
+
 class AuditLogMixin:
     """
     Mixin that provides automatic audit logging for CRUD operations.
@@ -31,6 +167,10 @@ class AuditLogMixin:
         - audit_log_target_type: str (e.g., "Company", "ESVersion")
         - audit_log_actions: dict mapping 'create', 'update', 'delete' to AuditLog.Action values
 
+    Deletions also record a Tombstone per removed row (see get_tombstone_targets)
+    so /api/sync clients can drop them from their local copy, and every write
+    bumps the user's response cache generation.
+
     Example usage:
         class CompanyViewSet(AuditLogMixin, TypedModelViewSet[Company, CompanySerializer]):
             audit_log_target_type = "Company"
@@ -43,12 +183,12 @@ class AuditLogMixin:
     audit_log_target_type: str = ""
     audit_log_actions: dict = {}
 
-    def _create_audit_log(self, action_key: str, target_id: int) -> None:
-        """Create an audit log entry for the given action."""
+    def _build_audit_log(self, action_key: str, target_id: int) -> Optional[AuditLog]:
+        """Return an unsaved audit log entry for the given action, or None if not logged."""
         if not self.audit_log_actions or action_key not in self.audit_log_actions:
-            return
+            return None
 
-        AuditLog.objects.create(
+        return AuditLog(
             user=self.request.user,
             action=self.audit_log_actions[action_key],
             target_type=self.audit_log_target_type,
@@ -57,18 +197,198 @@ class AuditLogMixin:
             user_agent=get_user_agent(self.request),
         )
 
+    def _create_audit_log(self, action_key: str, target_id: int) -> None:
+        """Record an audit log entry for the given action (batched by the audit sink)."""
+        audit_sink.record(self._build_audit_log(action_key, target_id))
+
+    def get_tombstone_targets(self, instance) -> List[Tuple[str, int]]:
+        """
+        Return (target_type, target_id) pairs removed by deleting `instance`.
+        Override to include rows removed by ON DELETE CASCADE.
+        """
+        return [(self.audit_log_target_type, instance.id)]
+
+    def _create_tombstones(self, targets: List[Tuple[str, int]]) -> None:
+        """Record deletion markers for delta-sync clients."""
+        Tombstone.objects.bulk_create([
+            Tombstone(owner=self.request.user, target_type=target_type, target_id=target_id)
+            for target_type, target_id in targets
+        ])
+
     def perform_create(self, serializer) -> None:
         """Save the instance and log the create action."""
         instance = serializer.save(owner=self.request.user)
         self._create_audit_log('create', instance.id)
+        response_cache.bump_generation(self.request.user.pk)
 
     def perform_update(self, serializer) -> None:
         """Save the instance and log the update action."""
         instance = serializer.save()
         self._create_audit_log('update', instance.id)
+        response_cache.bump_generation(self.request.user.pk)
 
     def perform_destroy(self, instance) -> None:
-        """Delete the instance and log the delete action."""
+        """Delete the instance, record tombstones and log the delete action atomically."""
         instance_id = instance.id
-        instance.delete()
-        self._create_audit_log('delete', instance_id)
+        tombstone_targets = self.get_tombstone_targets(instance)
+        # A delete without its tombstone would never reach delta-sync clients
+        with transaction.atomic():
+            instance.delete()
+            self._create_tombstones(tombstone_targets)
+            self._create_audit_log('delete', instance_id)
+        response_cache.bump_generation(self.request.user.pk)
+
+
+class BulkWriteMixin:
+    """
+    Mixin that adds POST .../bulk/ to apply many writes in one transaction.
+
+    Request body (every key optional):
+        {"create": [{...}], "update": [{"id": 1, ...}], "delete": [2, 3]}
+
+    Each item goes through the regular serializer (so owner checks such as
+    validate_company still apply per item), and updates/deletes only see rows
+    from get_queryset(), so other users' ids are reported as not found. Nothing
+    is written unless every item is valid. Rows are written with
+    bulk_create/bulk_update, audit entries with one batched insert, and post_save
+    is sent per row so receivers (e.g. search indexes) stay in sync.
+
+    Must be combined with AuditLogMixin. Subclasses may define:
+        - bulk_update_extra_fields: columns save() would normally derive
+        - prepare_bulk_instance(): per-row work save() would normally do
+    """
+    bulk_update_extra_fields: Tuple[str, ...] = ()
+
+    def prepare_bulk_instance(self, instance) -> None:
+        """Hook called for every created/updated row before it is written."""
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        """Apply up to BULK_MAX_OPERATIONS creates, updates and deletes atomically."""
+        data = request.data if isinstance(request.data, dict) else {}
+        creates, updates, deletes = (data.get(key, []) for key in ("create", "update", "delete"))
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            raise ValidationError({"detail": "create, update and delete must be lists."})
+        total = len(creates) + len(updates) + len(deletes)
+        if total == 0:
+            raise ValidationError({"detail": "No operations given."})
+        if total > settings.BULK_MAX_OPERATIONS:
+            raise ValidationError(
+                {"detail": f"At most {settings.BULK_MAX_OPERATIONS} operations per request."}
+            )
+
+        create_serializers = [self.get_serializer(data=item) for item in creates]
+        create_errors = [{} if serializer.is_valid() else serializer.errors for serializer in create_serializers]
+
+        # Owner scoping: ids outside get_queryset() look exactly like missing ids
+        update_ids = [item.get("id") if isinstance(item, dict) else None for item in updates]
+        wanted_ids = [pk for pk in update_ids + deletes if self._is_id(pk)]
+        instances = self.get_queryset().in_bulk(wanted_ids)
+        seen = set()
+
+        update_serializers, update_errors = [], []
+        for pk, item in zip(update_ids, updates):
+            error = self._check_bulk_id(pk, instances, seen)
+            if error:
+                update_serializers.append(None)
+                update_errors.append(error)
+                continue
+            serializer = self.get_serializer(instances[pk], data=item, partial=True)
+            update_serializers.append(serializer)
+            update_errors.append({} if serializer.is_valid() else serializer.errors)
+
+        delete_errors = [self._check_bulk_id(pk, instances, seen) for pk in deletes]
+
+        errors = {
+            key: item_errors
+            for key, item_errors in (("create", create_errors), ("update", update_errors), ("delete", delete_errors))
+            if any(item_errors)
+        }
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            created = self._bulk_create(create_serializers)
+            updated = self._bulk_update(update_serializers)
+            self._bulk_delete([instances[pk] for pk in deletes])
+
+            audit_sink.record_many(
+                [self._build_audit_log("create", instance.id) for instance in created]
+                + [self._build_audit_log("update", instance.id) for instance in updated]
+                + [self._build_audit_log("delete", pk) for pk in deletes]
+            )
+
+        response_cache.bump_generation(request.user.pk)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return Response({
+            "created": serializer_class(created, many=True, context=context).data,
+            "updated": serializer_class(updated, many=True, context=context).data,
+            "deleted": deletes,
+        })
+
+    @staticmethod
+    def _is_id(pk) -> bool:
+        """JSON integers only: bool is an int subclass, so `true` would otherwise mean pk 1."""
+        return isinstance(pk, int) and not isinstance(pk, bool)
+
+    @staticmethod
+    def _check_bulk_id(pk, instances: dict, seen: set) -> dict:
+        """Return per-item errors for an update/delete id (empty if usable)."""
+        if not BulkWriteMixin._is_id(pk) or pk not in instances:
+            return {"id": ["Not found."]}
+        if pk in seen:
+            return {"id": ["Duplicate id."]}
+        seen.add(pk)
+        return {}
+
+    def _bulk_create(self, serializers: list) -> list:
+        model = self.get_queryset().model
+        instances = [model(**serializer.validated_data, owner=self.request.user) for serializer in serializers]
+        for instance in instances:
+            self.prepare_bulk_instance(instance)
+        model.objects.bulk_create(instances)
+        self._send_post_save(model, instances, created=True)
+        return instances
+
+    def _bulk_update(self, serializers: list) -> list:
+        model = self.get_queryset().model
+        # bulk_update skips Field.pre_save, so auto_now columns are refreshed by hand
+        auto_now_fields = [
+            field for field in model._meta.concrete_fields if getattr(field, "auto_now", False)
+        ]
+        instances, fields = [], set(self.bulk_update_extra_fields)
+        for serializer in serializers:
+            instance = serializer.instance
+            for attr, value in serializer.validated_data.items():
+                setattr(instance, attr, value)
+            fields.update(serializer.validated_data)
+            for field in auto_now_fields:
+                field.pre_save(instance, add=False)
+            self.prepare_bulk_instance(instance)
+            instances.append(instance)
+        if not instances:
+            return instances
+
+        fields.update(field.name for field in auto_now_fields)
+        model.objects.bulk_update(instances, sorted(fields))
+        self._send_post_save(model, instances, created=False)
+        return instances
+
+    def _bulk_delete(self, instances: list) -> None:
+        if not instances:
+            return
+        tombstone_targets = []
+        for instance in instances:
+            tombstone_targets += self.get_tombstone_targets(instance)
+        # queryset.delete() still sends pre_delete/post_delete per row
+        self.get_queryset().model.objects.filter(pk__in=[instance.pk for instance in instances]).delete()
+        self._create_tombstones(tombstone_targets)
+
+    def _send_post_save(self, model, instances: list, created: bool) -> None:
+        """bulk_create/bulk_update send no signals: emit post_save like save() would."""
+        for instance in instances:
+            post_save.send(
+                sender=model, instance=instance, created=created,
+                update_fields=None, raw=False, using=instance._state.db,
+            )